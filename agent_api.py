@@ -4,7 +4,7 @@ Flask API server for PATHsassin Agent - A True Learning System
 PATHsassin learns and grows from every interaction, building mastery of the Master Skills Index
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import requests
 import json
@@ -13,6 +13,7 @@ import pickle
 from datetime import datetime
 from typing import Dict, Any, List
 import uuid
+from scraper_metrics import metrics as scraper_metrics
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -443,6 +444,50 @@ def get_synthesis():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/scraper/metrics', methods=['GET'])
+def get_scraper_metrics():
+    """
+    Scraper phase timings, bytes, retries and cache ratios per host (JSON, or
+    Prometheus with ?format=prometheus). Covers scrapers running in this
+    process plus whatever scraping processes pushed to /api/scraper/metrics/push.
+    """
+    if request.args.get('format') == 'prometheus':
+        return Response(scraper_metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 0:
+        return jsonify({'error': 'limit must not be negative'}), 400
+    
+    snapshot = scraper_metrics.snapshot(host=request.args.get('host'))
+    phase = request.args.get('phase', 'ttfb')
+    snapshot['slowest_hosts'] = {
+        'phase': phase,
+        'p50': [{'host': host, 'seconds': round(seconds, 6)}
+                for host, seconds in scraper_metrics.slowest_hosts(phase, limit=limit)]
+    }
+    return jsonify(snapshot)
+
+@app.route('/api/scraper/metrics/push', methods=['POST'])
+def push_scraper_metrics():
+    """Merge a scraping process's ScraperMetrics.take_state() (see scraper_metrics.push_state)"""
+    state = request.get_json(silent=True)
+    if not isinstance(state, dict):
+        return jsonify({'error': 'Expected a JSON metrics state'}), 400
+    try:
+        scraper_metrics.merge_state(state)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'merged': len(state['hosts'])})
+
+@app.route('/api/scraper/metrics/reset', methods=['POST'])
+def reset_scraper_metrics():
+    """Start a fresh measurement window"""
+    scraper_metrics.reset()
+    return jsonify({'reset': True})
+
 if __name__ == '__main__':
     print("🤖 PATHsassin Agent API Server Starting...")
     print("🧠 Learning System: ENABLED")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Per-page CPU time of HTML cleaning + extraction: the original multi-pass
+pipeline versus the single-pass PageExtractor used by WebScraper, and the
+single-pass extractor across parser backends.
+
+Both pipelines parse the same synthetic pages with the same parser, and
+their outputs are checked for equivalence before timing. 'lxml-native' is
+checked against BeautifulSoup's 'lxml' builder.
+
+    python benchmarks/bench_extraction.py --pages 200 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from scraper_tools import PARSERS, PageExtractor, extract_page
+
+# Original multi-pass pipeline, kept verbatim as the baseline
+
+def legacy_extract(body, url, extract_text=True, extract_links=True, extract_images=True,
+                   clean_html=True, remove_scripts=True, remove_styles=True):
+    soup = BeautifulSoup(body, 'html.parser')
+    if clean_html:
+        _legacy_clean_html(soup)
+    if remove_scripts:
+        for script in soup(["script"]):
+            script.decompose()
+    if remove_styles:
+        for style in soup(["style"]):
+            style.decompose()
+    title = _legacy_title(soup)
+    content = _legacy_text(soup) if extract_text else ""
+    metadata = _legacy_metadata(soup)
+    links = _legacy_urls(soup.find_all('a', href=True), 'href', url) if extract_links else []
+    images = _legacy_urls(soup.find_all('img', src=True), 'src', url) if extract_images else []
+    return {'title': title, 'content': content, 'metadata': metadata, 'links': links, 'images': images}
+
+def _legacy_title(soup):
+    title = soup.find('title')
+    if title:
+        return title.get_text(strip=True)
+    h1 = soup.find('h1')
+    if h1:
+        return h1.get_text(strip=True)
+    og_title = soup.find('meta', property='og:title')
+    if og_title:
+        return og_title.get('content', '')
+    return ''
+
+def _legacy_text(soup):
+    for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
+        element.decompose()
+    text_elements = soup.find('body') or soup.find('main') or soup.find('article')
+    text = text_elements.get_text() if text_elements else soup.get_text()
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _legacy_metadata(soup):
+    metadata = {}
+    desc_meta = soup.find('meta', attrs={'name': 'description'})
+    if desc_meta:
+        metadata['description'] = desc_meta.get('content', '')
+    og_desc = soup.find('meta', property='og:description')
+    if og_desc:
+        metadata['description'] = og_desc.get('content', '')
+    keywords_meta = soup.find('meta', attrs={'name': 'keywords'})
+    if keywords_meta:
+        metadata['keywords'] = [k.strip() for k in keywords_meta.get('content', '').split(',')]
+    author_meta = soup.find('meta', attrs={'name': 'author'})
+    if author_meta:
+        metadata['author'] = author_meta.get('content', '')
+    date_meta = soup.find('meta', property='article:published_time')
+    if date_meta:
+        metadata['date'] = date_meta.get('content', '')
+    html_tag = soup.find('html')
+    if html_tag:
+        metadata['language'] = html_tag.get('lang', 'en')
+    return metadata
+
+def _legacy_urls(elements, attr, base_url):
+    urls = []
+    for element in elements:
+        try:
+            urls.append(urljoin(base_url, element[attr]))
+        except:
+            continue
+    return list(set(urls))
+
+def _legacy_clean_html(soup):
+    for element in soup(['script', 'style', 'noscript', 'iframe', 'embed', 'object']):
+        element.decompose()
+    for element in soup.find_all(class_=re.compile(r'ad|spam|banner')):
+        element.decompose()
+    for element in soup.find_all(id=re.compile(r'ad|spam')):
+        element.decompose()
+    for element in soup.find_all(['p', 'div', 'span']):
+        if not element.get_text(strip=True):
+            element.decompose()
+
+def single_pass_extract(body, url, **options):
+    return PageExtractor(url, **options).feed_soup(BeautifulSoup(body, 'html.parser'))
+
+# Synthetic corpus
+
+WORDS = ("automation workflow node trigger webhook design layout grid stoic virtue "
+         "leadership mentor research synthesis reading progress skill mastery").split()
+
+def make_page(rng, sections=40, depth=6):
+    def words(n):
+        return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+    def block(level):
+        if level == 0:
+            return f"<p>{words(rng.randint(5, 30))} <a href='/doc/{rng.randint(0, 500)}'>{words(2)}</a></p>"
+        kind = rng.random()
+        if kind < 0.1:
+            return f"<div class='ad-slot'><img src='/ads/{rng.randint(0, 9)}.png'>{words(3)}</div>"
+        if kind < 0.2:
+            return f"<div><span> </span><img src='/img/{rng.randint(0, 99)}.png'></div>"
+        if kind < 0.25:
+            return f"<script>var x = {rng.randint(0, 99)};</script>"
+        inner = ''.join(block(level - 1) for _ in range(rng.randint(1, 3)))
+        return f"<div class='section'><span>{words(rng.randint(0, 4))}</span>{inner}</div>"
+
+    nav = ''.join(f"<a href='/nav/{i}'>{words(1)}</a>" for i in range(20))
+    body = ''.join(block(rng.randint(1, depth)) for _ in range(sections))
+    return (
+        "<!DOCTYPE html><html lang='en'><head><title>Synthetic page</title>"
+        "<meta name='description' content='A synthetic page'>"
+        "<meta name='keywords' content='n8n, automation, design'>"
+        "<meta property='article:published_time' content='2024-01-01'>"
+        "<style>body { color: black; }</style></head><body>"
+        f"<header><nav>{nav}</nav></header><main><article><h1>{words(4)}</h1>{body}</article></main>"
+        f"<aside>{words(20)}</aside><footer>{nav}</footer></body></html>"
+    ).encode('utf-8')
+
+def normalize(result):
+    return dict(result, links=sorted(result['links']), images=sorted(result['images']))
+
+def check_equivalence(pages, url):
+    option_sets = [
+        {},
+        {'clean_html': False},
+        {'extract_text': False},
+        {'remove_scripts': False, 'remove_styles': False, 'clean_html': False},
+    ]
+    for body in pages:
+        for options in option_sets:
+            expected = normalize(legacy_extract(body, url, **options))
+            actual = normalize(single_pass_extract(body, url, **options))
+            if expected != actual:
+                raise AssertionError(f"Outputs differ with options {options}")
+
+def time_per_page(extract, pages, url, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        for body in pages:
+            extract(body, url)
+        best = min(best, time.process_time() - start)
+    return best / len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--sections', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [make_page(rng, sections=args.sections) for _ in range(args.pages)]
+    url = 'https://docs.example.com/guide/'
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+
+    check_equivalence(pages[:20], url)
+
+    parse = time_per_page(lambda body, _: BeautifulSoup(body, 'html.parser'), pages, url, args.repeat)
+    legacy = time_per_page(legacy_extract, pages, url, args.repeat)
+    single = time_per_page(single_pass_extract, pages, url, args.repeat)
+
+    print(f"{args.pages} pages, {avg_kb:.1f} KB average, outputs equivalent")
+    print(f"{'pipeline':<14}{'ms/page':>10}{'excl. parse':>14}")
+    print(f"{'parse only':<14}{parse * 1000:>10.2f}{0:>14.2f}")
+    print(f"{'multi-pass':<14}{legacy * 1000:>10.2f}{(legacy - parse) * 1000:>14.2f}")
+    print(f"{'single-pass':<14}{single * 1000:>10.2f}{(single - parse) * 1000:>14.2f}")
+    print(f"speedup: {legacy / single:.2f}x per page, {(legacy - parse) / (single - parse):.2f}x excluding parse")
+
+    print()
+    print(f"{'parser':<14}{'ms/page':>10}")
+    for parser in PARSERS:
+        try:
+            extract_page(pages[0], url, parser)
+        except Exception as e:
+            print(f"{parser:<14}{'unavailable':>10}  ({e.__class__.__name__})")
+            continue
+        if parser == 'lxml-native':
+            for body in pages[:20]:
+                if normalize(extract_page(body, url, 'lxml')) != normalize(extract_page(body, url, parser)):
+                    raise AssertionError("lxml-native output differs from BeautifulSoup + lxml")
+        elapsed = time_per_page(lambda body, u: extract_page(body, u, parser), pages, url, args.repeat)
+        print(f"{parser:<14}{elapsed * 1000:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Memory per record and serialization cost of ScrapedContent versus
+CompactContent and the binary record encoding.
+
+Records are synthetic crawl results: a few KB of text and dozens of links
+and images spread over a handful of hosts. Round trips are checked for
+equality before timing.
+
+    python benchmarks/bench_records.py --records 5000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_records import msgpack, orjson as records_orjson
+from scraper_tools import CompactContent, ScrapedContent
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+WORDS = ("automation workflow node trigger webhook design layout grid stoic virtue "
+         "leadership mentor research synthesis reading progress skill mastery").split()
+HOSTS = ['https://docs.n8n.io/', 'https://community.n8n.io/', 'https://github.com/', 'https://www.youtube.com/']
+
+def make_record(rng, index, words=600, links=60, images=15):
+    def url(kind):
+        path = '/'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        return f"{rng.choice(HOSTS)}{kind}/{path}-{rng.randint(0, 9999)}"
+    return ScrapedContent(
+        url=f"https://docs.n8n.io/page/{index}",
+        title=f"Page {index}: {' '.join(rng.choice(WORDS) for _ in range(5))}",
+        content=' '.join(rng.choice(WORDS) for _ in range(words)),
+        metadata={'description': 'A synthetic page', 'keywords': ['n8n', 'automation'], 'language': 'en'},
+        timestamp='2026-01-01T00:00:00',
+        status=200,
+        word_count=words,
+        links=[url('doc') for _ in range(links)],
+        images=[url('img') + '.png' for _ in range(images)]
+    )
+
+def bytes_per_record(build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+def best_time(fn, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = [make_record(rng, i) for i in range(args.records)]
+
+    # Memory: build each object from fresh copies of its strings, as parsing a page would
+    def fresh(i):
+        r = records[i]
+        copy = lambda s: s.encode().decode()
+        return dict(
+            url=copy(r.url), title=copy(r.title), content=copy(r.content), metadata=dict(r.metadata),
+            timestamp=copy(r.timestamp), status=r.status, word_count=r.word_count,
+            links=[copy(u) for u in r.links], images=[copy(u) for u in r.images]
+        )
+    # The dict copies are garbage once built, so only the objects' own memory is counted
+    plain = bytes_per_record(lambda i: ScrapedContent(**fresh(i)), args.records)
+    compact = bytes_per_record(lambda i: CompactContent(**fresh(i)), args.records)
+    text = sum(sys.getsizeof(r.content) for r in records) / args.records
+    print(f"{args.records} records, {text / 1024:.1f} KB text, "
+          f"{len(records[0].links)} links, {len(records[0].images)} images each")
+    print(f"{'representation':<16}{'bytes/record':>14}{'excl. text':>12}")
+    print(f"{'ScrapedContent':<16}{plain:>14.0f}{plain - text:>12.0f}")
+    print(f"{'CompactContent':<16}{compact:>14.0f}{compact - text:>12.0f}")
+    print(f"non-text memory: {(plain - text) / (compact - text):.2f}x smaller")
+
+    # Serialization
+    codecs = [
+        ('asdict+json indent', lambda r: r.to_json().encode('utf-8'), lambda d: ScrapedContent(**json.loads(d))),
+        ('json compact', lambda r: json.dumps(vars(r), ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+         lambda d: ScrapedContent(**json.loads(d))),
+    ]
+    if orjson is not None:
+        codecs.append(('orjson', lambda r: orjson.dumps(vars(r)), lambda d: ScrapedContent(**orjson.loads(d))))
+    codecs.append((f"binary ({'msgpack' if msgpack else 'orjson array' if records_orjson else 'json array'})", ScrapedContent.to_bytes, ScrapedContent.from_bytes))
+
+    print()
+    print(f"{'codec':<22}{'bytes':>9}{'encode us':>11}{'decode us':>11}")
+    for name, dumps, loads in codecs:
+        encoded = [dumps(r) for r in records]
+        if any(loads(d) != r for d, r in zip(encoded[:50], records)):
+            raise AssertionError(f"{name} round trip differs")
+        size = sum(len(d) for d in encoded) / len(encoded)
+        encode = best_time(dumps, records, args.repeat)
+        decode = best_time(loads, encoded, args.repeat)
+        print(f"{name:<22}{size:>9.0f}{encode * 1e6:>11.1f}{decode * 1e6:>11.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper throughput against the local fixture server: pages/sec,
+p50/p99 latency, CPU per page and peak RSS for each entry point.
+
+Each scenario runs in a fresh worker process with a cold cache, so CPU and
+peak RSS are the scraper's alone (the server runs in this process). All
+fixtures share one host, so politeness is relaxed to delay=0 and
+max_per_host=workers. Results are written as JSON; pass --compare with an
+earlier file to see the change per scenario.
+
+    python benchmarks/bench_scraper.py --output bench_scraper.json
+    python benchmarks/bench_scraper.py --scenarios scrape_pages,slow --compare bench_scraper.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fixture_server import Corpus, start_server
+
+# Scenarios: each gets a scraper, the server URL, the options and a list to
+# append per-call latencies to, and returns how many units it processed.
+# An optional setup step runs first and is not measured.
+
+def timed(latencies, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    return wrapper
+
+def page_urls(base_url, count, pattern='/site/page/{}'):
+    return [base_url + pattern.format(n) for n in range(count)]
+
+def run_scrape_page(scraper, base_url, args, latencies):
+    scrape = timed(latencies, scraper.scrape_page)
+    for url in page_urls(base_url, args.pages // 4):
+        scrape(url)
+    return len(latencies)
+
+def run_scrape_pages(scraper, base_url, args, latencies):
+    scraper.scrape_page = timed(latencies, scraper.scrape_page)
+    return len(scraper.scrape_pages(page_urls(base_url, args.pages), max_workers=args.workers))
+
+def run_scrape_website(scraper, base_url, args, latencies):
+    scraper.scrape_page = timed(latencies, scraper.scrape_page)
+    return len(scraper.scrape_website(base_url + '/site/', max_pages=args.pages, max_workers=args.workers))
+
+def run_scrape_rss(scraper, base_url, args, latencies):
+    scrape = timed(latencies, scraper.scrape_rss)
+    for n in range(args.feeds):
+        scrape(f"{base_url}/feeds/{n}.xml")
+    return args.feeds
+
+def run_scrape_api(scraper, base_url, args, latencies):
+    scrape = timed(latencies, scraper.scrape_api)
+    pages = 0
+    while scrape(f"{base_url}/api/items", params={'page': pages + 1})['data']:
+        pages += 1
+    return pages
+
+def run_iter_api(scraper, base_url, args, latencies):
+    # Latency here is per record, as the consumer sees it
+    records = 0
+    iterator = scraper.iter_api(base_url + '/api/items')
+    while True:
+        start = time.perf_counter()
+        record = next(iterator, None)
+        if record is None:
+            break
+        latencies.append(time.perf_counter() - start)
+        records += 1
+    return records
+
+def run_slow(scraper, base_url, args, latencies):
+    scraper.scrape_page = timed(latencies, scraper.scrape_page)
+    urls = page_urls(base_url, args.pages // 4, f"/slow/{args.slow_ms}/page/{{}}")
+    return len(scraper.scrape_pages(urls, max_workers=args.workers))
+
+def run_large(scraper, base_url, args, latencies):
+    scrape = timed(latencies, scraper.scrape_page)
+    for n in range(10):
+        scrape(f"{base_url}/large/{args.large_kb}", use_cache=False)
+    return 10
+
+def run_failing(scraper, base_url, args, latencies):
+    # Half the URLs fail permanently (404s fail fast, 500s are retried), half succeed after one 503
+    scraper.scrape_page = timed(latencies, scraper.scrape_page)
+    count = args.pages // 4
+    urls = []
+    for n in range(count):
+        urls.append(f"{base_url}/fail/{404 if n % 2 else 500}/{n}")
+        urls.append(f"{base_url}/flaky/1/page/{n}")
+    scraper.scrape_pages(urls, max_workers=args.workers)
+    return len(urls)
+
+def setup_cached(scraper, base_url, args):
+    scraper.scrape_pages(page_urls(base_url, args.pages), max_workers=args.workers)
+
+def run_cached(scraper, base_url, args, latencies):
+    scraper.scrape_page = timed(latencies, scraper.scrape_page)
+    return len(scraper.scrape_pages(page_urls(base_url, args.pages), max_workers=args.workers))
+
+# name: (run, unit, setup)
+SCENARIOS = {
+    'scrape_page': (run_scrape_page, 'pages', None),
+    'scrape_pages': (run_scrape_pages, 'pages', None),
+    'scrape_website': (run_scrape_website, 'pages', None),
+    'scrape_rss': (run_scrape_rss, 'feeds', None),
+    'scrape_api': (run_scrape_api, 'api pages', None),
+    'iter_api': (run_iter_api, 'records', None),
+    'slow': (run_slow, 'pages', None),
+    'large': (run_large, 'pages', None),
+    'failing': (run_failing, 'urls', None),
+    'cached': (run_cached, 'pages', setup_cached),
+}
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_worker(name, base_url, args):
+    """Run one scenario in this (fresh) process and return its measurements"""
+    logging.disable(logging.CRITICAL)
+    from scraper_metrics import ScraperMetrics
+    from scraper_retry import RetryPolicy
+    from scraper_tools import WebScraper
+
+    run, unit, setup = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = WebScraper(
+            delay=0,
+            max_workers=args.workers,
+            max_per_host=args.workers,
+            cache_dir=cache_dir,
+            parser=args.parser,
+            retry_policy=RetryPolicy(backoff_base=0.01, max_backoff=0.05),
+            metrics=ScraperMetrics()
+        )
+        if setup is not None:
+            setup(scraper, base_url, args)
+            scraper.metrics.reset()
+        baseline_rss = peak_rss_mb()
+        latencies = []
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        units = run(scraper, base_url, args, latencies)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        snapshot = scraper.metrics.snapshot()
+        scraper.close()
+
+    latencies.sort()
+    totals = snapshot['totals']
+    return {
+        'unit': unit,
+        'units': units,
+        'wall_s': round(wall, 4),
+        'per_sec': round(units / wall, 2) if wall else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'cpu_ms_per_unit': round(cpu / units * 1000, 3) if units else 0.0,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'requests': totals['counters'].get('requests', 0),
+        'retries': totals['counters'].get('retries', 0),
+        'failures': totals['counters'].get('failures', 0),
+        'phases_ms': {phase: {'p50': round(s['p50'] * 1000, 3), 'mean': round(s['mean'] * 1000, 3)}
+                      for phase, s in totals['phases'].items()},
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_table(results, baseline=None):
+    print(f"{'scenario':<16}{'units':>8}{'unit/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'cpu ms/u':>10}{'rss MB':>8}"
+          + (f"{'vs base':>10}" if baseline else ''))
+    for name, r in results.items():
+        line = (f"{name:<16}{r['units']:>8}{r['per_sec']:>10.1f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                f"{r['cpu_ms_per_unit']:>10.2f}{r['peak_rss_mb']:>8.1f}")
+        if baseline:
+            old = baseline.get(name)
+            line += f"{(r['per_sec'] / old['per_sec'] - 1) * 100:>+9.1f}%" if old and old['per_sec'] else f"{'-':>10}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated subset')
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--feeds', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--parser', default='html.parser')
+    parser.add_argument('--slow-ms', type=int, default=100)
+    parser.add_argument('--large-kb', type=int, default=2048)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the server adds to every response')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default=None, help='write results as JSON to this file')
+    parser.add_argument('--compare', default=None, help='earlier --output file to compare throughput with')
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.base_url, args)))
+        return
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios {unknown}, expected some of {list(SCENARIOS)}")
+
+    server = start_server(Corpus(seed=args.seed, pages=max(args.pages, 50), feeds=args.feeds), latency=args.latency)
+    passthrough = [f"--{key.replace('_', '-')}={value}" for key, value in vars(args).items()
+                   if key in ('pages', 'feeds', 'workers', 'parser', 'slow_ms', 'large_kb')]
+    results = {}
+    try:
+        for name in names:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', name, '--base-url', server.base_url] + passthrough,
+                capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                print(f"{name}: failed\n{completed.stderr}", file=sys.stderr)
+                continue
+            results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['scenarios']
+    print(f"{args.pages} pages, {args.workers} workers, parser {args.parser}, server latency {args.latency * 1000:.0f} ms")
+    print_table(results, baseline)
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'options': {key: value for key, value in vars(args).items()
+                            if key not in ('worker', 'base_url', 'output', 'compare')},
+            },
+            'scenarios': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
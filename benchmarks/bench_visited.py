@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput of the crawl frontier's seen-URL structures: a set of
+canonical URL strings versus FingerprintSet and BloomFilter.
+
+Keys are synthetic canonical URLs over a few documentation hosts, built
+fresh inside the traced window as canonicalize_url would build them, so a
+set is charged for its strings. False positives are measured against as
+many keys that were never added.
+
+    python benchmarks/bench_visited.py --urls 1000000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_dedup import BloomFilter, FingerprintSet
+from scraper_tools import CrawlFrontier
+
+HOSTS = ['https://docs.n8n.io', 'https://community.n8n.io', 'https://github.com', 'https://developer.mozilla.org']
+WORDS = "api guide reference workflow nodes trigger webhook credentials hosting integrations".split()
+
+def make_urls(rng, count, offset=0):
+    urls = []
+    for i in range(offset, offset + count):
+        path = '/'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        query = f"?page={rng.randint(1, 50)}" if i % 5 == 0 else ''
+        urls.append(f"{rng.choice(HOSTS)}/{path}/item-{i}{query}")
+    return urls
+
+def memory_per_url(build, urls):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    seen = build()
+    for url in urls:
+        # A fresh copy of each key, as canonicalize_url returns
+        seen.add(url.encode().decode())
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return memory / len(urls)
+
+def measure(name, build, urls, unseen):
+    memory = memory_per_url(build, urls)
+    gc.collect()
+    seen = build()
+    start = time.perf_counter()
+    for url in urls:
+        seen.add(url)
+    add = time.perf_counter() - start
+    start = time.perf_counter()
+    missing = sum(1 for url in urls if url not in seen)
+    lookup = time.perf_counter() - start
+    false_positives = sum(1 for url in unseen if url in seen)
+    if missing:
+        raise AssertionError(f"{name}: {missing} added keys not found")
+    print(f"{name:<24}{memory:>10.1f}{memory * len(urls) / 2 ** 20:>10.1f}"
+          f"{len(urls) / add / 1000:>10.0f}{len(urls) / lookup / 1000:>10.0f}"
+          f"{false_positives / len(unseen) * 100:>11.4f}")
+
+def frontier_throughput(name, seen, urls):
+    frontier = CrawlFrontier(seen=seen)
+    start = time.perf_counter()
+    for url in urls:
+        frontier.push(url)
+    while frontier:
+        frontier.pop()
+    print(f"{name:<24}{len(urls) / (time.perf_counter() - start) / 1000:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--urls', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    urls = make_urls(rng, args.urls)
+    unseen = make_urls(rng, min(args.urls, 200_000), offset=args.urls)
+    average = sum(len(url) for url in urls) / len(urls)
+    print(f"{args.urls} URLs, {average:.0f} characters on average")
+    print(f"{'structure':<24}{'bytes/url':>10}{'total MB':>10}{'add k/s':>10}{'find k/s':>10}{'false pos%':>11}")
+    measure('set of strings', set, urls, unseen)
+    measure('FingerprintSet', FingerprintSet, urls, unseen)
+    measure('BloomFilter 1%', lambda: BloomFilter(args.urls, 0.01), urls, unseen)
+    measure('BloomFilter 0.1%', lambda: BloomFilter(args.urls, 0.001), urls, unseen)
+    measure('BloomFilter 0.1% grown', lambda: BloomFilter(args.urls // 16, 0.001), urls, unseen)
+
+    print()
+    print(f"{'frontier push+pop':<24}{'k/s':>10}")
+    sample = urls[:200_000]
+    frontier_throughput('set of strings', None, sample)
+    frontier_throughput('FingerprintSet', FingerprintSet(), sample)
+    frontier_throughput('BloomFilter 0.1%', BloomFilter(len(sample), 0.001), sample)
+
+if __name__ == '__main__':
+    main()
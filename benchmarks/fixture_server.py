@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Local HTTP fixture server with a deterministic scraping corpus.
+
+Serves everything the scraper handles, generated from a seed so runs are
+comparable:
+
+    /site/                      index of the HTML site
+    /site/page/<n>              article pages linking to other site pages
+    /feeds/<n>.xml              RSS feeds
+    /api/items?page=<n>         paginated JSON API (Link rel="next" headers)
+    /slow/<ms>/page/<n>         a site page served after a delay
+    /large/<kb>                 an HTML page of about kb kilobytes
+    /fail/<status>/<n>          always answers with that status
+    /flaky/<k>/page/<n>         503 (Retry-After: 0) for the first k requests, then the page
+
+Responses are gzip-compressed when the client accepts it, carry ETags and
+honor If-None-Match, and use HTTP/1.1 keep-alive.
+
+    python benchmarks/fixture_server.py --port 8765
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+WORDS = ("automation workflow node trigger webhook design layout grid stoic virtue "
+         "leadership mentor research synthesis reading progress skill mastery").split()
+
+class Corpus:
+    """Deterministic pages, feeds and API records, rendered lazily and memoized"""
+
+    def __init__(self,
+                 seed: int = 7,
+                 pages: int = 500,
+                 links_per_page: int = 12,
+                 feeds: int = 20,
+                 items_per_feed: int = 30,
+                 api_records: int = 2000,
+                 api_page_size: int = 50):
+        self.seed = seed
+        self.pages = pages
+        self.links_per_page = links_per_page
+        self.feeds = feeds
+        self.items_per_feed = items_per_feed
+        self.api_records = api_records
+        self.api_page_size = api_page_size
+        self._cache: Dict[str, bytes] = {}
+        self._gzipped: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    def _memo(self, key: str, render) -> bytes:
+        body = self._cache.get(key)
+        if body is None:
+            body = render()
+            with self._lock:
+                self._cache[key] = body
+        return body
+
+    def gzipped(self, etag: str, body: bytes) -> bytes:
+        """Compressed body, memoized by ETag so serving costs the same on every request"""
+        compressed = self._gzipped.get(etag)
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=5)
+            with self._lock:
+                self._gzipped[etag] = compressed
+        return compressed
+
+    def warm(self):
+        """Render the whole corpus up front, so first requests are not slower than later ones"""
+        self.index()
+        for n in range(self.pages):
+            self.page(n)
+        for n in range(self.feeds):
+            self.feed(n)
+        for page in range(1, -(-self.api_records // self.api_page_size) + 2):
+            self.api_page(page)
+
+    def index(self) -> bytes:
+        def render():
+            links = ''.join(f"<li><a href='/site/page/{n}'>Page {n}</a></li>" for n in range(min(self.pages, 50)))
+            return (f"<!DOCTYPE html><html lang='en'><head><title>Fixture site</title></head>"
+                    f"<body><main><h1>Fixture site</h1><ul>{links}</ul></main></body></html>").encode('utf-8')
+        return self._memo('index', render)
+
+    def page(self, n: int, kb: int = None) -> bytes:
+        def render():
+            rng = self._rng('page', n)
+            words = lambda count: ' '.join(rng.choice(WORDS) for _ in range(count))
+            # Mostly nearby pages plus a few far ones, like a real site's navigation and related links
+            targets = [(n + rng.randint(1, 10)) % self.pages if rng.random() < 0.7 else rng.randrange(self.pages)
+                       for _ in range(self.links_per_page)]
+            related = ''.join(f"<li><a href='/site/page/{t}'>{words(3)}</a></li>" for t in targets)
+            external = ''.join(f"<a href='https://external.example/{words(1)}/{rng.randint(0, 999)}'>{words(2)}</a>"
+                               for _ in range(5))
+            paragraphs = []
+            size = 0
+            target_size = (kb or rng.randint(8, 40)) * 1024
+            while size < target_size:
+                block = (f"<section class='section'><h2>{words(4)}</h2>"
+                         f"<p>{words(rng.randint(30, 120))}</p>"
+                         f"<div class='ad-banner'>{words(3)}</div>"
+                         f"<img src='/img/{rng.randint(0, 200)}.png' alt='{words(2)}'>"
+                         f"<p>{words(rng.randint(20, 80))} <a href='/site/page/{rng.randrange(self.pages)}'>{words(2)}</a></p>"
+                         f"</section>")
+                paragraphs.append(block)
+                size += len(block)
+            nav = ''.join(f"<a href='/site/page/{i}'>{words(1)}</a>" for i in range(min(self.pages, 10)))
+            return (
+                "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+                f"<title>Page {n}: {words(4)}</title>"
+                f"<meta name='description' content='{words(12)}'>"
+                "<meta name='keywords' content='n8n, automation, design'>"
+                "<style>body { font-family: sans-serif; }</style>"
+                "<script>window.analytics = [];</script></head><body>"
+                f"<header><nav>{nav}</nav></header>"
+                f"<main><article><h1>{words(5)}</h1>{''.join(paragraphs)}</article>"
+                f"<aside><ul>{related}</ul></aside></main>"
+                f"<footer>{external}</footer></body></html>"
+            ).encode('utf-8')
+        return self._memo(f"page:{n}:{kb}", render)
+
+    def feed(self, n: int) -> bytes:
+        def render():
+            rng = self._rng('feed', n)
+            words = lambda count: ' '.join(rng.choice(WORDS) for _ in range(count))
+            items = []
+            for i in range(self.items_per_feed):
+                published = formatdate(1_700_000_000 - (n * 1000 + i) * 3600, usegmt=True)
+                items.append(
+                    f"<item><title>{words(6)}</title><link>/site/page/{rng.randrange(self.pages)}</link>"
+                    f"<guid>feed-{n}-item-{i}</guid><pubDate>{published}</pubDate>"
+                    f"<author>author{rng.randint(1, 9)}@example.com</author>"
+                    f"<description>{words(rng.randint(40, 120))}</description></item>"
+                )
+            return (f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+                    f"<title>Feed {n}</title><link>/site/</link><description>{words(10)}</description>"
+                    f"{''.join(items)}</channel></rss>").encode('utf-8')
+        return self._memo(f"feed:{n}", render)
+
+    def api_page(self, page: int) -> Tuple[bytes, Optional[str]]:
+        """A page of API records and the path of the next page, if any"""
+        pages = -(-self.api_records // self.api_page_size)
+        def render():
+            rng = self._rng('api', page)
+            start = (page - 1) * self.api_page_size
+            records = [
+                {
+                    'id': i,
+                    'title': ' '.join(rng.choice(WORDS) for _ in range(5)),
+                    'skill': rng.choice(WORDS),
+                    'score': round(rng.random(), 4),
+                    'tags': rng.sample(WORDS, 3),
+                    'url': f"/site/page/{i % self.pages}",
+                }
+                for i in range(start, min(start + self.api_page_size, self.api_records))
+            ] if 1 <= page <= pages else []
+            return json.dumps({'data': records, 'meta': {'page': page, 'pages': pages}}).encode('utf-8')
+        next_path = f"/api/items?page={page + 1}" if page < pages else None
+        return self._memo(f"api:{page}", render), next_path
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, corpus: Corpus, latency: float = 0.0):
+        super().__init__(address, FixtureHandler)
+        self.corpus = corpus
+        self.latency = latency  # added to every response, to emulate a network round trip
+        self.hits: Dict[str, int] = {}
+        self.hits_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def hit(self, path: str) -> int:
+        with self.hits_lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            return self.hits[path]
+
+ROUTES = [
+    (re.compile(r'/site/?$'), 'index'),
+    (re.compile(r'/site/page/(\d+)$'), 'page'),
+    (re.compile(r'/feeds/(\d+)\.xml$'), 'feed'),
+    (re.compile(r'/api/items$'), 'api'),
+    (re.compile(r'/slow/(\d+)/page/(\d+)$'), 'slow'),
+    (re.compile(r'/large/(\d+)$'), 'large'),
+    (re.compile(r'/fail/(\d{3})/\d+$'), 'fail'),
+    (re.compile(r'/flaky/(\d+)/page/(\d+)$'), 'flaky'),
+]
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle, delayed ACKs would add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    server: FixtureServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        path, _, query = self.path.partition('?')
+        corpus = self.server.corpus
+        for pattern, route in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            return self._send(404, b'not found', 'text/plain')
+
+        args = match.groups()
+        if route == 'index':
+            return self._send(200, corpus.index(), 'text/html; charset=utf-8')
+        if route == 'page':
+            return self._page(int(args[0]))
+        if route == 'feed':
+            return self._send(200, corpus.feed(int(args[0])), 'application/rss+xml')
+        if route == 'api':
+            params = dict(p.split('=', 1) for p in query.split('&') if '=' in p)
+            body, next_path = corpus.api_page(int(params.get('page', 1)))
+            headers = {'Link': f'<{next_path}>; rel="next"'} if next_path else {}
+            return self._send(200, body, 'application/json', headers)
+        if route == 'slow':
+            time.sleep(int(args[0]) / 1000)
+            return self._page(int(args[1]))
+        if route == 'large':
+            return self._send(200, corpus.page(0, kb=int(args[0])), 'text/html; charset=utf-8')
+        if route == 'fail':
+            return self._send(int(args[0]), b'failure', 'text/plain')
+        if route == 'flaky':
+            if self.server.hit(self.path) <= int(args[0]):
+                return self._send(503, b'try again', 'text/plain', {'Retry-After': '0'})
+            return self._page(int(args[1]))
+
+    def _page(self, n: int):
+        if n >= self.server.corpus.pages:
+            return self._send(404, b'not found', 'text/plain')
+        self._send(200, self.server.corpus.page(n), 'text/html; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        headers = dict(headers or {})
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        if status == 200:
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                status, body = 304, b''
+        if body and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = self.server.corpus.gzipped(etag, body)
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+def start_server(corpus: Corpus = None, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0) -> FixtureServer:
+    """Serve the corpus from a background thread; stop with server.shutdown()"""
+    server = FixtureServer((host, port), corpus or Corpus(), latency=latency)
+    server.corpus.warm()
+    threading.Thread(target=server.serve_forever, name='fixture-server', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    server = FixtureServer((args.host, args.port), Corpus(seed=args.seed, pages=args.pages), latency=args.latency)
+    server.corpus.warm()
+    print(f"Serving fixtures at {server.base_url}/site/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
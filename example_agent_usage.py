@@ -7,7 +7,8 @@ for various tasks in the PATHsassin Master Skills Index context.
 import asyncio
 import json
 from datetime import datetime
-from scraper_tools import WebScraper, scrape_page, scrape_pages, scrape_rss, extract_data
+from scraper_tools import WebScraper, scrape_page, scrape_pages, extract_data
+from scraper_feeds import FeedPoller
 from learning_tools import LearningTools
 
 class AgentScrapingExample:
@@ -21,6 +22,7 @@ class AgentScrapingExample:
             user_agent='PATHsassinAgent/1.0'
         )
         self.learning_tools = LearningTools()
+        self.feed_poller = FeedPoller(scraper=self.scraper)
     
     def research_skill_topic(self, skill_id: str, topic: str):
         """Research a specific topic for skill development"""
@@ -69,18 +71,16 @@ class AgentScrapingExample:
         
         feeds = skill_feeds.get(skill_id, [])
         
-        for feed_url in feeds:
-            try:
-                items = scrape_rss(feed_url)
-                print(f"📰 Found {len(items)} items in {feed_url}")
-                
-                for item in items:
-                    if self._is_relevant_to_skill(item['description'], skill_id):
-                        print(f"🎯 Relevant: {item['title']}")
-                        # Could add to learning list or notify user
-                        
-            except Exception as e:
-                print(f"❌ Failed to scrape feed {feed_url}: {e}")
+        # Polls all feeds at once; only entries not seen on earlier runs come back
+        new_items = self.feed_poller.poll(feeds)
+        
+        for feed_url, items in new_items.items():
+            print(f"📰 Found {len(items)} new items in {feed_url}")
+            
+            for item in items:
+                if self._is_relevant_to_skill(item['description'], skill_id):
+                    print(f"🎯 Relevant: {item['title']}")
+                    # Could add to learning list or notify user
     
     def extract_structured_data(self, url: str, skill_context: str):
         """Extract structured data from a webpage"""
@@ -128,16 +128,22 @@ class AgentScrapingExample:
         print(f"🕷️ Crawling {base_url} for skill {skill_id} content")
         
         try:
-            results = self.scraper.scrape_website(
+            # Pages arrive as they are scraped, so filtering and saving overlap with the crawl.
+            # Links are fetched best-first by relevance to the skill, so the page budget
+            # is not spent on pages the filter below would discard anyway.
+            results = self.scraper.iter_website(
                 base_url,
                 max_pages=max_pages,
                 follow_internal_links=True,
+                focus=self.learning_tools.skills_index[skill_id]["name"],
                 extract_text=True,
                 clean_html=True
             )
             
             relevant_content = []
+            total = 0
             for result in results:
+                total += 1
                 if self._is_relevant_to_skill(result.content, skill_id):
                     relevant_content.append(result)
                     print(f"📚 Relevant: {result.title}")
@@ -146,7 +152,7 @@ class AgentScrapingExample:
                     filename = f"skill_{skill_id}_{result.title[:30].replace(' ', '_')}.txt"
                     self.scraper.save_to_file(result, filename, 'txt')
             
-            print(f"✅ Found {len(relevant_content)} relevant pages out of {len(results)} total")
+            print(f"✅ Found {len(relevant_content)} relevant pages out of {total} total")
             return relevant_content
             
         except Exception as e:
@@ -0,0 +1,226 @@
+import json
+import codecs
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+# Where JSON APIs commonly put a page's records and the link to the next page
+ITEM_KEYS = ('data', 'results', 'items', 'entries', 'records', 'value')
+NEXT_KEYS = ('next', 'next_url', 'nextLink', '@odata.nextLink', 'links.next', 'paging.next', 'meta.next')
+
+JSON_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+def dig(data: Any, path: str) -> Any:
+    """Value at a dotted key path ('meta.next_cursor'), or None if any key is missing"""
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+def find_items(data: Any, items_key: str = None) -> List[Any]:
+    """The list of records in a page: data itself, data[items_key], or the first ITEM_KEYS list"""
+    if items_key:
+        items = dig(data, items_key)
+        return items if isinstance(items, list) else []
+    if isinstance(data, list):
+        return data
+    for key in ITEM_KEYS:
+        if isinstance(data, dict) and isinstance(data.get(key), list):
+            return data[key]
+    return [data] if data is not None else []
+
+class _JSONStream:
+    """Pull-based JSON reader over text decoded incrementally from byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append more text to the buffer; False once the input is exhausted"""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._utf8.decode(b'', final=True)
+        self._eof = True
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at end of input)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                break
+        return self._buf[self._pos] if self._pos < len(self._buf) else ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buf) and isinstance(value, (int, float)) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+def iter_json_items(chunks: Iterable[bytes], items_key: str = None) -> Iterator[Any]:
+    """
+    Yield the records of a JSON document one at a time while it downloads
+
+    The records are the top-level array, the array at the dotted items_key,
+    or, when items_key is None and the document is an object, the first
+    top-level ITEM_KEYS member holding an array. Only one record is held in
+    memory at a time; sibling values before the array are decoded and
+    dropped.
+    """
+    stream = _JSONStream(chunks)
+    path = items_key.split('.') if items_key else None
+
+    if stream.peek() == '{':
+        keys = path or [None]
+        for depth, key in enumerate(keys):
+            stream.expect('{')
+            while True:
+                if stream.peek() == '}':
+                    return  # the array is not in this document
+                name = stream.value()
+                stream.expect(':')
+                wanted = name == key if key is not None else (name in ITEM_KEYS and stream.peek() == '[')
+                if wanted:
+                    break
+                stream.value()
+                if stream.peek() == ',':
+                    stream.expect(',')
+            if depth < len(keys) - 1 and stream.peek() != '{':
+                return
+
+    if stream.peek() != '[':
+        return
+    stream.expect('[')
+    if stream.peek() == ']':
+        return
+    while True:
+        yield stream.value()
+        if stream.peek() == ',':
+            stream.expect(',')
+            continue
+        stream.expect(']')
+        return
+
+class Pagination:
+    """How to get from one page of an API collection to the next"""
+
+    # Pages can be requested without seeing the previous one, so they may be fetched concurrently
+    independent = False
+    # Whether next_request needs the decoded body (so the body cannot be streamed)
+    needs_body = True
+
+    def next_request(self,
+                     url: str,
+                     params: Dict[str, Any],
+                     response: requests.Response,
+                     body: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(url, params) of the next page, or None after the last page"""
+        raise NotImplementedError
+
+class LinkPagination(Pagination):
+    """
+    Follow next links: the Link header's rel="next", else a URL in the body
+
+    The body is searched at next_key, or at the usual NEXT_KEYS when next_key
+    is None. With streaming, only the Link header is used.
+    """
+
+    def __init__(self, next_key: str = None):
+        self.next_key = next_key
+        self.needs_body = next_key is not None
+
+    def next_request(self, url, params, response, body):
+        link = response.links.get('next', {}).get('url')
+        if not link and body is not None:
+            for key in ([self.next_key] if self.next_key else NEXT_KEYS):
+                candidate = dig(body, key)
+                if isinstance(candidate, str) and candidate:
+                    link = candidate
+                    break
+        # The next link already carries the query, so the original params are dropped
+        return (urljoin(url, link), {}) if link else None
+
+class CursorPagination(Pagination):
+    """Send the cursor found at cursor_key in each page back as the cursor_param query parameter"""
+
+    def __init__(self, cursor_key: str, cursor_param: str = 'cursor'):
+        self.cursor_key = cursor_key
+        self.cursor_param = cursor_param
+
+    def next_request(self, url, params, response, body):
+        cursor = dig(body, self.cursor_key)
+        if cursor in (None, ''):
+            return None
+        return url, dict(params, **{self.cursor_param: cursor})
+
+class PagePagination(Pagination):
+    """
+    Numbered pages or offsets: param takes start, start + step, start + 2*step, ...
+
+    Use step=page_size with an offset parameter. Pages are independent, so
+    iter_api can fetch several at once. The collection ends at the first
+    empty page, or at the first short page when page_size is given.
+    """
+
+    independent = True
+    needs_body = False
+
+    def __init__(self,
+                 param: str = 'page',
+                 start: int = 1,
+                 step: int = 1,
+                 page_size: int = None,
+                 size_param: str = None):
+        self.param = param
+        self.start = start
+        self.step = step
+        self.page_size = page_size
+        self.size_param = size_param
+
+    def params_for(self, index: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Query parameters of the index-th page (0-based)"""
+        page_params = dict(params, **{self.param: self.start + index * self.step})
+        if self.size_param and self.page_size:
+            page_params[self.size_param] = self.page_size
+        return page_params
+
+    def is_last(self, count: int) -> bool:
+        """Whether a page with count records ends the collection"""
+        return count == 0 or (self.page_size is not None and count < self.page_size)
+
+    def next_request(self, url, params, response, body):
+        index = (params.get(self.param, self.start) - self.start) // self.step
+        return url, self.params_for(index + 1, params)
@@ -0,0 +1,539 @@
+import sqlite3
+import json
+import threading
+import time
+import os
+import gzip
+import hashlib
+import tempfile
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Memory-tier hits batched before their access times are written to SQLite
+TOUCH_FLUSH_SIZE = 256
+
+class _SQLiteStore:
+    """Per-thread SQLite connections in WAL mode, so readers never block the writer"""
+
+    SCHEMA = ""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite connections must not be shared across threads"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+@dataclass
+class CacheEntry:
+    """A cached value with its HTTP validators and freshness window"""
+    value: Any
+    validators: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+    expires_at: Optional[float] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at is None or time.time() < self.expires_at
+
+class ScrapeCache(_SQLiteStore):
+    """
+    Two-tier cache for scraped results
+
+    An in-process LRU tier sits in front of a single SQLite database that
+    indexes every entry. Entries carry a TTL; expired entries are kept for
+    conditional revalidation until the total stored size exceeds
+    ``max_bytes``, at which point expired and then least recently used
+    entries are evicted. SQLite runs in WAL mode and every write is a
+    single transaction, so several scrapers (threads or processes) can
+    share one cache directory.
+
+    Both tiers hold values encoded with dumps, and every get() decodes a
+    new object, so callers may modify what they get (or what they put)
+    without changing the cached entry.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            validators TEXT NOT NULL DEFAULT '{}',
+            stored_at REAL NOT NULL,
+            expires_at REAL,
+            accessed_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries(accessed_at);
+        CREATE INDEX IF NOT EXISTS entries_expires_at ON entries(expires_at);
+        CREATE TABLE IF NOT EXISTS stats (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            total_size INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO stats (id, total_size) VALUES (0, 0);
+        CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+            UPDATE stats SET total_size = total_size + NEW.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+            UPDATE stats SET total_size = total_size + NEW.size - OLD.size WHERE id = 0;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+            UPDATE stats SET total_size = total_size - OLD.size WHERE id = 0;
+        END;
+    """
+
+    def __init__(self,
+                 cache_dir: str = "scraper_cache",
+                 dumps: Callable[[Any], bytes] = None,
+                 loads: Callable[[bytes], Any] = None,
+                 ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 memory_items: int = 256):
+        self.cache_dir = cache_dir
+        self.dumps = dumps or (lambda value: value)
+        self.loads = loads or (lambda data: data)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+
+        self._lru: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        # Access times of memory-tier hits not yet written to accessed_at
+        self._touched: Dict[str, float] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        super().__init__(os.path.join(cache_dir, "cache.sqlite3"))
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, fresh or expired, or None"""
+        with self._lru_lock:
+            encoded = self._lru.get(key)
+            if encoded is not None:
+                self._lru.move_to_end(key)
+                self._touched[key] = time.time()
+                flush = len(self._touched) >= TOUCH_FLUSH_SIZE
+        if encoded is not None:
+            if flush:
+                self._flush_touched()
+            return self._decode(encoded)
+
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, validators, stored_at, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            encoded = CacheEntry(value=row[0], validators=json.loads(row[1]), stored_at=row[2], expires_at=row[3])
+            entry = self._decode(encoded)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {str(e)}")
+            self.delete(key)
+            return None
+
+        with conn:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self._remember(key, encoded)
+        return entry
+
+    def put(self, key: str, value: Any, validators: Dict[str, str] = None, ttl: Optional[float] = None):
+        """Store value for key atomically, then evict if the cache is over budget"""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        data = self.dumps(value)
+        entry = CacheEntry(
+            value=data,
+            validators=dict(validators or {}),
+            stored_at=now,
+            expires_at=now + ttl if ttl is not None else None
+        )
+
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO entries (key, value, validators, stored_at, expires_at, accessed_at, size)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       value = excluded.value,
+                       validators = excluded.validators,
+                       stored_at = excluded.stored_at,
+                       expires_at = excluded.expires_at,
+                       accessed_at = excluded.accessed_at,
+                       size = excluded.size""",
+                (key, data, json.dumps(entry.validators), now, entry.expires_at, now, len(data))
+            )
+        self._remember(key, entry)
+
+        if self.total_size() > self.max_bytes:
+            self.evict()
+
+    def delete(self, key: str):
+        """Remove key from both tiers"""
+        with self._lru_lock:
+            self._lru.pop(key, None)
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lru_lock:
+            self._lru.clear()
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM entries")
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns the number removed"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+        with self._lru_lock:
+            for key in [k for k, e in self._lru.items() if not e.is_fresh]:
+                del self._lru[key]
+        return cursor.rowcount
+
+    def evict(self, target_bytes: int = None) -> int:
+        """Shrink the store below target_bytes (default 90% of max_bytes); returns entries removed"""
+        target = int(self.max_bytes * 0.9) if target_bytes is None else target_bytes
+        removed = 0
+
+        if self.total_size() > target:
+            removed += self.purge_expired()
+
+        # Memory-tier hits must count as uses, or the hottest entries would go first
+        self._flush_touched()
+        conn = self._connection()
+        while self.total_size() > target:
+            excess = self.total_size() - target
+            with conn:
+                # Least recently used first, only as many as it takes to get under target
+                keys = []
+                for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"):
+                    keys.append(key)
+                    excess -= size
+                    if excess <= 0:
+                        break
+                if not keys:
+                    break
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+            with self._lru_lock:
+                for key in keys:
+                    self._lru.pop(key, None)
+            removed += len(keys)
+
+        if removed:
+            logger.info(f"🧹 Evicted {removed} cache entries")
+        return removed
+
+    def total_size(self) -> int:
+        """Total stored value size in bytes"""
+        row = self._connection().execute("SELECT total_size FROM stats WHERE id = 0").fetchone()
+        return row[0] if row else 0
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _flush_touched(self):
+        """Write the access times of memory-tier hits to accessed_at, which evict() orders by"""
+        with self._lru_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn = self._connection()
+            with conn:
+                conn.executemany("UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                                 [(accessed_at, key) for key, accessed_at in touched.items()])
+
+    def _decode(self, encoded: CacheEntry) -> CacheEntry:
+        return CacheEntry(
+            value=self.loads(encoded.value),
+            validators=dict(encoded.validators),
+            stored_at=encoded.stored_at,
+            expires_at=encoded.expires_at
+        )
+
+    def _remember(self, key: str, entry: CacheEntry):
+        """Keep an entry whose value is still encoded in the memory tier"""
+        if self.memory_items <= 0:
+            return
+        with self._lru_lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.memory_items:
+                self._lru.popitem(last=False)
+
+@dataclass
+class RawPage:
+    """A stored raw response body and the response details needed to re-extract it"""
+    url: str
+    body: bytes
+    status: int
+    content_type: str
+    fetched_at: float
+
+class RawPageStore(_SQLiteStore):
+    """
+    Content-addressed store of compressed raw response bodies
+
+    Bodies are keyed by their SHA-256, so identical pages served under
+    different URLs are stored once. Blobs are compressed with zstd when
+    ``zstandard`` is installed and gzip otherwise, and written through a
+    temporary file plus rename so readers never see partial blobs. A
+    SQLite index maps each URL to its latest body.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS raw_pages (
+            url TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            content_type TEXT NOT NULL DEFAULT '',
+            fetched_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS raw_pages_digest ON raw_pages(digest);
+    """
+
+    def __init__(self, store_dir: str = os.path.join("scraper_cache", "raw")):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        super().__init__(os.path.join(store_dir, "index.sqlite3"))
+
+    def put(self, url: str, body: bytes, status: int = 200, content_type: str = '') -> str:
+        """Store body for url; returns the body's digest"""
+        digest = hashlib.sha256(body).hexdigest()
+        if self._blob_path(digest) is None:
+            self._write_blob(digest, body)
+
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO raw_pages (url, digest, status, content_type, fetched_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       digest = excluded.digest,
+                       status = excluded.status,
+                       content_type = excluded.content_type,
+                       fetched_at = excluded.fetched_at""",
+                (url, digest, status, content_type or '', time.time())
+            )
+        return digest
+
+    def touch(self, url: str):
+        """Mark url's stored body as just fetched (e.g. after a 304 Not Modified)"""
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE raw_pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def get(self, url: str) -> Optional[RawPage]:
+        """Return the stored page for url, or None"""
+        row = self._connection().execute(
+            "SELECT url, digest, status, content_type, fetched_at FROM raw_pages WHERE url = ?", (url,)
+        ).fetchone()
+        return self._load(row) if row else None
+
+    def iter_pages(self, urls: List[str] = None) -> Iterator[RawPage]:
+        """Yield stored pages for urls, or for every stored URL"""
+        if urls is not None:
+            for url in urls:
+                page = self.get(url)
+                if page is not None:
+                    yield page
+            return
+
+        rows = self._connection().execute(
+            "SELECT url, digest, status, content_type, fetched_at FROM raw_pages ORDER BY url"
+        )
+        for row in rows.fetchall():
+            page = self._load(row)
+            if page is not None:
+                yield page
+
+    def urls(self) -> List[str]:
+        return [row[0] for row in self._connection().execute("SELECT url FROM raw_pages ORDER BY url")]
+
+    def prune(self) -> int:
+        """Delete blobs no URL refers to any more; returns the number removed"""
+        referenced = {row[0] for row in self._connection().execute("SELECT DISTINCT digest FROM raw_pages")}
+        removed = 0
+        for root, _, files in os.walk(self.store_dir):
+            for name in files:
+                digest, ext = os.path.splitext(name)
+                if ext in ('.zst', '.gz') and digest not in referenced:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM raw_pages").fetchone()[0]
+
+    def _load(self, row) -> Optional[RawPage]:
+        url, digest, status, content_type, fetched_at = row
+        try:
+            body = self._read_blob(digest)
+        except Exception as e:
+            logger.warning(f"Missing or unreadable raw body for {url}: {str(e)}")
+            return None
+        return RawPage(url=url, body=body, status=status, content_type=content_type, fetched_at=fetched_at)
+
+    def _blob_path(self, digest: str) -> Optional[str]:
+        """Path of an existing blob for digest, whichever codec wrote it"""
+        base = os.path.join(self.store_dir, digest[:2], digest)
+        for ext in ('.zst', '.gz'):
+            if os.path.exists(base + ext):
+                return base + ext
+        return None
+
+    def _write_blob(self, digest: str, body: bytes):
+        blob_dir = os.path.join(self.store_dir, digest[:2])
+        os.makedirs(blob_dir, exist_ok=True)
+        if zstandard is not None:
+            data, ext = zstandard.ZstdCompressor(level=10).compress(body), '.zst'
+        else:
+            data, ext = gzip.compress(body, compresslevel=6), '.gz'
+
+        fd, tmp_path = tempfile.mkstemp(dir=blob_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(blob_dir, digest + ext))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_blob(self, digest: str) -> bytes:
+        path = self._blob_path(digest)
+        if path is None:
+            raise FileNotFoundError(digest)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst blobs")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+@dataclass
+class PageHistory:
+    """What an incremental crawl knows about a URL: its last body hash and how often it changes"""
+    url: str
+    content_hash: str
+    first_seen: float
+    last_checked: float
+    last_changed: float
+    checks: int
+    changes: int
+    next_visit: float
+
+    @property
+    def is_due(self) -> bool:
+        return time.time() >= self.next_visit
+
+class CrawlHistory(_SQLiteStore):
+    """
+    Per-URL change history for incremental crawls
+
+    Every check records the body's hash. A page's revisit interval is its
+    observed mean time between changes, (last_checked - first_seen) /
+    (changes + 1), clamped to [min_interval, max_interval]: a page that has
+    not changed in four weeks is next checked four weeks later, one that
+    changed three times in three weeks after about five days.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS page_history (
+            url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            last_checked REAL NOT NULL,
+            last_changed REAL NOT NULL,
+            checks INTEGER NOT NULL,
+            changes INTEGER NOT NULL,
+            next_visit REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS page_history_next_visit ON page_history(next_visit);
+    """
+
+    COLUMNS = "url, content_hash, first_seen, last_checked, last_changed, checks, changes, next_visit"
+
+    def __init__(self,
+                 cache_dir: str = "scraper_cache",
+                 min_interval: float = 3600,
+                 max_interval: float = 30 * 24 * 3600):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        os.makedirs(cache_dir, exist_ok=True)
+        super().__init__(os.path.join(cache_dir, "history.sqlite3"))
+
+    def get(self, url: str) -> Optional[PageHistory]:
+        row = self._connection().execute(
+            f"SELECT {self.COLUMNS} FROM page_history WHERE url = ?", (url,)
+        ).fetchone()
+        return PageHistory(*row) if row else None
+
+    def record(self, url: str, content_hash: str) -> PageHistory:
+        """Record a check of url that saw content_hash; returns the updated history"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            row = conn.execute(
+                f"SELECT {self.COLUMNS} FROM page_history WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                history = PageHistory(url, content_hash, now, now, now, 1, 0, now)
+            else:
+                history = PageHistory(*row)
+                history.checks += 1
+                history.last_checked = now
+                if content_hash != history.content_hash:
+                    history.content_hash = content_hash
+                    history.last_changed = now
+                    history.changes += 1
+            history.next_visit = now + self.revisit_interval(history)
+            conn.execute(
+                f"INSERT OR REPLACE INTO page_history ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (history.url, history.content_hash, history.first_seen, history.last_checked,
+                 history.last_changed, history.checks, history.changes, history.next_visit)
+            )
+        return history
+
+    def revisit_interval(self, history: PageHistory) -> float:
+        observed = history.last_checked - history.first_seen
+        return min(self.max_interval, max(self.min_interval, observed / (history.changes + 1)))
+
+    def due(self, now: float = None) -> List[str]:
+        """URLs whose next visit is due, most overdue first"""
+        now = time.time() if now is None else now
+        return [row[0] for row in self._connection().execute(
+            "SELECT url FROM page_history WHERE next_visit <= ? ORDER BY next_visit", (now,)
+        )]
+
+    def changed_since(self, timestamp: float) -> List[str]:
+        """URLs whose content changed after timestamp"""
+        return [row[0] for row in self._connection().execute(
+            "SELECT url FROM page_history WHERE last_changed > ? AND changes > 0 ORDER BY url", (timestamp,)
+        )]
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM page_history").fetchone()[0]
@@ -0,0 +1,670 @@
+import os
+import re
+import json
+import time
+import socket
+import sqlite3
+import inspect
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+from scraper_cache import _SQLiteStore
+from scraper_crawl import URL_DONE, URL_DUPLICATE, URL_FAILED, URL_QUEUED, signed64, unsigned64
+from scraper_dedup import NearDuplicateIndex, canonicalize_url
+from scraper_export import ResultWriter, read_results
+from scraper_focus import RelevanceScorer
+from scraper_metrics import ScraperMetrics
+from scraper_tools import HostRateLimiter, ScrapedContent, WebScraper
+
+logger = logging.getLogger(__name__)
+
+WORKER_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_.-]+')
+
+# Extra CrawlCoordinator.start() options workers can pass on to scrape_page
+SCRAPE_OPTIONS = frozenset(inspect.signature(WebScraper.scrape_page).parameters) - {'self', 'url'}
+
+# Claimed by a crawl worker and being fetched (SharedFrontier only)
+URL_CLAIMED = 4
+
+class SharedFrontier(_SQLiteStore):
+    """
+    Crawl frontier shared by several worker processes through one SQLite (WAL) database
+
+    Hosts are partitioned between workers: a worker leases a host before it
+    may claim that host's URLs, and no other worker fetches from it until
+    the lease ends, so each worker's per-host delay and concurrency limits
+    hold for the crawl as a whole. A released host stays closed for its
+    politeness delay. Leases are renewed by each worker's heartbeat; when a
+    worker stops heart-beating for lease_seconds, its hosts and claimed
+    URLs return to the pool. Every state change happens in one immediate
+    transaction, so workers never claim the same URL twice.
+
+    URLs are keyed like the crawl frontier (e.g. by canonical form) and
+    deduplicated across all workers. Result parts are recorded with the
+    progress they belong to, so parts written by a worker that died before
+    committing are never read back. Near-duplicate fingerprints are shared
+    too (see deduplicate()), so a page is dropped as a near-duplicate of one
+    any worker kept.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS urls (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            host TEXT NOT NULL,
+            state INTEGER NOT NULL,
+            score REAL NOT NULL DEFAULT 0,
+            worker TEXT
+        );
+        CREATE INDEX IF NOT EXISTS urls_state_host ON urls(state, host);
+        CREATE INDEX IF NOT EXISTS urls_host_state_score ON urls(host, state, score DESC);
+        CREATE TABLE IF NOT EXISTS hosts (
+            host TEXT PRIMARY KEY,
+            worker TEXT,
+            lease_expires REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS hosts_worker ON hosts(worker);
+        CREATE TABLE IF NOT EXISTS workers (
+            name TEXT PRIMARY KEY,
+            heartbeat REAL NOT NULL,
+            info TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS parts (
+            path TEXT PRIMARY KEY,
+            worker TEXT NOT NULL,
+            committed_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            seq INTEGER PRIMARY KEY,
+            fingerprint INTEGER NOT NULL UNIQUE,
+            key TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, directory: str, lease_seconds: float = 60.0):
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(os.path.join(directory, "frontier.sqlite3"))
+
+    def _transaction(self) -> sqlite3.Connection:
+        # Take the write lock up front: a deferred transaction that reads, then
+        # writes, fails instead of waiting when another worker writes in between
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def meta(self) -> Dict[str, Any]:
+        return {name: json.loads(value) for name, value in self._connection().execute("SELECT name, value FROM meta")}
+
+    def set_meta(self, **values):
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                ((name, json.dumps(value)) for name, value in values.items())
+            )
+
+    def add(self, discovered: List[tuple]):
+        """Queue (key, url, host, score) URLs not seen before; raise the score of still-queued ones"""
+        conn = self._transaction()
+        with conn:
+            self._add(conn, discovered)
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, discovered: List[tuple]):
+        conn.executemany(
+            f"INSERT OR IGNORE INTO urls (key, url, host, state, score) VALUES (?, ?, ?, {URL_QUEUED}, ?)",
+            discovered
+        )
+        conn.executemany(
+            f"UPDATE urls SET score = ? WHERE key = ? AND state = {URL_QUEUED} AND score < ?",
+            ((score, key, score) for key, _, _, score in discovered)
+        )
+
+    def claim(self, worker: str, limit: int, max_hosts: int = 8, budget: int = None,
+              info: Dict[str, Any] = None, release_delay: float = 0.0) -> List[tuple]:
+        """
+        Lease hosts for worker and claim up to limit of their queued URLs, best score first
+
+        A worker holds at most max_hosts hosts, and no more than its fair
+        share of the hosts with work left, so workers that join later get
+        hosts too: surplus hosts with no URLs in flight are handed back,
+        closed to other workers for release_delay seconds. budget caps the
+        pages done plus claimed over the whole crawl. Returns (key, url,
+        score) tuples; empty when nothing is claimable now.
+        """
+        now = time.time()
+        conn = self._transaction()
+        with conn:
+            self._beat(conn, worker, now, info)
+            self._reclaim(conn, now)
+
+            if budget is not None:
+                done, claimed = conn.execute(
+                    f"SELECT COALESCE(SUM(state = {URL_DONE}), 0), COALESCE(SUM(state = {URL_CLAIMED}), 0) "
+                    f"FROM urls WHERE state IN ({URL_DONE}, {URL_CLAIMED})"
+                ).fetchone()
+                limit = min(limit, budget - done - claimed)
+                if limit <= 0:
+                    return []
+
+            live = conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE heartbeat >= ? AND json_extract(info, '$.state') IS NOT 'stopped'",
+                (now - self.lease_seconds,)
+            ).fetchone()[0]
+            pending = conn.execute(
+                f"SELECT COUNT(DISTINCT host) FROM urls WHERE state IN ({URL_QUEUED}, {URL_CLAIMED})"
+            ).fetchone()[0]
+            share = min(max_hosts, max(1, -(-pending // max(1, live))))
+            owned = conn.execute("SELECT COUNT(*) FROM hosts WHERE worker = ?", (worker,)).fetchone()[0]
+            if owned > share:
+                surplus = [row[0] for row in conn.execute(
+                    f"SELECT host FROM hosts WHERE worker = ? AND NOT EXISTS (SELECT 1 FROM urls WHERE "
+                    f"urls.host = hosts.host AND state = {URL_CLAIMED}) LIMIT ?",
+                    (worker, owned - share)
+                )]
+                conn.executemany("UPDATE hosts SET worker = NULL, lease_expires = ? WHERE host = ?",
+                                 ((now + release_delay, host) for host in surplus))
+                owned -= len(surplus)
+            if owned < share:
+                free = [row[0] for row in conn.execute(
+                    f"SELECT DISTINCT host FROM urls WHERE state = {URL_QUEUED} AND host NOT IN "
+                    "(SELECT host FROM hosts WHERE lease_expires > ?) LIMIT ?",
+                    (now, share - owned)
+                )]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO hosts (host, worker, lease_expires) VALUES (?, ?, ?)",
+                    ((host, worker, now + self.lease_seconds) for host in free)
+                )
+
+            claimed = conn.execute(
+                f"SELECT key, url, score FROM urls WHERE state = {URL_QUEUED} "
+                "AND host IN (SELECT host FROM hosts WHERE worker = ?) ORDER BY score DESC, rowid LIMIT ?",
+                (worker, limit)
+            ).fetchall()
+            conn.executemany(
+                f"UPDATE urls SET state = {URL_CLAIMED}, worker = ? WHERE key = ?",
+                ((worker, key) for key, _, _ in claimed)
+            )
+        return claimed
+
+    def complete(self, worker: str, finished: List[tuple], discovered: List[tuple] = (),
+                 parts: List[str] = (), info: Dict[str, Any] = None, release_delay: float = 0.0) -> int:
+        """
+        Record a batch: finished (key, state) claims, newly discovered (key, url, host, score) URLs
+        and the result parts holding the batch's pages, atomically
+
+        Hosts leased by worker that have nothing left queued are released,
+        closed to other workers for release_delay seconds. Returns how many claims were still worker's
+        (a claim taken back after a missed heartbeat is not overwritten).
+        """
+        now = time.time()
+        conn = self._transaction()
+        with conn:
+            self._add(conn, discovered)
+            accepted = 0
+            for key, state in finished:
+                accepted += conn.execute(
+                    f"UPDATE urls SET state = ?, worker = NULL WHERE key = ? AND worker = ? AND state = {URL_CLAIMED}",
+                    (state, key, worker)
+                ).rowcount
+            conn.executemany(
+                "INSERT OR IGNORE INTO parts (path, worker, committed_at) VALUES (?, ?, ?)",
+                ((os.path.relpath(path, self.directory), worker, now) for path in parts)
+            )
+            conn.execute(
+                f"UPDATE hosts SET worker = NULL, lease_expires = ? WHERE worker = ? AND NOT EXISTS "
+                f"(SELECT 1 FROM urls WHERE urls.host = hosts.host AND state IN ({URL_QUEUED}, {URL_CLAIMED}))",
+                (now + release_delay, worker)
+            )
+            self._beat(conn, worker, now, info)
+        return accepted
+
+    def deduplicate(self, index: Any, candidates: List[tuple], since: int = 0) -> Tuple[Dict[str, str], int]:
+        """
+        Check (key, fingerprint) pages against the near-duplicates of every worker, atomically
+
+        index is the caller's NearDuplicateIndex, a mirror of the shared
+        fingerprints that is first brought up to date with those stored
+        after seq since. Pages without a near-duplicate (or whose fingerprint
+        is None) are kept and their fingerprints stored for all workers.
+        Returns ({key: key of the earlier near-duplicate}, the new since).
+        A match stored under the page's own key (a re-fetch after a worker
+        died before committing) does not count.
+        """
+        duplicates = {}
+        conn = self._transaction()
+        with conn:
+            for seq, fingerprint, key in conn.execute(
+                "SELECT seq, fingerprint, key FROM fingerprints WHERE seq > ? ORDER BY seq", (since,)
+            ):
+                index.add(unsigned64(fingerprint), key)
+            for key, fingerprint in candidates:
+                if fingerprint is None:
+                    continue
+                original = index.find(fingerprint)
+                if original is None:
+                    index.add(fingerprint, key)
+                    conn.execute("INSERT OR IGNORE INTO fingerprints (fingerprint, key) VALUES (?, ?)",
+                                 (signed64(fingerprint), key))
+                elif original != key:
+                    duplicates[key] = original
+            since = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM fingerprints").fetchone()[0]
+        return duplicates, since
+
+    def heartbeat(self, worker: str, info: Dict[str, Any] = None):
+        """Keep worker's host leases and claims alive"""
+        conn = self._transaction()
+        with conn:
+            self._beat(conn, worker, time.time(), info)
+
+    def release(self, worker: str, info: Dict[str, Any] = None, release_delay: float = 0.0):
+        """Return worker's claims and hosts to the pool (when it stops)"""
+        now = time.time()
+        conn = self._transaction()
+        with conn:
+            conn.execute(
+                f"UPDATE urls SET state = {URL_QUEUED}, worker = NULL WHERE worker = ? AND state = {URL_CLAIMED}",
+                (worker,)
+            )
+            conn.execute("UPDATE hosts SET worker = NULL, lease_expires = ? WHERE worker = ?",
+                         (now + release_delay, worker))
+            if info is not None:
+                conn.execute("UPDATE workers SET info = ? WHERE name = ?", (json.dumps(info), worker))
+
+    def _beat(self, conn: sqlite3.Connection, worker: str, now: float, info: Optional[Dict[str, Any]]):
+        if info is None:
+            conn.execute(
+                "INSERT INTO workers (name, heartbeat) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (worker, now)
+            )
+        else:
+            conn.execute(
+                "INSERT INTO workers (name, heartbeat, info) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET heartbeat = excluded.heartbeat, info = excluded.info",
+                (worker, now, json.dumps(info))
+            )
+        conn.execute("UPDATE hosts SET lease_expires = ? WHERE worker = ?", (now + self.lease_seconds, worker))
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float):
+        """Return the claims of workers that stopped heart-beating; their host leases lapse by themselves"""
+        conn.execute(
+            f"UPDATE urls SET state = {URL_QUEUED}, worker = NULL WHERE state = {URL_CLAIMED} "
+            "AND worker IN (SELECT name FROM workers WHERE heartbeat < ?)",
+            (now - self.lease_seconds,)
+        )
+
+    def is_finished(self, budget: int = None) -> bool:
+        """True when nothing is queued or claimed anywhere, or budget pages are done"""
+        conn = self._connection()
+        if budget is not None:
+            done = conn.execute(f"SELECT COUNT(*) FROM urls WHERE state = {URL_DONE}").fetchone()[0]
+            if done >= budget:
+                return True
+        return conn.execute(
+            f"SELECT 1 FROM urls WHERE state IN ({URL_QUEUED}, {URL_CLAIMED}) LIMIT 1"
+        ).fetchone() is None
+
+    def parts(self) -> List[str]:
+        """Committed result parts, in commit order"""
+        return [os.path.join(self.directory, path) for path, in self._connection().execute(
+            "SELECT path FROM parts ORDER BY committed_at, path"
+        )]
+
+    def workers(self) -> Dict[str, Dict[str, Any]]:
+        """Each worker's last heartbeat and reported info"""
+        return {name: dict(json.loads(info), heartbeat=heartbeat) for name, heartbeat, info in
+                self._connection().execute("SELECT name, heartbeat, info FROM workers ORDER BY name")}
+
+    def counts(self) -> Dict[str, int]:
+        names = {URL_QUEUED: 'queued', URL_CLAIMED: 'claimed', URL_DONE: 'done',
+                 URL_FAILED: 'failed', URL_DUPLICATE: 'duplicates'}
+        counts = dict.fromkeys(names.values(), 0)
+        for state, count in self._connection().execute("SELECT state, COUNT(*) FROM urls GROUP BY state"):
+            counts[names[state]] = count
+        return counts
+
+def _default_worker_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class CrawlWorker:
+    """
+    One crawl process: claims batches of URLs from a SharedFrontier, fetches
+    them, and reports results and discovered links back
+
+    The worker leases up to max_hosts hosts at a time and only fetches from
+    hosts it holds, so its scraper's per-host delay and concurrency limits
+    are the crawl's global limits. Each batch's results go to a new part
+    (``results-<worker>-NNNNN``) that is committed together with the batch's
+    progress. A background thread heart-beats every lease_seconds / 3; if
+    the process dies, its hosts and claimed URLs go to other workers once
+    the lease runs out. Pages are checked for near-duplicates against the
+    pages kept by every worker (SharedFrontier.deduplicate).
+    """
+
+    def __init__(self,
+                 directory: str,
+                 name: str = None,
+                 scraper: WebScraper = None,
+                 batch_size: int = 50,
+                 max_hosts: int = 8,
+                 lease_seconds: float = 60.0,
+                 poll_interval: float = 1.0,
+                 **writer_options):
+        self.directory = directory
+        self.frontier = SharedFrontier(directory, lease_seconds)
+        options = self.frontier.meta().get('options')
+        if options is None:
+            raise ValueError(f"No crawl started in {directory}; use CrawlCoordinator.start()")
+
+        self.name = WORKER_NAME_PATTERN.sub('_', name or _default_worker_name())
+        self.scraper = scraper or WebScraper(metrics=ScraperMetrics())
+        self.batch_size = batch_size
+        self.max_hosts = max_hosts
+        self.poll_interval = poll_interval
+        self.writer = ResultWriter(directory, prefix=f"results-{self.name}", **writer_options)
+
+        options = dict(options)
+        self.base_url = options.pop('base_url')
+        self.max_pages = options.pop('max_pages')
+        self.allowed_domains = options.pop('allowed_domains') or [HostRateLimiter.host_of(self.base_url)]
+        self.exclude_patterns = options.pop('exclude_patterns') or []
+        self.key = canonicalize_url if options.pop('canonicalize') else (lambda url: url)
+        dedup_distance = options.pop('dedup_distance')
+        self.duplicates = NearDuplicateIndex(dedup_distance) if dedup_distance is not None else None
+        self.fingerprints_seen = 0  # how much of the shared fingerprints self.duplicates mirrors
+        self.min_link_score = options.pop('min_link_score')
+        self.scorer = None
+        focus = options.pop('focus')
+        if focus is not None:
+            self.scorer = RelevanceScorer.from_focus(focus)
+            options.setdefault('link_text', True)
+        self.scrape_options = options  # the rest go to scrape_page
+
+        self.pages = 0
+        self.failures = 0
+        self.duplicate_pages = 0
+        self.started = time.time()
+
+    def info(self, state: str = 'running') -> Dict[str, Any]:
+        """Progress reported to the shared frontier, merged by CrawlCoordinator.stats()"""
+        return {
+            'state': state,
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'started': self.started,
+            'pages': self.pages,
+            'failures': self.failures,
+            'duplicates': self.duplicate_pages,
+            'metrics': self.scraper.metrics.export_state(),
+        }
+
+    def run(self, stop: threading.Event = None) -> Dict[str, Any]:
+        """Crawl until the frontier is exhausted, max_pages are done, or stop is set; returns info()"""
+        stop = stop or threading.Event()
+        beating = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(beating,), daemon=True)
+        heartbeat.start()
+        logger.info(f"🕸️ Crawl worker {self.name} joined {self.directory}")
+        try:
+            with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as executor:
+                while not stop.is_set():
+                    batch = self.frontier.claim(self.name, self.batch_size, self.max_hosts, budget=self.max_pages,
+                                               release_delay=self.scraper.delay)
+                    if batch:
+                        self._process(batch, executor)
+                    elif self.frontier.is_finished(self.max_pages):
+                        break
+                    else:
+                        # Other workers hold the remaining hosts, or are still discovering links
+                        stop.wait(self.poll_interval)
+        finally:
+            beating.set()
+            self.writer.close()
+            self.frontier.release(self.name, self.info('stopped'), release_delay=self.scraper.delay)
+        logger.info(f"✅ Crawl worker {self.name} done: {self.pages} pages, {self.failures} failures")
+        return self.info('stopped')
+
+    def _heartbeat(self, stop: threading.Event):
+        while not stop.wait(self.frontier.lease_seconds / 3):
+            try:
+                self.frontier.heartbeat(self.name)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for {self.name}: {str(e)}")
+
+    def _visit(self, url: str) -> Tuple[ScrapedContent, Optional[int]]:
+        # The SimHash is computed in the fetching thread, like scrape_website's
+        content = self.scraper.scrape_page(url, **self.scrape_options)
+        return content, self.duplicates.fingerprint(content.content) if self.duplicates is not None else None
+
+    def _process(self, batch: List[tuple], executor: ThreadPoolExecutor):
+        futures = {executor.submit(self._visit, url): (key, url) for key, url, _ in batch}
+        published = len(self.writer.paths)
+        finished = []
+        discovered = []
+        fetched = []
+        for future in as_completed(futures):
+            key, url = futures[future]
+            try:
+                content, fingerprint = future.result()
+            except Exception as e:
+                logger.error(f"Failed to scrape {url}: {str(e)}")
+                finished.append((key, URL_FAILED))
+                self.failures += 1
+                continue
+            fetched.append((key, url, content, fingerprint))
+
+        duplicates = {}
+        if self.duplicates is not None:
+            duplicates, self.fingerprints_seen = self.frontier.deduplicate(
+                self.duplicates, [(key, fingerprint) for key, _, _, fingerprint in fetched], self.fingerprints_seen)
+
+        for key, url, content, _ in fetched:
+            original = duplicates.get(key)
+            if original is not None:
+                logger.info(f"Skipping near-duplicate of {original}: {url}")
+                finished.append((key, URL_DUPLICATE))
+                self.duplicate_pages += 1
+                continue
+
+            content, links = self._links(content)
+            discovered.extend(links)
+            self.writer.write(content)
+            finished.append((key, URL_DONE))
+            self.pages += 1
+
+        self.writer.close()
+        self.frontier.complete(self.name, finished, discovered, self.writer.paths[published:],
+                               info=self.info(), release_delay=self.scraper.delay)
+
+    def _links(self, content: ScrapedContent) -> Tuple[ScrapedContent, List[tuple]]:
+        """The page as it is written (with its relevance under focus) and (key, url, host, score) of its links to queue"""
+        links = self.scraper._find_internal_links(content.links, self.base_url,
+                                                  self.allowed_domains, self.exclude_patterns)
+        if self.scorer is None:
+            scored = [(link, 0.0) for link in links]
+        else:
+            metadata, scored = self.scorer.score_page(content.title, content.content, content.metadata,
+                                                      links, self.min_link_score)
+            content = replace(content, metadata=metadata)
+        return content, [(self.key(link), urldefrag(link)[0], HostRateLimiter.host_of(link), score)
+                         for link, score in scored]
+
+def run_worker(directory: str, name: str = None, scraper_options: Dict[str, Any] = None,
+               **worker_options) -> Dict[str, Any]:
+    """Run one CrawlWorker with its own WebScraper (the entry point of worker processes)"""
+    scraper = WebScraper(metrics=ScraperMetrics(), **(scraper_options or {}))
+    try:
+        return CrawlWorker(directory, name, scraper, **worker_options).run()
+    finally:
+        scraper.close()
+
+class CrawlCoordinator:
+    """
+    Splits one crawl across several worker processes through a shared frontier
+
+    The frontier lives in ``directory/frontier.sqlite3`` (see
+    SharedFrontier) and results in per-worker parts beside it. start()
+    records the crawl's settings and seeds the frontier; run() starts local
+    worker processes and waits for them. More workers can join from other
+    shells on the same machine with ``python scraper_cluster.py worker
+    DIRECTORY``. Hosts are partitioned between workers, so a crawl scales
+    with the number of hosts it spans; a single host is still fetched at
+    its politeness limit. Results and statistics of all workers are merged
+    by results() and stats().
+
+        coordinator = CrawlCoordinator('crawls/docs')
+        coordinator.start('https://docs.n8n.io', max_pages=50_000,
+                          allowed_domains=['docs.n8n.io', 'community.n8n.io', 'blog.n8n.io'])
+        coordinator.run(workers=4, scraper_options={'delay': 1.0})
+        for page in coordinator.results():
+            ...
+    """
+
+    def __init__(self, directory: str, lease_seconds: float = 60.0):
+        self.directory = directory
+        self.frontier = SharedFrontier(directory, lease_seconds)
+
+    def start(self,
+              base_url: str,
+              max_pages: int = 100,
+              allowed_domains: List[str] = None,
+              exclude_patterns: List[str] = None,
+              canonicalize: bool = True,
+              dedup_distance: Optional[int] = 3,
+              focus: Any = None,
+              min_link_score: float = None,
+              seeds: List[str] = None,
+              **kwargs):
+        """
+        Record a new crawl's settings and queue its seed URLs
+
+        Arguments are iter_website's; seeds are extra start URLs (e.g. the
+        front pages of every allowed domain). kwargs go to scrape_page
+        (extract_images, link_text, use_cache, ...) and must be
+        JSON-serializable; anything else raises ValueError here rather than
+        in every worker.
+        """
+        if self.frontier.meta().get('options') is not None:
+            raise ValueError(f"{self.directory} already holds a crawl")
+        unsupported = sorted(set(kwargs) - SCRAPE_OPTIONS)
+        if unsupported:
+            raise ValueError(f"Unsupported crawl options {unsupported}; extra options go to scrape_page, "
+                             f"which accepts {sorted(SCRAPE_OPTIONS)}")
+        if isinstance(focus, RelevanceScorer):
+            focus = focus.to_dict()
+        options = dict(kwargs, base_url=base_url, max_pages=max_pages, allowed_domains=allowed_domains,
+                       exclude_patterns=exclude_patterns, canonicalize=canonicalize,
+                       dedup_distance=dedup_distance, focus=focus, min_link_score=min_link_score)
+        try:
+            json.dumps(options)
+        except TypeError as e:
+            raise ValueError(f"Crawl options must be JSON-serializable to be shared with workers: {e}") from e
+        key = canonicalize_url if canonicalize else (lambda url: url)
+        self.frontier.add([(key(url), urldefrag(url)[0], HostRateLimiter.host_of(url), 1.0)
+                           for url in [base_url] + list(seeds or [])])
+        self.frontier.set_meta(options=options, started_at=time.time())
+
+    def run(self, workers: int = 4, scraper_options: Dict[str, Any] = None, **worker_options) -> Dict[str, Any]:
+        """
+        Run workers local processes until the crawl is done, and return stats()
+
+        scraper_options configure each worker's WebScraper (delay,
+        max_per_host, max_workers, cache_dir, ...); worker_options go to
+        CrawlWorker (batch_size, max_hosts, ...).
+        """
+        context = multiprocessing.get_context('spawn')
+        processes = [
+            context.Process(target=run_worker,
+                            args=(self.directory, f"{socket.gethostname()}-{os.getpid()}-{n}", scraper_options),
+                            kwargs=dict(worker_options, lease_seconds=self.frontier.lease_seconds))
+            for n in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            raise
+        failed = [process.exitcode for process in processes if process.exitcode]
+        if failed:
+            logger.warning(f"{len(failed)} crawl workers exited with errors; run() again to finish the crawl")
+        return self.stats()
+
+    def metrics(self) -> ScraperMetrics:
+        """Phase timings and counters of all workers, merged"""
+        merged = ScraperMetrics()
+        for info in self.frontier.workers().values():
+            if 'metrics' in info:
+                merged.merge_state(info['metrics'])
+        return merged
+
+    def stats(self) -> Dict[str, Any]:
+        """URL counts by state, each worker's progress, and the merged metrics totals"""
+        now = time.time()
+        workers = {}
+        for name, info in self.frontier.workers().items():
+            info.pop('metrics', None)
+            if info.get('state') != 'stopped' and now - info['heartbeat'] > self.frontier.lease_seconds:
+                info['state'] = 'lost'
+            workers[name] = info
+        return {
+            'urls': self.frontier.counts(),
+            'workers': workers,
+            'metrics': self.metrics().snapshot()['totals'],
+        }
+
+    def results(self, as_dict: bool = False) -> Iterator[ScrapedContent]:
+        """Stream the results of every worker, in the order their batches were committed"""
+        for part in self.frontier.parts():
+            yield from read_results(part, as_dict=as_dict)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a crawl across several processes")
+    commands = parser.add_subparsers(dest='command', required=True)
+    start = commands.add_parser('start', help='record a new crawl and queue its start URL')
+    start.add_argument('directory')
+    start.add_argument('base_url')
+    start.add_argument('--max-pages', type=int, default=100)
+    start.add_argument('--allowed-domain', action='append', dest='allowed_domains')
+    start.add_argument('--focus', default=None)
+    worker = commands.add_parser('worker', help='join a crawl with local worker processes')
+    worker.add_argument('directory')
+    worker.add_argument('--processes', type=int, default=1)
+    worker.add_argument('--delay', type=float, default=1.0)
+    worker.add_argument('--max-per-host', type=int, default=1)
+    worker.add_argument('--batch-size', type=int, default=50)
+    stats = commands.add_parser('stats', help='show the progress of a crawl')
+    stats.add_argument('directory')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    coordinator = CrawlCoordinator(args.directory)
+    if args.command == 'start':
+        coordinator.start(args.base_url, max_pages=args.max_pages,
+                          allowed_domains=args.allowed_domains, focus=args.focus)
+    elif args.command == 'worker':
+        coordinator.run(workers=args.processes, batch_size=args.batch_size,
+                        scraper_options={'delay': args.delay, 'max_per_host': args.max_per_host})
+    stats = coordinator.stats()
+    print(f"URLs: {stats['urls']}")
+    for name, info in stats['workers'].items():
+        print(f"  {name}: {info.get('state')}, {info.get('pages', 0)} pages, {info.get('failures', 0)} failures")
+
+if __name__ == '__main__':
+    main()
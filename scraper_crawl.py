@@ -0,0 +1,329 @@
+import os
+import glob
+import json
+import time
+import logging
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urldefrag
+
+from scraper_cache import _SQLiteStore
+from scraper_export import ResultWriter, read_results, result_files
+from scraper_focus import RelevanceScorer
+from scraper_tools import PriorityFrontier, ScrapedContent, WebScraper
+
+logger = logging.getLogger(__name__)
+
+# States of a URL in a CrawlStore
+URL_QUEUED = 0
+URL_DONE = 1
+URL_FAILED = 2
+URL_DUPLICATE = 3
+
+def signed64(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER range (and back with unsigned64)"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+class CrawlStore(_SQLiteStore):
+    """
+    Persistent state of one crawl: its frontier, visited URLs, near-duplicate fingerprints and settings
+
+    URLs are keyed like the crawl frontier (e.g. by canonical form). The
+    crawl applies its changes in batches through checkpoint(), each in a
+    single transaction, so the stored state is always that of one
+    consistent point of the crawl.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS urls (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            state INTEGER NOT NULL,
+            score REAL NOT NULL DEFAULT 0,
+            seq INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS urls_state_seq ON urls(state, seq);
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            fingerprint INTEGER PRIMARY KEY,
+            key TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(os.path.join(directory, "crawl.sqlite3"))
+
+    def meta(self) -> Dict[str, Any]:
+        return {name: json.loads(value) for name, value in self._connection().execute("SELECT name, value FROM meta")}
+
+    def checkpoint(self,
+                   discovered: List[tuple] = (),
+                   finished: List[tuple] = (),
+                   fingerprints: List[tuple] = (),
+                   meta: Dict[str, Any] = None):
+        """
+        Apply a batch of crawl progress atomically
+
+        discovered: (key, url, score, seq) of newly queued URLs
+        finished: (key, state) of URLs that left the frontier
+        fingerprints: (fingerprint, key) of pages kept by near-duplicate detection
+        meta: settings and counters to store alongside
+        """
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO urls (key, url, state, score, seq) VALUES (?, ?, {URL_QUEUED}, ?, ?)",
+                discovered
+            )
+            # Raised priorities of URLs that are still queued
+            conn.executemany(
+                f"UPDATE urls SET score = ? WHERE key = ? AND state = {URL_QUEUED} AND score < ?",
+                ((score, key, score) for key, _, score, _ in discovered)
+            )
+            conn.executemany("UPDATE urls SET state = ? WHERE key = ?", ((state, key) for key, state in finished))
+            conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (fingerprint, key) VALUES (?, ?)",
+                ((signed64(fingerprint), key) for fingerprint, key in fingerprints)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                ((name, json.dumps(value)) for name, value in (meta or {}).items())
+            )
+
+    def queued(self) -> Iterator[tuple]:
+        """(url, score) of queued URLs, in the order they were discovered"""
+        return self._connection().execute(
+            f"SELECT url, score FROM urls WHERE state = {URL_QUEUED} ORDER BY seq"
+        )
+
+    def visited_keys(self) -> Iterator[str]:
+        """Keys of every URL that has left the frontier"""
+        return (row[0] for row in self._connection().execute(
+            f"SELECT key FROM urls WHERE state != {URL_QUEUED}"
+        ))
+
+    def fingerprints(self) -> Iterator[tuple]:
+        return ((unsigned64(fingerprint), key) for fingerprint, key in self._connection().execute(
+            "SELECT fingerprint, key FROM fingerprints"
+        ))
+
+    def counts(self) -> Dict[str, int]:
+        names = {URL_QUEUED: 'queued', URL_DONE: 'done', URL_FAILED: 'failed', URL_DUPLICATE: 'duplicates'}
+        counts = dict.fromkeys(names.values(), 0)
+        for state, count in self._connection().execute("SELECT state, COUNT(*) FROM urls GROUP BY state"):
+            counts[names[state]] = count
+        return counts
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+class CrawlSession:
+    """
+    A long-running crawl that survives crashes and restarts
+
+    The frontier, visited URLs, near-duplicate fingerprints and the crawl's
+    settings live in ``directory/crawl.sqlite3``; results are appended to
+    rolling ``directory/results-*`` parts (see ResultWriter) as they arrive,
+    so memory does not grow with the number of pages.
+
+    Progress is checkpointed every checkpoint_pages pages or
+    checkpoint_seconds seconds, whichever comes first: the current results
+    part is published and the state changes since the last checkpoint are
+    committed in one transaction. After a crash, resume() continues from the
+    last checkpoint; pages fetched after it are fetched again, and result
+    parts published after it are discarded, so no result is written twice.
+
+        session = CrawlSession('crawls/n8n_docs')
+        session.run('https://docs.n8n.io', max_pages=10_000, focus='n8n automation')
+        # ... after a crash or restart:
+        CrawlSession('crawls/n8n_docs').run()
+    """
+
+    PREFIX = 'results'
+
+    def __init__(self,
+                 directory: str,
+                 scraper: WebScraper = None,
+                 checkpoint_pages: int = 100,
+                 checkpoint_seconds: float = 60.0,
+                 **writer_options):
+        self.directory = directory
+        self.scraper = scraper or WebScraper()
+        self.checkpoint_pages = checkpoint_pages
+        self.checkpoint_seconds = checkpoint_seconds
+        self.writer_options = writer_options
+        self.store = CrawlStore(directory)
+
+        self.resumed = False
+        self.scraped = 0
+        self._frontier = None
+        self._duplicates = None
+        self._writer: Optional[ResultWriter] = None
+        self._seq = 0
+        self._fingerprints_saved = 0
+        self._parts_before = 0
+        self._discovered: List[tuple] = []
+        self._finished: List[tuple] = []
+        self._pages_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    # Public API
+
+    @property
+    def options(self) -> Optional[Dict[str, Any]]:
+        """Settings of the stored crawl (base_url and iter_website options), or None if none was started"""
+        return self.store.meta().get('options')
+
+    def start(self, base_url: str, **options) -> Iterator[ScrapedContent]:
+        """
+        Begin a new crawl in this (empty) session directory, yielding results as they arrive
+
+        options are iter_website's, and must be JSON-serializable (a focus may
+        also be a RelevanceScorer); they are stored so resume() needs none.
+        """
+        if self.options is not None:
+            raise ValueError(f"{self.directory} already holds a crawl; use resume()")
+        options = dict(options, base_url=base_url)
+        if isinstance(options.get('focus'), RelevanceScorer):
+            options['focus'] = options['focus'].to_dict()
+        try:
+            json.dumps(options)
+        except TypeError as e:
+            raise ValueError(f"Crawl options must be JSON-serializable to be resumable: {e}") from e
+        self.store.checkpoint(meta={'options': options, 'status': 'running', 'started_at': time.time()})
+        return self._crawl(options)
+
+    def resume(self, **overrides) -> Iterator[ScrapedContent]:
+        """
+        Continue the stored crawl from its last checkpoint, yielding the remaining results
+
+        overrides replace stored options, e.g. a larger max_pages to extend a
+        finished crawl.
+        """
+        options = self.options
+        if options is None:
+            raise ValueError(f"No crawl to resume in {self.directory}")
+        if overrides:
+            options = dict(options, **overrides)
+            self.store.checkpoint(meta={'options': options})
+        return self._crawl(options)
+
+    def run(self, base_url: str = None, **options) -> Dict[str, Any]:
+        """Start (or, without base_url, resume) the crawl and run it to the end without holding results; returns stats()"""
+        results = self.start(base_url, **options) if base_url else self.resume(**options)
+        for _ in results:
+            pass
+        return self.stats()
+
+    def results(self, as_dict: bool = False) -> Iterator[ScrapedContent]:
+        """Stream every result written so far"""
+        return read_results(self.directory, prefix=self.PREFIX, as_dict=as_dict)
+
+    def stats(self) -> Dict[str, Any]:
+        meta = self.store.meta()
+        return dict(self.store.counts(), scraped=meta.get('scraped', 0), status=meta.get('status'),
+                    parts=meta.get('parts', 0))
+
+    # iter_website hooks
+
+    def restore(self, frontier, duplicates) -> int:
+        """Load the last checkpoint into a fresh frontier and near-duplicate index; returns pages scraped so far"""
+        self._frontier = frontier
+        self._duplicates = duplicates
+        meta = self.store.meta()
+        self.scraped = meta.get('scraped', 0)
+        self._seq = meta.get('seq', 0)
+        self._discard_uncommitted_parts(meta.get('parts', 0))
+        self._writer = ResultWriter(self.directory, prefix=self.PREFIX, **self.writer_options)
+
+        self.resumed = len(self.store) > 0
+        if not self.resumed:
+            return 0
+        for key in self.store.visited_keys():
+            frontier.mark_seen(key)
+        # Pushed directly, not through iter_website's push(): these are already stored
+        prioritized = isinstance(frontier, PriorityFrontier)
+        queued = 0
+        for url, score in self.store.queued():
+            if prioritized:
+                frontier.push(url, score)
+            else:
+                frontier.push(url)
+            queued += 1
+        if duplicates is not None:
+            for fingerprint, key in self.store.fingerprints():
+                duplicates.add(fingerprint, key)
+            self._fingerprints_saved = len(duplicates)
+        logger.info(f"♻️ Resuming crawl in {self.directory}: {self.scraped} pages done, {queued} queued")
+        return self.scraped
+
+    def discovered(self, url: str, score: float):
+        self._discovered.append((self._frontier.key(url), urldefrag(url)[0], score, self._seq))
+        self._seq += 1
+
+    def done(self, url: str, content: ScrapedContent, scraped: int):
+        self._writer.write(content)
+        self._finished.append((self._frontier.key(url), URL_DONE))
+        self.scraped = scraped
+        self._pages_since_checkpoint += 1
+        if (self._pages_since_checkpoint >= self.checkpoint_pages
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds):
+            self.checkpoint()
+
+    def failed(self, url: str):
+        self._finished.append((self._frontier.key(url), URL_FAILED))
+
+    def duplicate(self, url: str):
+        self._finished.append((self._frontier.key(url), URL_DUPLICATE))
+
+    def checkpoint(self, status: str = 'running'):
+        """Publish the results written so far and commit the crawl state with them"""
+        self._writer.close()
+        fingerprints = []
+        if self._duplicates is not None:
+            fingerprints = list(islice(self._duplicates.items(), self._fingerprints_saved, None))
+        self.store.checkpoint(
+            discovered=self._discovered,
+            finished=self._finished,
+            fingerprints=fingerprints,
+            meta={'scraped': self.scraped, 'seq': self._seq, 'parts': len(self._writer.paths) + self._parts_before,
+                  'status': status, 'checkpointed_at': time.time()}
+        )
+        self._fingerprints_saved += len(fingerprints)
+        self._discovered = []
+        self._finished = []
+        self._pages_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    def close(self, completed: bool):
+        """Final checkpoint when the crawl loop exits; a crawl stopped early stays resumable"""
+        if self._writer is None:
+            return
+        self.checkpoint('finished' if completed else 'running')
+        logger.info(f"💾 Crawl checkpointed in {self.directory}: {self.scraped} pages"
+                    + ('' if completed else ' (resumable)'))
+
+    # Helpers
+
+    def _crawl(self, options: Dict[str, Any]) -> Iterator[ScrapedContent]:
+        options = dict(options)
+        base_url = options.pop('base_url')
+        return self.scraper.iter_website(base_url, session=self, **options)
+
+    def _discard_uncommitted_parts(self, committed: int):
+        """Remove result parts published after the last checkpoint, and unfinished part files"""
+        for path in glob.glob(os.path.join(self.directory, f"{self.PREFIX}-*.tmp")):
+            os.remove(path)
+        parts = result_files(self.directory, prefix=self.PREFIX)
+        for path in parts[committed:]:
+            logger.info(f"Discarding results written after the last checkpoint: {path}")
+            os.remove(path)
+        self._parts_before = min(len(parts), committed)
@@ -0,0 +1,325 @@
+import re
+import math
+import hashlib
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = frozenset([
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src',
+])
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+PERCENT_ESCAPE_PATTERN = re.compile(r'%([0-9A-Fa-f]{2})')
+UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+WORD_PATTERN = re.compile(r'\w+')
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def _normalize_escapes(component: str) -> str:
+    """Decode escaped unreserved characters and upper-case the remaining escapes (RFC 3986 6.2.2)"""
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else '%' + match.group(1).upper()
+    return PERCENT_ESCAPE_PATTERN.sub(fix, component)
+
+def canonicalize_url(url: str, strip_trailing_slash: bool = True) -> str:
+    """
+    Canonical form of a URL, for deciding whether two URLs name the same page
+
+    Lower-cases scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, gclid, fbclid, ...), sorts the remaining query
+    parameters, normalizes percent-escapes and, unless strip_trailing_slash
+    is False, treats "/docs/" and "/docs" as the same path. The result is a
+    dedup key; it is not guaranteed to be fetchable.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{userinfo}@{netloc}"
+
+    path = _normalize_escapes(parts.path) or '/'
+    if strip_trailing_slash and len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+              if not is_tracking_param(key)]
+    query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def _feature_hash(feature: str) -> int:
+    # Stable across processes, unlike hash(), so fingerprints can be stored
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+# Bit positions set in each byte value, for counting set bits a byte at a time
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+def simhash(text: str, shingle_size: int = 3) -> Tuple[int, int]:
+    """
+    64-bit SimHash of a text over overlapping word shingles
+
+    Returns (fingerprint, shingle_count). Texts that share most of their
+    shingles get fingerprints a few bits apart, so near-duplicates are found
+    by Hamming distance.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    # A bit is set in the fingerprint when it is set in more than half of the
+    # shingle hashes. Count set bits per byte position: Counter tallies the
+    # byte values in C, leaving at most 256 values x 8 bits per position.
+    unique = set(shingles)
+    hashes = b''.join(_feature_hash(shingle).to_bytes(8, 'little') for shingle in unique)
+    ones = [0] * 64
+    for position in range(8):
+        offset = position * 8
+        for value, count in Counter(hashes[position::8]).items():
+            for bit in BYTE_BITS[value]:
+                ones[offset + bit] += count
+
+    fingerprint = 0
+    for bit, count in enumerate(ones):
+        if 2 * count > len(unique):
+            fingerprint |= 1 << bit
+    return fingerprint, len(shingles)
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+class NearDuplicateIndex:
+    """
+    Finds previously seen texts within max_distance bits of a new text's SimHash
+
+    Fingerprints are split into max_distance + 1 bands; by the pigeonhole
+    principle two fingerprints within max_distance bits agree exactly on at
+    least one band, so a lookup only compares against fingerprints sharing a
+    band instead of scanning everything. Texts with fewer than min_shingles
+    shingles are too short to judge and are never reported as duplicates.
+    Not thread-safe; scrape_website uses it from its coordinating thread.
+    """
+
+    def __init__(self, max_distance: int = 3, min_shingles: int = 20):
+        self.max_distance = max_distance
+        self.min_shingles = min_shingles
+        bands = max_distance + 1
+        width = 64 // bands
+        self._bands = [(i * width, 64 if i == bands - 1 else (i + 1) * width) for i in range(bands)]
+        self._tables: List[Dict[int, List[int]]] = [defaultdict(list) for _ in self._bands]
+        self._keys: Dict[int, str] = {}
+
+    def _band_values(self, fingerprint: int) -> Iterable[int]:
+        for start, end in self._bands:
+            yield fingerprint >> start & ((1 << (end - start)) - 1)
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Key of a stored fingerprint within max_distance bits, or None"""
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            for candidate in table.get(value, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return self._keys[candidate]
+        return None
+
+    def add(self, fingerprint: int, key: str):
+        if fingerprint in self._keys:
+            return
+        self._keys[fingerprint] = key
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            table[value].append(fingerprint)
+
+    def fingerprint(self, text: str) -> Optional[int]:
+        """SimHash of text, or None if it is too short to judge; thread-safe, so crawl workers can compute it"""
+        fingerprint, shingles = simhash(text)
+        return fingerprint if shingles >= self.min_shingles else None
+
+    def check_fingerprint(self, fingerprint: Optional[int], key: str) -> Optional[str]:
+        """Return the key of an earlier near-duplicate, or remember fingerprint under key (None is never a duplicate)"""
+        if fingerprint is None:
+            return None
+        duplicate_of = self.find(fingerprint)
+        if duplicate_of is None:
+            self.add(fingerprint, key)
+        return duplicate_of
+
+    def check(self, text: str, key: str) -> Optional[str]:
+        """
+        Return the key of an earlier near-duplicate of text, or remember text under key
+
+        Returns None when the text is new (or too short to compare).
+        """
+        return self.check_fingerprint(self.fingerprint(text), key)
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        """(fingerprint, key) pairs in the order they were added"""
+        return iter(self._keys.items())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+def url_fingerprint(key: str) -> int:
+    """Stable 64-bit hash of a URL key (never 0, which FingerprintSet uses for empty slots)"""
+    return _feature_hash(key) or 1
+
+class FingerprintSet:
+    """
+    Compact set of strings, stored as their 64-bit hashes in a flat open-addressing table
+
+    Each entry costs 8 / load bytes. The table doubles when the load reaches
+    max_load, so at the default it sits between 0.35 and 0.7: 11 to 23 bytes
+    per entry, about 17 on average in benchmarks/bench_visited.py, instead of
+    the string itself plus a set slot, some 135 bytes for a typical
+    canonical URL. Two different keys with the same 64-bit hash are
+    taken for one another, which for n keys happens with probability about
+    n / 2**64 per lookup: negligible even for billions of URLs. Keys cannot
+    be listed back. Grows by doubling; not thread-safe.
+    """
+
+    def __init__(self, capacity: int = 1024, max_load: float = 0.7):
+        self.max_load = max_load
+        self._count = 0
+        self._allocate(int(capacity / max_load))
+
+    def _allocate(self, slots: int):
+        size = 1 << max(4, (slots - 1).bit_length())
+        self._table = array('Q', [0]) * size
+        self._mask = size - 1
+        self._limit = int(size * self.max_load)
+
+    def _insert(self, fingerprint: int) -> bool:
+        table, mask = self._table, self._mask
+        slot = fingerprint & mask
+        while True:
+            current = table[slot]
+            if current == fingerprint:
+                return False
+            if not current:
+                table[slot] = fingerprint
+                self._count += 1
+                return True
+            slot = (slot + 1) & mask
+
+    def add(self, key: str) -> bool:
+        """Add a key; returns True if it was not in the set"""
+        if self._count >= self._limit:
+            old = self._table
+            self._count = 0
+            self._allocate(len(old) * 2)
+            for fingerprint in old:
+                if fingerprint:
+                    self._insert(fingerprint)
+        return self._insert(url_fingerprint(key))
+
+    def __contains__(self, key: str) -> bool:
+        fingerprint = url_fingerprint(key)
+        table, mask = self._table, self._mask
+        slot = fingerprint & mask
+        while True:
+            current = table[slot]
+            if current == fingerprint:
+                return True
+            if not current:
+                return False
+            slot = (slot + 1) & mask
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.itemsize * len(self._table)
+
+    def __len__(self) -> int:
+        return self._count
+
+class BloomFilter:
+    """
+    Scalable Bloom filter of strings with a bounded false-positive rate
+
+    A false positive reports a key as present when it was never added; in a
+    crawl that URL is skipped as already visited. There are no false
+    negatives. The filter starts sized for capacity keys; when full, a new
+    layer twice as large with half the error rate is chained on, so the
+    overall rate stays below error_rate however many keys are added (Almeida
+    et al., 2007). The first layer gets error_rate / 2, so a filter that
+    never grows costs 1.44 * log2(2 / error_rate) bits per key: 1.4 bytes at
+    1% and 2.0 bytes at 0.1%, as benchmarks/bench_visited.py measures. Added
+    layers cost more: one started at 1/16 of its final size measures 4.9
+    bytes at 0.1%. Keys cannot be listed back; not thread-safe.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._count = 0
+        # Per layer: [bits, bit count, hash count, capacity, keys added]
+        self._layers: List[list] = []
+        self._add_layer(max(1, capacity), error_rate / 2)
+
+    def _add_layer(self, capacity: int, error_rate: float):
+        size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        self._layers.append([bytearray((size + 7) // 8), size, hashes, capacity, 0])
+
+    @staticmethod
+    def _hashes(key: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        # Double hashing: position i is h1 + i * h2 (Kirsch and Mitzenmacher, 2006)
+        return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+    @staticmethod
+    def _layer_contains(layer: list, h1: int, h2: int) -> bool:
+        bits, size, hashes = layer[0], layer[1], layer[2]
+        for i in range(hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, key: str) -> bool:
+        """Add a key; returns True if it was not (as far as the filter can tell) present"""
+        h1, h2 = self._hashes(key)
+        for layer in self._layers:
+            if self._layer_contains(layer, h1, h2):
+                return False
+        layer = self._layers[-1]
+        if layer[4] >= layer[3]:
+            self._add_layer(layer[3] * 2, self.error_rate / 2 ** (len(self._layers) + 1))
+            layer = self._layers[-1]
+        bits, size = layer[0], layer[1]
+        for i in range(layer[2]):
+            position = (h1 + i * h2) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        layer[4] += 1
+        self._count += 1
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = self._hashes(key)
+        return any(self._layer_contains(layer, h1, h2) for layer in self._layers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(layer[0]) for layer in self._layers)
+
+    def __len__(self) -> int:
+        return self._count
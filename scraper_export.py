@@ -0,0 +1,225 @@
+import os
+import io
+import json
+import glob
+import gzip
+import logging
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from scraper_records import decode_record, encode_record
+from scraper_tools import ScrapedContent
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to gzip
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the json module
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+FIELD_NAMES = tuple(f.name for f in fields(ScrapedContent))
+EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz', None: ''}
+FORMATS = {'jsonl': '.jsonl', 'binary': '.screc'}
+
+def _record(content: ScrapedContent) -> Dict[str, Any]:
+    # A shallow view of the fields: serialization never mutates them, so asdict's deep copy is wasted
+    return {name: getattr(content, name) for name in FIELD_NAMES}
+
+def dumps_line(content: ScrapedContent) -> bytes:
+    """One compact JSON line for a result"""
+    if orjson is not None:
+        return orjson.dumps(_record(content)) + b'\n'
+    return json.dumps(_record(content), ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+def loads_line(line: bytes) -> Dict[str, Any]:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+def dumps_frame(content: Any) -> bytes:
+    """A length-prefixed binary record (see scraper_records.encode_record)"""
+    data = encode_record(_record(content))
+    return len(data).to_bytes(4, 'little') + data
+
+def _read_frames(f) -> Iterator[Dict[str, Any]]:
+    while True:
+        header = f.read(4)
+        if not header:
+            return
+        size = int.from_bytes(header, 'little')
+        data = f.read(size)
+        if len(header) < 4 or len(data) < size:
+            raise ValueError(f"Truncated record in {getattr(f, 'name', 'stream')}")
+        yield decode_record(data)
+
+class ResultWriter:
+    """
+    Appends scraped results to rolling, compressed JSONL (or binary record) files
+
+    Records are buffered and written in blocks of about buffer_bytes. A new
+    part (``prefix-00000.jsonl.zst``, ``prefix-00001...``) is started after
+    max_records records or max_bytes uncompressed bytes. Parts are written
+    under a temporary name and renamed when complete, so readers only ever
+    see whole files. Compression is zstd when ``zstandard`` is installed,
+    else gzip; pass compression=None for uncompressed parts. format='binary'
+    writes length-prefixed encode_record frames (``.screc``) instead of JSON
+    lines, which are smaller and faster to read back.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 prefix: str = 'results',
+                 format: str = 'jsonl',
+                 compression: Optional[str] = 'auto',
+                 max_records: int = 50_000,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 buffer_bytes: int = 1024 * 1024):
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression {compression!r}, expected 'zstd', 'gzip' or None")
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression requires zstandard")
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}, expected one of {tuple(FORMATS)}")
+
+        self.directory = directory
+        self.prefix = prefix
+        self.format = format
+        self.compression = compression
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.buffer_bytes = buffer_bytes
+        self.paths: List[str] = []  # completed parts
+        self.records = 0
+
+        self._part = self._next_part_number()
+        self._file = None
+        self._raw = None
+        self._tmp_path = None
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._part_records = 0
+        self._part_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, content: ScrapedContent):
+        line = dumps_frame(content) if self.format == 'binary' else dumps_line(content)
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self._part_records += 1
+        self._part_bytes += len(line)
+        self.records += 1
+        if self._buffered >= self.buffer_bytes:
+            self._flush_buffer()
+        if self._part_records >= self.max_records or self._part_bytes >= self.max_bytes:
+            self._finish_part()
+
+    def write_all(self, contents: Iterable[ScrapedContent]) -> int:
+        """Write every result from an iterable (e.g. iter_website); returns how many were written"""
+        count = 0
+        for content in contents:
+            self.write(content)
+            count += 1
+        return count
+
+    def close(self):
+        """Flush and publish the current part"""
+        if self._part_records:
+            self._finish_part()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _next_part_number(self) -> int:
+        # Continue after existing parts, so a directory can be appended to across runs
+        existing = glob.glob(os.path.join(self.directory, f"{glob.escape(self.prefix)}-*"))
+        numbers = []
+        for path in existing:
+            stem = os.path.basename(path)[len(self.prefix) + 1:].split('.', 1)[0]
+            if stem.isdigit():
+                numbers.append(int(stem))
+        return max(numbers) + 1 if numbers else 0
+
+    def _final_path(self) -> str:
+        extension = FORMATS[self.format] + EXTENSIONS[self.compression]
+        return os.path.join(self.directory, f"{self.prefix}-{self._part:05d}{extension}")
+
+    def _open(self):
+        self._tmp_path = self._final_path() + '.tmp'
+        self._raw = open(self._tmp_path, 'wb')
+        if self.compression == 'zstd':
+            self._file = zstandard.ZstdCompressor(level=3).stream_writer(self._raw)
+        elif self.compression == 'gzip':
+            self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=5)
+        else:
+            self._file = self._raw
+
+    def _flush_buffer(self):
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+        self._file.write(b''.join(self._buffer))
+        self._buffer.clear()
+        self._buffered = 0
+
+    def _finish_part(self):
+        self._flush_buffer()
+        self._file.close()
+        self._raw.close()  # GzipFile leaves a passed-in file open
+        final_path = self._final_path()
+        os.replace(self._tmp_path, final_path)
+        self.paths.append(final_path)
+        logger.info(f"💾 Wrote {self._part_records} results to: {final_path}")
+        self._file = None
+        self._part += 1
+        self._part_records = 0
+        self._part_bytes = 0
+
+def _open_part(path: str):
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst files")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+RESULT_EXTENSIONS = tuple(fmt + ext for fmt in FORMATS.values() for ext in EXTENSIONS.values())
+
+def result_files(path: str, prefix: str = None) -> List[str]:
+    """The JSONL parts in a directory (in write order), or [path] for a single file"""
+    if os.path.isfile(path):
+        return [path]
+    pattern = f"{glob.escape(prefix)}-*" if prefix else '*'
+    return sorted(p for p in glob.glob(os.path.join(path, pattern))
+                  if p.endswith(RESULT_EXTENSIONS))
+
+def read_results(path: str, prefix: str = None, as_dict: bool = False) -> Iterator[Union[ScrapedContent, Dict[str, Any]]]:
+    """
+    Stream results back from a ResultWriter directory or a single part file
+
+    JSONL and binary parts are both read. One record is decoded at a time, so memory stays flat however large the
+    corpus. With as_dict, records are yielded as plain dicts.
+    """
+    for part in result_files(path, prefix):
+        with _open_part(part) as f:
+            if part.endswith(tuple(FORMATS['binary'] + ext for ext in EXTENSIONS.values())):
+                records = _read_frames(f)
+            else:
+                records = (loads_line(line) for line in f if line.strip())
+            for record in records:
+                yield record if as_dict else ScrapedContent(**record)
+
+def export_results(contents: Iterable[ScrapedContent], directory: str, **kwargs) -> List[str]:
+    """Write results to rolling compressed parts in directory; returns the part paths"""
+    with ResultWriter(directory, **kwargs) as writer:
+        writer.write_all(contents)
+    return writer.paths
@@ -0,0 +1,265 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import feedparser
+
+from scraper_cache import _SQLiteStore
+from scraper_tools import WebScraper, feed_items
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FeedState:
+    """Polling state of a feed: its validators, last body hash and schedule"""
+    url: str
+    interval: float
+    etag: str = ''
+    last_modified: str = ''
+    content_hash: str = ''
+    last_polled: float = 0.0
+    next_poll: float = 0.0
+
+class FeedStore(_SQLiteStore):
+    """
+    Persistent feed subscriptions and an index of entries already seen
+
+    Entries are keyed per feed by their GUID (or link), so a poller can
+    return only entries it has not reported before, across restarts.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS feeds (
+            url TEXT PRIMARY KEY,
+            interval REAL NOT NULL,
+            etag TEXT NOT NULL DEFAULT '',
+            last_modified TEXT NOT NULL DEFAULT '',
+            content_hash TEXT NOT NULL DEFAULT '',
+            last_polled REAL NOT NULL DEFAULT 0,
+            next_poll REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS feeds_next_poll ON feeds(next_poll);
+        CREATE TABLE IF NOT EXISTS seen_entries (
+            feed_url TEXT NOT NULL,
+            entry_id TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            PRIMARY KEY (feed_url, entry_id)
+        );
+        CREATE INDEX IF NOT EXISTS seen_entries_first_seen ON seen_entries(first_seen);
+    """
+
+    COLUMNS = "url, interval, etag, last_modified, content_hash, last_polled, next_poll"
+
+    def __init__(self, cache_dir: str = "scraper_cache"):
+        os.makedirs(cache_dir, exist_ok=True)
+        super().__init__(os.path.join(cache_dir, "feeds.sqlite3"))
+
+    def add(self, url: str, interval: float):
+        """Subscribe to url, or change its polling interval if already subscribed"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO feeds (url, interval) VALUES (?, ?)
+                   ON CONFLICT(url) DO UPDATE SET interval = excluded.interval""",
+                (url, interval)
+            )
+
+    def remove(self, url: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM feeds WHERE url = ?", (url,))
+            conn.execute("DELETE FROM seen_entries WHERE feed_url = ?", (url,))
+
+    def get(self, url: str) -> Optional[FeedState]:
+        row = self._connection().execute(
+            f"SELECT {self.COLUMNS} FROM feeds WHERE url = ?", (url,)
+        ).fetchone()
+        return FeedState(*row) if row else None
+
+    def feeds(self) -> List[FeedState]:
+        return [FeedState(*row) for row in self._connection().execute(
+            f"SELECT {self.COLUMNS} FROM feeds ORDER BY next_poll"
+        )]
+
+    def due(self, now: float = None) -> List[FeedState]:
+        """Feeds whose next poll is due, most overdue first"""
+        now = time.time() if now is None else now
+        return [FeedState(*row) for row in self._connection().execute(
+            f"SELECT {self.COLUMNS} FROM feeds WHERE next_poll <= ? ORDER BY next_poll", (now,)
+        )]
+
+    def update(self, state: FeedState):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """UPDATE feeds SET etag = ?, last_modified = ?, content_hash = ?,
+                       last_polled = ?, next_poll = ? WHERE url = ?""",
+                (state.etag, state.last_modified, state.content_hash,
+                 state.last_polled, state.next_poll, state.url)
+            )
+
+    def mark_seen(self, feed_url: str, entry_ids: List[str]) -> List[str]:
+        """Record entry_ids as seen; returns those that were not seen before, in order"""
+        now = time.time()
+        new_ids = []
+        conn = self._connection()
+        with conn:
+            for entry_id in entry_ids:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO seen_entries (feed_url, entry_id, first_seen) VALUES (?, ?, ?)",
+                    (feed_url, entry_id, now)
+                )
+                if cursor.rowcount:
+                    new_ids.append(entry_id)
+        return new_ids
+
+    def prune_seen(self, older_than: float) -> int:
+        """
+        Forget entries first seen more than older_than seconds ago; returns the number removed
+
+        older_than must exceed how long feeds keep entries listed, or pruned
+        entries still in a feed are reported as new again.
+        """
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM seen_entries WHERE first_seen < ?", (time.time() - older_than,)
+            )
+        return cursor.rowcount
+
+def entry_id(item: Dict[str, str]) -> str:
+    """Stable identity of a feed item: its GUID or link, else a hash of its content"""
+    if item.get('guid'):
+        return item['guid']
+    fingerprint = '\x1f'.join(item.get(key, '') for key in ('title', 'pubDate', 'description'))
+    return 'sha1:' + hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+class FeedPoller:
+    """
+    Polls many RSS/Atom feeds concurrently and reports only entries not seen before
+
+    Subscriptions, validators and the seen-entry index live in
+    ``cache_dir/feeds.sqlite3`` (see FeedStore), so a restarted poller picks
+    up where it left off. Each poll is a conditional GET; a 304, or a body
+    identical to the last one, is not parsed at all. Each feed is polled on
+    its own interval. Requests go through the scraper, so per-host delays,
+    retries and circuit breaking apply.
+    """
+
+    def __init__(self,
+                 scraper: WebScraper = None,
+                 cache_dir: str = "scraper_cache",
+                 default_interval: float = 15 * 60,
+                 max_workers: int = 8):
+        self.scraper = scraper or WebScraper(cache_dir=cache_dir, max_workers=max_workers)
+        self.store = FeedStore(cache_dir)
+        self.default_interval = default_interval
+        self.max_workers = max_workers
+
+    def add_feed(self, url: str, interval: float = None):
+        """Subscribe to a feed, polled every interval seconds (default_interval if None)"""
+        self.store.add(url, interval or self.default_interval)
+
+    def add_feeds(self, urls: Iterable[str], interval: float = None):
+        for url in urls:
+            self.add_feed(url, interval)
+
+    def remove_feed(self, url: str):
+        self.store.remove(url)
+
+    def poll(self, urls: List[str] = None, force: bool = False) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Poll feeds concurrently and return their new items
+
+        Args:
+            urls: Feeds to poll (subscribed on the fly); defaults to every subscribed feed
+            force: Poll even feeds whose interval has not elapsed
+
+        Returns:
+            {feed_url: [new items, oldest first]} for feeds with new items
+        """
+        if urls is not None:
+            for url in urls:
+                if self.store.get(url) is None:
+                    self.add_feed(url)
+            states = [self.store.get(url) for url in urls]
+            if not force:
+                now = time.time()
+                states = [state for state in states if state.next_poll <= now]
+        else:
+            states = self.store.feeds() if force else self.store.due()
+
+        if not states:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(states))) as executor:
+            results = list(executor.map(self._poll_safely, states))
+
+        return {state.url: items for state, items in zip(states, results) if items}
+
+    def poll_feed(self, url: str) -> List[Dict[str, str]]:
+        """Poll one feed now, subscribing to it if needed; returns its new items"""
+        state = self.store.get(url)
+        if state is None:
+            self.add_feed(url)
+            state = self.store.get(url)
+        return self._poll(state)
+
+    def run(self,
+            on_items: Callable[[str, List[Dict[str, str]]], None],
+            stop: threading.Event = None,
+            idle_sleep: float = 60.0):
+        """Poll due feeds until stop is set, calling on_items(feed_url, items) for new items"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for url, items in self.poll().items():
+                try:
+                    on_items(url, items)
+                except Exception as e:
+                    logger.error(f"Feed callback failed for {url}: {str(e)}")
+            feeds = self.store.feeds()
+            next_poll = min((state.next_poll for state in feeds), default=time.time() + idle_sleep)
+            stop.wait(max(1.0, min(idle_sleep, next_poll - time.time())))
+
+    def _poll_safely(self, state: FeedState) -> List[Dict[str, str]]:
+        try:
+            return self._poll(state)
+        except Exception as e:
+            logger.error(f"❌ Failed to poll feed {state.url}: {str(e)}")
+            state.last_polled = time.time()
+            state.next_poll = state.last_polled + state.interval
+            self.store.update(state)
+            return []
+
+    def _poll(self, state: FeedState) -> List[Dict[str, str]]:
+        validators = {'etag': state.etag, 'last_modified': state.last_modified}
+        response = self.scraper.fetch(state.url, validators=validators)
+
+        state.last_polled = time.time()
+        new_items = []
+
+        if response.status_code == 304:
+            logger.info(f"📡 Feed not modified: {state.url}")
+        else:
+            state.etag = response.headers.get('ETag', '')
+            state.last_modified = response.headers.get('Last-Modified', '')
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if content_hash == state.content_hash:
+                logger.info(f"📡 Feed unchanged: {state.url}")
+            else:
+                state.content_hash = content_hash
+                feed = feedparser.parse(response.content)
+                items = {entry_id(item): item for item in feed_items(feed)}
+                new_ids = self.store.mark_seen(state.url, list(items))
+                # Feeds list newest first; report oldest first
+                new_items = [items[i] for i in reversed(new_ids)]
+                logger.info(f"📡 {len(new_items)} new items in {state.url}")
+
+        state.next_poll = state.last_polled + state.interval
+        self.store.update(state)
+        return new_items
@@ -0,0 +1,117 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Words that carry no topic, in keyword sets such as skill names ("Web Design & Development")
+STOPWORDS = frozenset('a an and are as at be by for from how in into is it of on or the to with your'.split())
+
+# Links that rarely lead to content: taxonomy listings, accounts, legal, sharing and feeds
+LOW_VALUE_PATTERN = re.compile(
+    r'/(tags?|categor(y|ies)|authors?|archives?|page/\d+|login|log-in|signin|sign-in|signup|sign-up|register|'
+    r'account|cart|checkout|privacy|terms|legal|cookies?|imprint|disclaimer|contact|share|print|feed|rss|'
+    r'wp-admin|wp-login)(/|$|\.|\?)'
+    r'|[?&](replytocom|share|print|sort|order|filter|page)=',
+    re.IGNORECASE
+)
+LOW_VALUE_ANCHORS = frozenset([
+    'privacy', 'privacy policy', 'terms', 'terms of service', 'terms of use', 'cookie policy', 'cookies',
+    'contact', 'contact us', 'about us', 'login', 'log in', 'sign in', 'sign up', 'register', 'share',
+    'tweet', 'print', 'next', 'previous', 'older posts', 'newer posts', 'read more', 'more', 'home',
+])
+
+def stem(word: str) -> str:
+    """Crude prefix stem, so 'automation', 'automating' and 'automated' match"""
+    return word[:6] if len(word) > 6 else word
+
+def tokens(text: str) -> Set[str]:
+    """Stemmed topic words of a text (lower-cased alphanumeric runs, minus stopwords)"""
+    return {stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS}
+
+def url_tokens(url: str) -> Set[str]:
+    """Stemmed words of a URL's path and query ('/guides/n8n-webhooks?topic=nodes')"""
+    parts = urlsplit(url)
+    return tokens(unquote(f"{parts.path} {parts.query}"))
+
+class RelevanceScorer:
+    """
+    Scores pages and not-yet-fetched links against a topic, for focused crawls
+
+    The topic is a set of keywords (e.g. a skill name). A page's relevance is
+    the share of topic words in its text and title. A link's score, in [0, 1],
+    combines the share of topic words in its anchor text, in its URL, and
+    the relevance of the page it was found on. Links to taxonomy, account,
+    legal and sharing pages are penalized. Scores only order the crawl; they
+    are not probabilities.
+    """
+
+    def __init__(self,
+                 keywords: Union[str, Iterable[str]],
+                 anchor_weight: float = 0.45,
+                 url_weight: float = 0.25,
+                 parent_weight: float = 0.3,
+                 low_value_penalty: float = 0.7):
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        self.keywords = tokens(' '.join(keywords))
+        if not self.keywords:
+            raise ValueError("A focused crawl needs at least one topic keyword")
+        self.anchor_weight = anchor_weight
+        self.url_weight = url_weight
+        self.parent_weight = parent_weight
+        self.low_value_penalty = low_value_penalty
+
+    @classmethod
+    def from_focus(cls, focus: Union[str, Iterable[str], Dict[str, Any], 'RelevanceScorer']) -> 'RelevanceScorer':
+        """A scorer for a crawl's focus option: keywords, a scorer, or a scorer's to_dict()"""
+        if isinstance(focus, cls):
+            return focus
+        if isinstance(focus, dict):
+            return cls(**focus)
+        return cls(focus)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable settings, for storing a crawl's focus (see from_focus)"""
+        return dict(vars(self), keywords=sorted(self.keywords))
+
+    def score_page(self,
+                   title: str,
+                   text: str,
+                   metadata: Dict[str, Any],
+                   links: Iterable[str] = (),
+                   min_link_score: float = None) -> Tuple[Dict[str, Any], List[Tuple[str, float]]]:
+        """
+        Score a fetched page and the links to follow from it
+
+        Returns a copy of metadata with the page's 'relevance' and without
+        the 'link_text' anchors, which only steer the crawl, plus (link,
+        score) for each of links scoring at least min_link_score.
+        """
+        metadata = dict(metadata)
+        link_text = metadata.pop('link_text', None) or {}
+        relevance = self.page_score(title, text)
+        metadata['relevance'] = round(relevance, 4)
+        scored = []
+        for link in links:
+            score = self.link_score(link, link_text.get(link), relevance)
+            if min_link_score is None or score >= min_link_score:
+                scored.append((link, score))
+        return metadata, scored
+
+    def coverage(self, words: Set[str]) -> float:
+        """Share of topic keywords among words"""
+        return len(self.keywords & words) / len(self.keywords)
+
+    def page_score(self, title: str, text: str) -> float:
+        """Relevance of a fetched page: mostly its text, with its title weighing in"""
+        return 0.7 * self.coverage(tokens(text)) + 0.3 * self.coverage(tokens(title))
+
+    def link_score(self, url: str, anchor_text: Optional[str] = None, parent_score: float = 0.0) -> float:
+        """Priority of a link before fetching it"""
+        score = (self.anchor_weight * (self.coverage(tokens(anchor_text)) if anchor_text else 0.0)
+                 + self.url_weight * self.coverage(url_tokens(url))
+                 + self.parent_weight * parent_score)
+        if LOW_VALUE_PATTERN.search(url) or (anchor_text and anchor_text.strip().lower() in LOW_VALUE_ANCHORS):
+            score *= 1.0 - self.low_value_penalty
+        return score
@@ -0,0 +1,347 @@
+import bisect
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Where a request's time goes, in order:
+#   wait     - politeness: waiting for the host's rate limiter slot
+#   connect  - TCP connect and TLS handshake (only for new connections)
+#   ttfb     - request sent until response headers arrive
+#   download - reading the body (includes incremental parsing with lxml-native)
+#   parse    - building the document tree; lxml-native and process-pool
+#              parsing extract in the same pass, so their time is all here
+#   extract  - walking the tree for title, text, metadata, links and images
+PHASES = ('wait', 'connect', 'ttfb', 'download', 'parse', 'extract')
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Hosts beyond max_hosts are aggregated under this name, so wide crawls cannot grow memory without bound
+OTHER_HOSTS = '(other)'
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within a bucket"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram'):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p90': round(self.quantile(0.9), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'max': round(self.max, 6),
+        }
+
+class HostStats:
+    """Phase histograms and event counters for one host"""
+
+    __slots__ = ('phases', 'counters')
+
+    def __init__(self):
+        self.phases: Dict[str, Histogram] = {}
+        self.counters: Counter = Counter()
+
+class ScraperMetrics:
+    """
+    Thread-safe per-host instrumentation for WebScraper
+
+    Phase timings (see PHASES) go into per-host histograms. Counters track
+    requests, new connections, status codes, bytes (body and on the wire),
+    retries, failures and cache hits, misses and revalidations. Read them
+    with snapshot() or to_prometheus().
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, max_hosts: int = 1000):
+        self.buckets = tuple(buckets)
+        self.max_hosts = max_hosts
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostStats] = {}
+
+    def _host(self, host: str) -> HostStats:
+        stats = self._hosts.get(host)
+        if stats is None:
+            if len(self._hosts) >= self.max_hosts and host != OTHER_HOSTS:
+                return self._host(OTHER_HOSTS)
+            stats = self._hosts[host] = HostStats()
+        return stats
+
+    def observe(self, host: str, phase: str, seconds: float):
+        """Record seconds spent in a phase for a request to host"""
+        with self._lock:
+            stats = self._host(host)
+            histogram = stats.phases.get(phase)
+            if histogram is None:
+                histogram = stats.phases[phase] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, host: str, event: str, value: int = 1):
+        """Add value to an event counter ('requests', 'retries', 'bytes', 'cache_hits', ...)"""
+        with self._lock:
+            self._host(host).counters[event] += value
+
+    @contextmanager
+    def time(self, host: str, phase: str) -> Iterator[None]:
+        """Time the body of a with-block as phase; the time is recorded even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(host, phase, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+            self.started = time.time()
+
+    def export_state(self) -> Dict[str, Any]:
+        """Raw bucket counts and counters, JSON-serializable, for merge_state() in another process"""
+        with self._lock:
+            return self._state()
+
+    def take_state(self) -> Dict[str, Any]:
+        """export_state() and clear, in one step, so repeated pushes never count an observation twice"""
+        with self._lock:
+            state = self._state()
+            self._hosts.clear()
+            return state
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            'buckets': list(self.buckets),
+            'hosts': {
+                host: {
+                    'phases': {phase: [h.counts, h.count, h.sum, h.max] for phase, h in stats.phases.items()},
+                    'counters': dict(stats.counters),
+                }
+                for host, stats in self._hosts.items()
+            },
+        }
+
+    def merge_state(self, state: Dict[str, Any]):
+        """
+        Add another instance's export_state() into this one (e.g. from crawl
+        worker processes); malformed state raises ValueError and merges nothing
+        """
+        try:
+            if tuple(state['buckets']) != self.buckets:
+                raise ValueError("Cannot merge metrics with different histogram buckets")
+            parsed = []
+            for host, data in state['hosts'].items():
+                counters = {str(event): int(value) for event, value in data['counters'].items()}
+                phases = {}
+                for phase, (counts, count, total, maximum) in data['phases'].items():
+                    other = Histogram(self.buckets)
+                    other.counts = [int(n) for n in counts]
+                    other.count, other.sum, other.max = int(count), float(total), float(maximum)
+                    if len(other.counts) != len(self.buckets) + 1:
+                        raise ValueError(f"Histogram for {host} {phase} has {len(other.counts)} buckets")
+                    phases[str(phase)] = other
+                parsed.append((str(host), counters, phases))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Malformed metrics state: {e!r}") from e
+
+        with self._lock:
+            for host, counters, phases in parsed:
+                stats = self._host(host)
+                stats.counters.update(counters)
+                for phase, other in phases.items():
+                    histogram = stats.phases.get(phase)
+                    if histogram is None:
+                        histogram = stats.phases[phase] = Histogram(self.buckets)
+                    histogram.merge(other)
+
+    def hosts(self) -> List[str]:
+        with self._lock:
+            return sorted(self._hosts)
+
+    def phase(self, phase: str, host: str = None) -> Histogram:
+        """A copy of one phase's histogram for host, or merged over all hosts"""
+        merged = Histogram(self.buckets)
+        with self._lock:
+            for name, stats in self._hosts.items():
+                if (host is None or name == host) and phase in stats.phases:
+                    merged.merge(stats.phases[phase])
+        return merged
+
+    def slowest_hosts(self, phase: str = 'ttfb', quantile: float = 0.5, limit: int = 10) -> List[Tuple[str, float]]:
+        """Hosts ranked by a quantile of one phase, slowest first"""
+        with self._lock:
+            ranked = [(host, stats.phases[phase].quantile(quantile))
+                      for host, stats in self._hosts.items() if phase in stats.phases]
+        ranked.sort(key=lambda pair: pair[1], reverse=True)
+        return ranked[:limit]
+
+    def snapshot(self, host: str = None) -> Dict[str, Any]:
+        """
+        JSON-serializable view: totals over all hosts plus per-host phase
+        summaries (count, sum, mean, p50, p90, p99, max) and counters
+        """
+        hosts = {}
+        totals: Counter = Counter()
+        phases: Dict[str, Histogram] = {}
+        with self._lock:
+            for name, stats in self._hosts.items():
+                totals.update(stats.counters)
+                for phase, histogram in stats.phases.items():
+                    phases.setdefault(phase, Histogram(self.buckets)).merge(histogram)
+                if host is None or name == host:
+                    hosts[name] = {
+                        'phases': {phase: h.summary() for phase, h in stats.phases.items()},
+                        'counters': dict(stats.counters),
+                        'cache_hit_ratio': cache_hit_ratio(stats.counters),
+                    }
+        return {
+            'since': self.started,
+            'totals': {
+                'phases': {phase: phases[phase].summary() for phase in _ordered(phases)},
+                'counters': dict(totals),
+                'cache_hit_ratio': cache_hit_ratio(totals),
+            },
+            'hosts': hosts,
+        }
+
+    def to_prometheus(self, prefix: str = 'scraper') -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent per request phase",
+            f"# TYPE {prefix}_phase_seconds histogram",
+        ]
+        counters = []
+        with self._lock:
+            for host in sorted(self._hosts):
+                stats = self._hosts[host]
+                for phase in _ordered(stats.phases):
+                    histogram = stats.phases[phase]
+                    labels = f'host="{_escape(host)}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, n in zip(list(self.buckets) + ['+Inf'], histogram.counts):
+                        cumulative += n
+                        lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f"{prefix}_phase_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                    lines.append(f"{prefix}_phase_seconds_count{{{labels}}} {histogram.count}")
+                for event in sorted(stats.counters):
+                    counters.append(f'{prefix}_events_total{{host="{_escape(host)}",event="{event}"}} '
+                                    f'{stats.counters[event]}')
+        lines.append(f"# HELP {prefix}_events_total Requests, bytes, retries, failures and cache lookups")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        lines.extend(counters)
+        return '\n'.join(lines) + '\n'
+
+def cache_hit_ratio(counters: Dict[str, int]) -> Optional[float]:
+    """Share of cache lookups answered without a full download (304 revalidations count as hits)"""
+    hits = counters.get('cache_hits', 0) + counters.get('cache_revalidated', 0)
+    lookups = hits + counters.get('cache_misses', 0)
+    return round(hits / lookups, 4) if lookups else None
+
+def _ordered(phases: Dict[str, Any]) -> List[str]:
+    return sorted(phases, key=lambda p: (PHASES.index(p) if p in PHASES else len(PHASES), p))
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# Process-wide default, shared by every WebScraper not given its own
+metrics = ScraperMetrics()
+
+def push_state(url: str, source: ScraperMetrics = None, timeout: float = 10.0):
+    """
+    Send what source (default: the process-wide metrics) recorded since the
+    last push to a collector such as the agent API's
+    ``POST /api/scraper/metrics/push``, which merges it into its own totals.
+    Call it periodically from scraping processes; if the push fails, the
+    state is put back so the next push carries it.
+    """
+    source = source if source is not None else metrics
+    state = source.take_state()
+    if not state['hosts']:
+        return
+    try:
+        response = requests.post(url, json=state, timeout=timeout)
+        response.raise_for_status()
+    except Exception:
+        source.merge_state(state)
+        raise
+
+# Connection setup timing. urllib3 connects lazily inside the request call,
+# on the calling thread, so the time is handed back through a thread-local.
+_connect_times = threading.local()
+
+def take_connect_time() -> Optional[float]:
+    """Seconds this thread spent opening connections since the last call, or None if none were opened"""
+    seconds = getattr(_connect_times, 'seconds', None)
+    _connect_times.seconds = None
+    return seconds
+
+class _TimedConnect:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_times.seconds = (getattr(_connect_times, 'seconds', None) or 0.0) + time.perf_counter() - start
+
+class TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report their connect/TLS time (see take_connect_time)"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
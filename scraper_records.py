@@ -0,0 +1,118 @@
+import json
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional: fall back to positional JSON
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the json module
+    orjson = None
+
+# Record field order of the binary format
+RECORD_FIELDS = ('url', 'title', 'content', 'metadata', 'timestamp', 'status', 'word_count', 'links', 'images')
+
+# Leading byte of each binary encoding; JSON records start with '{'.
+# b'\x01' was an early marshal encoding and is no longer read.
+MSGPACK_TAG = b'\x02'
+JSON_TAG = b'\x03'
+
+def split_url(url: str) -> Tuple[str, str]:
+    """Split a URL into its 'scheme://host/' prefix and the rest"""
+    scheme_end = url.find('://')
+    if scheme_end < 0:
+        return '', url
+    path_start = url.find('/', scheme_end + 3)
+    if path_start < 0:
+        return url, ''
+    return url[:path_start + 1], url[path_start + 1:]
+
+class PrefixTable:
+    """
+    Process-wide table of interned URL prefixes ('https://docs.n8n.io/')
+
+    A crawl's links share a handful of hosts, so each link is kept as a small
+    prefix id plus its suffix instead of a full string. Ids are only valid in
+    this process; serialized records carry their own prefix list.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {'': 0}
+        self._prefixes: List[str] = ['']
+
+    def id_of(self, prefix: str) -> int:
+        prefix_id = self._ids.get(prefix)
+        if prefix_id is None:
+            with self._lock:
+                prefix_id = self._ids.get(prefix)
+                if prefix_id is None:
+                    prefix_id = self._ids[prefix] = len(self._prefixes)
+                    self._prefixes.append(prefix)
+        return prefix_id
+
+    def __getitem__(self, prefix_id: int) -> str:
+        return self._prefixes[prefix_id]
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+prefixes = PrefixTable()
+
+PackedURLs = Optional[Tuple[array, str]]
+
+def pack_urls(urls: List[str]) -> PackedURLs:
+    """Compact form of a URL list: an array of prefix ids and the suffixes joined by newlines"""
+    if not urls:
+        return None
+    ids = array('I')
+    suffixes = []
+    for url in urls:
+        prefix, suffix = split_url(url)
+        ids.append(prefixes.id_of(prefix))
+        suffixes.append(suffix)
+    return ids, '\n'.join(suffixes)
+
+def unpack_urls(packed: PackedURLs) -> List[str]:
+    if packed is None:
+        return []
+    ids, suffixes = packed
+    return [prefixes[prefix_id] + suffix for prefix_id, suffix in zip(ids, suffixes.split('\n'))]
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """
+    Binary encoding of a ScrapedContent record (as returned by to_dict)
+
+    Fields are stored positionally, without key names: as msgpack when
+    installed, otherwise as a JSON array (orjson when installed). Both are
+    stable across Python versions and safe to read from untrusted files, so
+    records can go to the persistent cache and to exported ``.screc`` files.
+    """
+    fields = tuple(record[name] for name in RECORD_FIELDS)
+    if msgpack is not None:
+        return MSGPACK_TAG + msgpack.packb(fields, use_bin_type=True)
+    if orjson is not None:
+        try:
+            return JSON_TAG + orjson.dumps(fields)
+        except TypeError:  # e.g. non-string metadata keys, which json converts
+            pass
+    return JSON_TAG + json.dumps(fields, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def decode_record(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_record; also reads plain JSON records"""
+    tag = data[:1]
+    if tag == JSON_TAG:
+        fields = orjson.loads(data[1:]) if orjson is not None else json.loads(data[1:])
+    elif tag == MSGPACK_TAG:
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read this record")
+        fields = msgpack.unpackb(data[1:], raw=False)
+    elif tag == b'{':
+        return json.loads(data)
+    else:
+        raise ValueError(f"Unknown record encoding {tag!r}")
+    return dict(zip(RECORD_FIELDS, fields))
@@ -0,0 +1,208 @@
+import random
+import threading
+import time
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: timeouts, throttling and transient server errors
+RETRY_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'])
+
+class HostUnavailable(requests.RequestException):
+    """Raised without touching the network while a host's circuit breaker is open"""
+
+def response_status(error: Exception) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    return response.status_code if response is not None else None
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+@dataclass
+class RetryPolicy:
+    """
+    Which failures are retried and how long to wait before the next attempt
+
+    Connection errors, timeouts and RETRY_STATUSES are retried; other HTTP
+    errors (404, 403, ...) fail immediately. A Retry-After header is honored
+    up to max_retry_after, otherwise the wait is "full jitter" exponential
+    backoff: uniform between 0 and min(max_backoff, backoff_base * 2**attempt),
+    so workers that failed together do not retry in lockstep.
+    """
+    backoff_base: float = 1.0
+    max_backoff: float = 30.0
+    max_retry_after: float = 120.0
+    retry_statuses: frozenset = RETRY_STATUSES
+
+    def is_retryable(self, error: Exception, method: str = 'GET') -> bool:
+        """
+        Whether a failed request may be sent again
+
+        Non-idempotent methods (POST, PATCH) are only retried when the
+        server cannot have acted on the request: connecting timed out, or it
+        answered 429/503.
+        """
+        if isinstance(error, HostUnavailable):
+            return False
+        if method.upper() not in IDEMPOTENT_METHODS:
+            if isinstance(error, requests.HTTPError):
+                return response_status(error) in (429, 503)
+            return isinstance(error, requests.ConnectTimeout)
+        if isinstance(error, requests.HTTPError):
+            return response_status(error) in self.retry_statuses
+        return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                                  requests.exceptions.ChunkedEncodingError))
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """The server-requested wait in seconds, capped at max_retry_after"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        wait = parse_retry_after(response.headers.get('Retry-After'))
+        return None if wait is None else min(wait, self.max_retry_after)
+
+    def backoff(self, attempt: int, error: Exception = None) -> float:
+        """Seconds to sleep before retry number attempt + 1"""
+        wait = self.retry_after(error) if error is not None else None
+        if wait is not None:
+            return wait
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    A host's circuit opens after failure_threshold consecutive failures
+    (connection errors, timeouts, 5xx); requests to it then fail fast with
+    HostUnavailable for reset_timeout seconds. After that one probe request is
+    let through (half-open): success closes the circuit, failure re-opens it.
+    Client errors such as 404 mean the host is up and count as successes.
+
+    State changes are logged, counted in transitions, and passed to
+    on_state_change(host, old_state, new_state) when given.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 on_state_change: Callable[[str, str, str], None] = None):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.transitions = Counter()  # (old_state, new_state) -> count
+        self._lock = threading.RLock()  # re-entrant so on_state_change may query the breaker
+        self._state: Dict[str, str] = {}
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    @staticmethod
+    def is_failure(error: Exception) -> bool:
+        """Whether an error says something about the host's health"""
+        if isinstance(error, requests.HTTPError):
+            status = response_status(error)
+            return status is not None and status >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._state.get(host, self.CLOSED)
+
+    def before_request(self, host: str):
+        """Raise HostUnavailable if the host's circuit does not admit a request now"""
+        with self._lock:
+            state = self._state.get(host, self.CLOSED)
+            if state == self.CLOSED:
+                return
+            if state == self.OPEN:
+                remaining = self._opened_at[host] + self.reset_timeout - time.monotonic()
+                if remaining <= 0:
+                    self._transition(host, self.HALF_OPEN)
+                    return  # this request is the probe
+                raise HostUnavailable(f"Circuit open for {host}, retrying in {remaining:.1f}s")
+            raise HostUnavailable(f"Circuit half-open for {host}, waiting on probe request")
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            if self._state.get(host, self.CLOSED) != self.CLOSED:
+                self._transition(host, self.CLOSED)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            state = self._state.get(host, self.CLOSED)
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            if state == self.HALF_OPEN or (state == self.CLOSED and failures >= self.failure_threshold):
+                self._opened_at[host] = time.monotonic()
+                self._transition(host, self.OPEN)
+
+    def abandon(self, host: str):
+        """
+        Settle a request that ended without an outcome (e.g. a parser error or
+        KeyboardInterrupt while reading the body): a half-open probe counts as
+        failed, so the circuit re-opens and admits a new probe after
+        reset_timeout instead of waiting on this one forever
+        """
+        with self._lock:
+            if self._state.get(host) == self.HALF_OPEN:
+                self.record_failure(host)
+
+    def record(self, host: str, error: Exception = None):
+        """Record the outcome of a request: no error or a non-failure error counts as success"""
+        if error is not None and self.is_failure(error):
+            self.record_failure(host)
+        else:
+            self.record_success(host)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Snapshot of every host that is not in the closed state or has recent failures"""
+        with self._lock:
+            hosts = set(self._state) | set(self._failures)
+            return {
+                host: {
+                    'state': self._state.get(host, self.CLOSED),
+                    'consecutive_failures': self._failures.get(host, 0),
+                }
+                for host in hosts
+            }
+
+    def _transition(self, host: str, new_state: str):
+        """Change a host's state; the caller holds the lock"""
+        old_state = self._state.get(host, self.CLOSED)
+        if new_state == self.CLOSED:
+            self._state.pop(host, None)
+            self._opened_at.pop(host, None)
+        else:
+            self._state[host] = new_state
+        self.transitions[(old_state, new_state)] += 1
+        log = logger.warning if new_state == self.OPEN else logger.info
+        log(f"Circuit for {host}: {old_state} -> {new_state}")
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(host, old_state, new_state)
+            except Exception as e:
+                logger.warning(f"Circuit state callback failed: {str(e)}")
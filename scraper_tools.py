@@ -1,21 +1,76 @@
+import asyncio
 import requests
 import json
 import time
 import re
-from typing import Dict, List, Optional, Any, Union
-from urllib.parse import urljoin, urlparse
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+from urllib.parse import urldefrag, urljoin, urlparse
 from datetime import datetime
 import logging
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from bs4.dammit import EncodingDetector
 import feedparser
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, replace
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
 import hashlib
+import heapq
+import multiprocessing
 import os
+import threading
+import soupsieve
+from scraper_cache import CacheEntry, CrawlHistory, RawPageStore, ScrapeCache
+from scraper_dedup import BloomFilter, FingerprintSet, NearDuplicateIndex, canonicalize_url
+from scraper_focus import RelevanceScorer
+from scraper_records import decode_record, encode_record, pack_urls, unpack_urls
+from scraper_api import LinkPagination, PagePagination, Pagination, find_items, iter_json_items
+from scraper_retry import CircuitBreaker, RetryPolicy
+from scraper_metrics import ScraperMetrics, TimedHTTPAdapter, take_connect_time, metrics as shared_metrics
+
+try:
+    from lxml import etree
+except ImportError:  # optional: only needed for the lxml parser backends
+    etree = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Extraction patterns, compiled once
+AD_CLASS_PATTERN = re.compile(r'ad|spam|banner')
+AD_ID_PATTERN = re.compile(r'ad|spam')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+CLEAN_TAGS = frozenset(['script', 'style', 'noscript', 'iframe', 'embed', 'object'])
+NON_CONTENT_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header', 'aside'])
+EMPTY_CHECK_TAGS = frozenset(['p', 'div', 'span'])
+# Tags whose strings are never page text (mirrors BeautifulSoup's string containers)
+OPAQUE_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Content types scrape_page will download; anything else is aborted after the headers
+MARKUP_CONTENT_TYPES = frozenset(['text/html', 'application/xhtml+xml'])
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Parser backends: BeautifulSoup tree builders, plus 'lxml-native' which feeds
+# lxml's event parser straight into PageExtractor without building a tree
+PARSERS = ('html.parser', 'lxml', 'html5lib', 'lxml-native')
+
+# scrape_page's extraction options and their defaults; results extracted with
+# other settings are cached under their own key (see WebScraper._cache_key)
+EXTRACTION_DEFAULTS = dict(extract_text=True, extract_links=True, extract_images=True,
+                           clean_html=True, remove_scripts=True, remove_styles=True, link_text=False)
+
+class ContentRejected(Exception):
+    """Raised when a response is refused before or while downloading its body"""
+
+def is_markup_type(content_type: str) -> bool:
+    """Whether a Content-Type header denotes HTML or XML (a missing type is given the benefit of the doubt)"""
+    mime = content_type.split(';', 1)[0].strip().lower()
+    return (not mime or mime in MARKUP_CONTENT_TYPES
+            or mime.endswith('/xml') or mime.endswith('+xml'))
+
 @dataclass
 class ScrapedContent:
     """Data class for scraped content"""
@@ -34,6 +89,784 @@ class ScrapedContent:
     
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+    
+    def to_bytes(self) -> bytes:
+        """Compact binary form (see scraper_records.encode_record)"""
+        return encode_record({name: getattr(self, name) for name in RECORD_FIELDS})
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ScrapedContent':
+        """Rebuild from to_bytes output (or a JSON record)"""
+        return cls(**decode_record(data))
+
+RECORD_FIELDS = tuple(f.name for f in fields(ScrapedContent))
+
+class CompactContent:
+    """
+    Slotted, memory-lean form of ScrapedContent for holding many results
+    
+    Links and images are kept as interned host-prefix ids plus one joined
+    suffix string, and only turned back into lists of URLs when the
+    ``links`` / ``images`` attributes are read. Convert with from_content()
+    and to_content().
+    """
+    
+    __slots__ = ('url', 'title', 'content', 'metadata', 'timestamp', 'status', 'word_count',
+                 '_links', '_images')
+    
+    def __init__(self, 
+                 url: str,
+                 title: str,
+                 content: str,
+                 metadata: Dict[str, Any],
+                 timestamp: str,
+                 status: int,
+                 word_count: int,
+                 links: List[str],
+                 images: List[str]):
+        self.url = url
+        self.title = title
+        self.content = content
+        self.metadata = metadata
+        self.timestamp = timestamp
+        self.status = status
+        self.word_count = word_count
+        self._links = pack_urls(links)
+        self._images = pack_urls(images)
+    
+    @property
+    def links(self) -> List[str]:
+        return unpack_urls(self._links)
+    
+    @property
+    def images(self) -> List[str]:
+        return unpack_urls(self._images)
+    
+    @classmethod
+    def from_content(cls, content: ScrapedContent) -> 'CompactContent':
+        return cls(**{name: getattr(content, name) for name in RECORD_FIELDS})
+    
+    def to_content(self) -> ScrapedContent:
+        return ScrapedContent(**self.to_dict())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+    
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+    
+    def to_bytes(self) -> bytes:
+        return encode_record(self.to_dict())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactContent':
+        return cls(**decode_record(data))
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (CompactContent, ScrapedContent)):
+            return NotImplemented
+        return self.to_dict() == {name: getattr(other, name) for name in RECORD_FIELDS}
+    
+    def __repr__(self) -> str:
+        return f"CompactContent(url={self.url!r}, title={self.title!r}, word_count={self.word_count})"
+
+class HostRateLimiter:
+    """Per-host politeness: minimum delay between requests and a concurrency cap"""
+    
+    def __init__(self, delay: float = 1.0, max_per_host: int = 1):
+        self.delay = delay
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+    
+    @contextmanager
+    def acquire(self, url: str):
+        """Hold a request slot for the URL's host, waiting out its delay first"""
+        host = self.host_of(url)
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        
+        slot.acquire()
+        try:
+            # Reserve the next start time for this host, then sleep outside the lock
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            slot.release()
+    
+    def defer(self, url: str, seconds: float):
+        """Hold off every request to the URL's host for at least seconds (e.g. after Retry-After)"""
+        host = self.host_of(url)
+        with self._lock:
+            resume = time.monotonic() + seconds
+            self._next_start[host] = max(self._next_start.get(host, 0.0), resume)
+
+class CrawlFrontier:
+    """
+    FIFO crawl frontier with O(1) dequeue and set-backed dedup of queued and visited URLs
+    
+    URLs are deduplicated on key(url), e.g. canonicalize_url, so variants of
+    the same page are only fetched once; the first variant seen is queued,
+    without its fragment. For very large crawls, pass a compact ``seen``
+    (FingerprintSet or BloomFilter) in place of the default set of keys.
+    """
+    
+    def __init__(self, key: Callable[[str], str] = None, seen: Any = None):
+        self.key = key or (lambda url: url)
+        self._queue = deque()
+        # Keys of every URL ever queued, so visited URLs are never re-queued
+        self._seen = seen if seen is not None else set()
+    
+    def push(self, url: str) -> bool:
+        """Queue a URL unless it (or a variant with the same key) was queued before; returns True if added"""
+        key = self.key(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._queue.append(urldefrag(url)[0])
+        return True
+    
+    def pop(self) -> str:
+        return self._queue.popleft()
+    
+    def mark_seen(self, key: str):
+        """Record a key as already visited without queueing it (e.g. when resuming a crawl)"""
+        self._seen.add(key)
+    
+    def __contains__(self, url: str) -> bool:
+        return self.key(url) in self._seen
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+
+class PriorityFrontier(CrawlFrontier):
+    """
+    Best-first crawl frontier: pop() returns the queued URL with the highest score
+    
+    URLs with equal scores come out in the order they were queued. Pushing an
+    already-queued URL with a higher score raises its priority; URLs that
+    were already popped are never queued again.
+    """
+    
+    def __init__(self, key: Callable[[str], str] = None, seen: Any = None):
+        super().__init__(key, seen)
+        self._heap = []
+        self._queued = {}  # key -> (best score, URL) of URLs waiting in the heap
+        self._counter = 0
+    
+    def push(self, url: str, score: float = 0.0) -> bool:
+        """Queue a URL, or raise the score of a queued one; returns True if it was queued or raised"""
+        key = self.key(url)
+        queued = self._queued.get(key)
+        if queued is not None:
+            if score <= queued[0]:
+                return False
+            url = queued[1]
+        elif key in self._seen:
+            return False
+        else:
+            url = urldefrag(url)[0]
+        self._seen.add(key)
+        self._queued[key] = (score, url)
+        # Stale entries for a raised URL stay in the heap and are skipped by pop()
+        heapq.heappush(self._heap, (-score, self._counter, key, url))
+        self._counter += 1
+        return True
+    
+    def pop(self) -> str:
+        while True:
+            negative_score, _, key, url = heapq.heappop(self._heap)
+            queued = self._queued.get(key)
+            if queued is not None and queued[0] == -negative_score:
+                del self._queued[key]
+                return url
+    
+    def score_of(self, url: str) -> Optional[float]:
+        """Score of a queued URL, or None if it is not waiting in the frontier"""
+        queued = self._queued.get(self.key(url))
+        return queued[0] if queued is not None else None
+    
+    def __len__(self) -> int:
+        return len(self._queued)
+
+class PageExtractor:
+    """
+    Single-pass HTML cleaner and extractor
+    
+    Consumes start/end/data events for one document and produces the title,
+    text, metadata, links and images in the same traversal. Cleaning is
+    applied on the fly: dropped elements are skipped along with their
+    subtree, non-content elements (nav, footer, ...) are kept out of the
+    text, and empty p/div/span elements are rolled back when they close.
+    The output matches cleaning the tree first and extracting afterwards.
+    
+    ``start`` returns False for a dropped element; the caller must then
+    skip its subtree and not send its ``end``.
+    """
+    
+    def __init__(self, 
+                 base_url: str,
+                 extract_text: bool = True,
+                 extract_links: bool = True,
+                 extract_images: bool = True,
+                 clean_html: bool = True,
+                 remove_scripts: bool = True,
+                 remove_styles: bool = True,
+                 link_text: bool = False):
+        self.base_url = base_url
+        self.extract_text = extract_text
+        self.extract_links = extract_links
+        self.extract_images = extract_images
+        self.clean_html = clean_html
+        self.link_text = link_text
+        
+        drop_tags = set(CLEAN_TAGS) if clean_html else set()
+        if remove_scripts:
+            drop_tags.add('script')
+        if remove_styles:
+            drop_tags.add('style')
+        self._drop_tags = drop_tags
+        self._hidden_tags = NON_CONTENT_TAGS if extract_text else frozenset()
+        
+        # One entry per open element: (hidden, opaque, frame, capture, root)
+        self._stack = []
+        self._hidden = 0
+        self._opaque = 0
+        self._frames = []    # open p/div/span elements: [has_text, rollback marks]
+        self._captures = []  # open title/h1 text buffers
+        
+        self.chunks = []
+        self.links = []
+        self.anchors = []    # text of each link in self.links, when link_text is on
+        self.images = []
+        self.titles = []
+        self.headings = []
+        self.metas = []      # (hidden, name, property, content)
+        self.languages = []
+        self.roots = []      # [tag, first chunk, end chunk] for body/main/article
+    
+    def start(self, tag: str, attrs: Dict[str, Any]) -> bool:
+        if tag in self._drop_tags:
+            return False
+        
+        if self.clean_html:
+            classes = attrs.get('class')
+            if classes:
+                if isinstance(classes, str):
+                    classes = classes.split()
+                for name in classes:
+                    if AD_CLASS_PATTERN.search(name):
+                        return False
+            element_id = attrs.get('id')
+            if element_id and AD_ID_PATTERN.search(element_id):
+                return False
+        
+        hidden = tag in self._hidden_tags
+        opaque = tag in OPAQUE_TEXT_TAGS
+        in_hidden = hidden or self._hidden > 0
+        
+        frame = None
+        if self.clean_html and tag in EMPTY_CHECK_TAGS:
+            frame = [False, self._marks()]
+            self._frames.append(frame)
+        
+        # Title candidates are taken before non-content elements are removed
+        capture = None
+        if tag == 'title' and not self.titles:
+            capture = []
+            self.titles.append(capture)
+        elif tag == 'h1' and not self.headings:
+            capture = []
+            self.headings.append(capture)
+        if capture is not None:
+            self._captures.append(capture)
+        
+        root = None
+        if tag == 'meta':
+            self.metas.append((in_hidden, attrs.get('name'), attrs.get('property'), attrs.get('content', '')))
+        elif not in_hidden:
+            if tag == 'a':
+                if self.extract_links and attrs.get('href') is not None:
+                    self.links.append(attrs['href'])
+                    if self.link_text:
+                        capture = []
+                        self.anchors.append(capture)
+                        self._captures.append(capture)
+            elif tag == 'img':
+                if self.extract_images and attrs.get('src') is not None:
+                    self.images.append(attrs['src'])
+            elif tag == 'html':
+                self.languages.append(attrs.get('lang', 'en'))
+            elif tag in ('body', 'main', 'article'):
+                root = [tag, len(self.chunks), None]
+                self.roots.append(root)
+        
+        if hidden:
+            self._hidden += 1
+        if opaque:
+            self._opaque += 1
+        self._stack.append((hidden, opaque, frame, capture, root))
+        return True
+    
+    def end(self, tag: str):
+        hidden, opaque, frame, capture, root = self._stack.pop()
+        if hidden:
+            self._hidden -= 1
+        if opaque:
+            self._opaque -= 1
+        if capture is not None:
+            self._captures.pop()
+        if root is not None:
+            root[2] = len(self.chunks)
+        if frame is not None:
+            self._frames.pop()
+            if frame[0]:
+                if self._frames:
+                    self._frames[-1][0] = True
+            else:
+                # Empty element: forget everything collected inside it
+                self._rollback(frame[1])
+    
+    def data(self, text: str):
+        if not self._opaque:
+            self.cdata(text)
+    
+    def cdata(self, text: str):
+        """Text that counts even inside opaque tags (CDATA sections keep their own string type)"""
+        if self._frames or self._captures:
+            stripped = text.strip()
+            if stripped:
+                if self._frames:
+                    self._frames[-1][0] = True
+                for capture in self._captures:
+                    capture.append(stripped)
+        if self.extract_text and not self._hidden:
+            self.chunks.append(text)
+    
+    def close(self) -> Dict[str, Any]:
+        """Finish the document and return the extracted fields"""
+        while self._stack:
+            self.end(None)
+        
+        metadata = self._metadata()
+        if self.link_text:
+            metadata['link_text'] = self._link_text()
+        return {
+            'title': self._title(),
+            'content': self._text() if self.extract_text else "",
+            'metadata': metadata,
+            'links': self._absolute(self.links),
+            'images': self._absolute(self.images),
+        }
+    
+    def _marks(self) -> tuple:
+        return (len(self.chunks), len(self.links), len(self.anchors), len(self.images), len(self.titles),
+                len(self.headings), len(self.metas), len(self.languages), len(self.roots))
+    
+    def _rollback(self, marks: tuple):
+        for items, mark in zip((self.chunks, self.links, self.anchors, self.images, self.titles,
+                                self.headings, self.metas, self.languages, self.roots), marks):
+            del items[mark:]
+    
+    def _title(self) -> str:
+        if self.titles:
+            return ''.join(self.titles[0])
+        if self.headings:
+            return ''.join(self.headings[0])
+        for _, _, prop, content in self.metas:
+            if prop == 'og:title':
+                return content
+        return ''
+    
+    def _text(self) -> str:
+        chunks = self.chunks
+        for tag in ('body', 'main', 'article'):
+            root = next((r for r in self.roots if r[0] == tag), None)
+            if root is not None:
+                chunks = chunks[root[1]:root[2]]
+                break
+        return WHITESPACE_PATTERN.sub(' ', ''.join(chunks)).strip()
+    
+    def _metadata(self) -> Dict[str, Any]:
+        def first(key: int, value: str) -> Optional[str]:
+            for meta in self.metas:
+                if not meta[0] and meta[key] == value:
+                    return meta[3]
+            return None
+        
+        metadata = {}
+        
+        # Description
+        description = first(1, 'description')
+        if description is not None:
+            metadata['description'] = description
+        og_description = first(2, 'og:description')
+        if og_description is not None:
+            metadata['description'] = og_description
+        
+        # Keywords
+        keywords = first(1, 'keywords')
+        if keywords is not None:
+            metadata['keywords'] = [k.strip() for k in keywords.split(',')]
+        
+        # Author
+        author = first(1, 'author')
+        if author is not None:
+            metadata['author'] = author
+        
+        # Date
+        date = first(2, 'article:published_time')
+        if date is not None:
+            metadata['date'] = date
+        
+        # Language
+        if self.languages:
+            metadata['language'] = self.languages[0]
+        
+        return metadata
+    
+    def _link_text(self) -> Dict[str, str]:
+        """Anchor text per absolute link URL; texts of several links to one URL are joined"""
+        texts = {}
+        for href, capture in zip(self.links, self.anchors):
+            text = ' '.join(capture)
+            if not text:
+                continue
+            try:
+                url = urljoin(self.base_url, href)
+            except ValueError:
+                continue
+            texts[url] = f"{texts[url]} {text}" if url in texts else text
+        return texts
+    
+    def _absolute(self, urls: List[str]) -> List[str]:
+        absolute = {}
+        for url in urls:
+            try:
+                absolute[urljoin(self.base_url, url)] = None
+            except ValueError:
+                continue
+        return list(absolute)  # Remove duplicates, keep document order
+    
+    def feed_soup(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Walk a parsed BeautifulSoup tree once and return the extracted fields"""
+        stack = [iter(soup.contents)]
+        names = [None]
+        while stack:
+            for node in stack[-1]:
+                if isinstance(node, Tag):
+                    if self.start(node.name, node.attrs):
+                        stack.append(iter(node.contents))
+                        names.append(node.name)
+                        break
+                elif type(node) is NavigableString:
+                    self.data(node)
+                elif type(node) is CData:
+                    self.cdata(node)
+            else:
+                stack.pop()
+                name = names.pop()
+                if name is not None:
+                    self.end(name)
+        return self.close()
+
+@lru_cache(maxsize=512)
+def compile_selector(selector: str):
+    """Compile a CSS selector once and reuse it across pages and calls"""
+    return soupsieve.compile(selector)
+
+def select_text(soup: BeautifulSoup, selectors: Dict[str, str]) -> Dict[str, List[str]]:
+    """Run {key: css_selector} against a parsed page and return the matched texts"""
+    return {
+        key: [elem.get_text(strip=True) for elem in compile_selector(selector).select(soup)]
+        for key, selector in selectors.items()
+    }
+
+class LxmlEventTarget:
+    """
+    lxml parser target that forwards parse events to a PageExtractor
+    
+    Adjacent text events are merged up to the next tag, comment or
+    processing instruction, which is where BeautifulSoup splits strings,
+    so the extractor sees the same strings as it would from a soup built
+    with the 'lxml' tree builder.
+    """
+    
+    def __init__(self, extractor: PageExtractor):
+        self.extractor = extractor
+        self._skip = 0
+        self._text = []
+    
+    def start(self, tag: str, attrib: Dict[str, str]):
+        self._flush()
+        if self._skip:
+            self._skip += 1
+        elif not self.extractor.start(tag, attrib):
+            self._skip = 1
+    
+    def end(self, tag: str):
+        self._flush()
+        if self._skip:
+            self._skip -= 1
+        else:
+            self.extractor.end(tag)
+    
+    def data(self, text: str):
+        if not self._skip:
+            self._text.append(text)
+    
+    def comment(self, text: str):
+        self._flush()
+    
+    def pi(self, target: str, data: str = None):
+        self._flush()
+    
+    def doctype(self, *args):
+        self._flush()
+    
+    def close(self) -> Dict[str, Any]:
+        self._flush()
+        return self.extractor.close()
+    
+    def _flush(self):
+        if self._text:
+            text = ''.join(self._text)
+            self._text = []
+            self.extractor.data(text)
+
+def extract_page(body: bytes, 
+                 base_url: str, 
+                 parser: str = 'html.parser', 
+                 timings: Dict[str, float] = None, 
+                 **options) -> Dict[str, Any]:
+    """
+    Parse a raw body with the given backend and extract it in one pass
+    
+    Args:
+        body: Raw response body
+        base_url: URL used to resolve relative links and images
+        parser: One of PARSERS
+        timings: Optional dict that receives the seconds spent in 'parse' and
+            'extract' (lxml-native does both in one pass, reported as 'parse')
+        **options: PageExtractor options
+        
+    Returns:
+        Dictionary with title, content, metadata, links and images
+    """
+    start = time.perf_counter()
+    if parser != 'lxml-native':
+        soup = BeautifulSoup(body, parser)
+        parsed = time.perf_counter()
+        extracted = PageExtractor(base_url, **options).feed_soup(soup)
+        if timings is not None:
+            timings['parse'] = parsed - start
+            timings['extract'] = time.perf_counter() - parsed
+        return extracted
+    
+    # Try encodings in the same order BeautifulSoup's lxml builder would
+    error = None
+    for encoding in EncodingDetector(body, is_html=True).encodings:
+        target = LxmlEventTarget(PageExtractor(base_url, **options))
+        try:
+            lxml_parser = etree.HTMLParser(target=target, recover=True, encoding=encoding)
+            lxml_parser.feed(body)
+            extracted = lxml_parser.close()
+        except (UnicodeDecodeError, LookupError, etree.ParserError) as e:
+            error = e
+            continue
+        if timings is not None:
+            timings['parse'] = time.perf_counter() - start
+        return extracted
+    raise ValueError(f"lxml could not decode the document: {error}")
+
+class StreamingExtractor:
+    """
+    Incremental lxml-native extraction fed with body chunks as they download
+    
+    The encoding is taken from a byte-order mark or a declaration in the
+    first bytes, exactly as BeautifulSoup would pick it first. When neither
+    is present, or lxml rejects the encoding, ``close`` returns None and the
+    caller falls back to extract_page on the full body.
+    """
+    
+    SNIFF_BYTES = 2048
+    
+    def __init__(self, base_url: str, **options):
+        self.base_url = base_url
+        self.options = options
+        self.reset()
+    
+    def reset(self):
+        """Start over, e.g. before a retried download"""
+        self._prefix = []
+        self._prefix_size = 0
+        self._parser = None
+        self._failed = False
+    
+    def feed(self, chunk: bytes):
+        if self._failed:
+            return
+        if self._parser is None:
+            self._prefix.append(chunk)
+            self._prefix_size += len(chunk)
+            if self._prefix_size >= self.SNIFF_BYTES:
+                self._start()
+            return
+        self._feed(chunk)
+    
+    def close(self) -> Optional[Dict[str, Any]]:
+        if self._parser is None and not self._failed:
+            self._start()
+        if self._failed:
+            return None
+        try:
+            return self._parser.close()
+        except (UnicodeDecodeError, LookupError, etree.ParserError):
+            return None
+    
+    def _start(self):
+        detector = EncodingDetector(b''.join(self._prefix), is_html=True)
+        self._prefix = []
+        encoding = detector.sniffed_encoding or EncodingDetector.find_declared_encoding(detector.markup, is_html=True)
+        if encoding is None:
+            self._failed = True
+            return
+        target = LxmlEventTarget(PageExtractor(self.base_url, **self.options))
+        try:
+            self._parser = etree.HTMLParser(target=target, recover=True, encoding=encoding)
+        except LookupError:
+            self._failed = True
+            return
+        self._feed(detector.markup)
+    
+    def _feed(self, data: bytes):
+        try:
+            self._parser.feed(data)
+        except (UnicodeDecodeError, LookupError, etree.ParserError):
+            self._failed = True
+
+class ParsePool:
+    """
+    Process-pool parsing tier
+    
+    Fetch threads hand raw bodies to worker processes, which run
+    extract_page outside the GIL. At most ``max_pending`` bodies are queued
+    or being parsed at once; submit() blocks beyond that, so the fetch
+    stage cannot outrun parsing and pile bodies up in memory.
+    """
+    
+    def __init__(self, processes: int = None, max_pending: int = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.processes
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def submit(self, body: bytes, url: str, parser: str, **options) -> Future:
+        """Queue a body for extraction, blocking while the queue is full"""
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(extract_page, body, url, parser, **options)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    def extract(self, body: bytes, url: str, parser: str, **options) -> Dict[str, Any]:
+        return self.submit(body, url, parser, **options).result()
+    
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Worker processes are only started once something needs parsing, usually from a
+        # fetch thread while others run; forking a threaded process can deadlock, so never fork
+        with self._lock:
+            if self._executor is None:
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+def feed_items(feed: Any) -> List[Dict[str, str]]:
+    """Flatten a parsed feed's entries into item dicts; 'guid' is the entry's id, or its link"""
+    items = []
+    for entry in feed.entries:
+        items.append({
+            'title': entry.get('title', ''),
+            'description': entry.get('description', ''),
+            'link': entry.get('link', ''),
+            'pubDate': entry.get('published', ''),
+            'author': entry.get('author', ''),
+            'guid': entry.get('id') or entry.get('link', ''),
+        })
+    return items
+
+async def iterate_in_thread(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Drive a blocking iterator from a worker thread, one item per await
+    
+    The next item is only requested once the consumer asks for it, so the
+    iterator's own backpressure carries over to async code.
+    """
+    loop = asyncio.get_running_loop()
+    done = object()
+    pending = None
+    
+    async def finish():
+        # A generator cannot be closed while next() still runs in its thread
+        if pending is not None and not pending.done():
+            await asyncio.wait([pending])
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await loop.run_in_executor(None, close)
+    
+    try:
+        while True:
+            pending = loop.run_in_executor(None, next, iterator, done)
+            # Shielded: cancelling the consumer must not mark the still-running call as finished
+            item = await asyncio.shield(pending)
+            pending = None
+            if item is done:
+                return
+            yield item
+    finally:
+        # Shielded, so a cancelled consumer still waits for the fetch and runs the iterator's cleanup
+        await asyncio.shield(finish())
+
+def make_session(max_workers: int = 4, max_per_host: int = 1) -> requests.Session:
+    """
+    Create a keep-alive session whose connection pools fit the scraper's concurrency
+    
+    ``pool_connections`` is how many hosts keep a pool, ``pool_maxsize`` how
+    many idle connections each host keeps; requests' defaults (10/10) drop
+    connections on wide crawls and keep too few under per-host concurrency.
+    """
+    session = requests.Session()
+    # Timed connections, so connect/TLS time can be told apart from time to first byte
+    adapter = TimedHTTPAdapter(
+        pool_connections=max(10, 4 * max_workers),
+        pool_maxsize=max(10, max_per_host)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 class WebScraper:
     """Comprehensive web scraping utility for agents"""
@@ -43,11 +876,48 @@ class WebScraper:
                  max_retries: int = 3,
                  delay: float = 1.0,
                  user_agent: str = None,
-                 session: requests.Session = None):
+                 session: requests.Session = None,
+                 max_workers: int = 4,
+                 max_per_host: int = 1,
+                 cache_dir: str = "scraper_cache",
+                 cache_ttl: Optional[float] = 7 * 24 * 3600,
+                 cache_max_bytes: int = 512 * 1024 * 1024,
+                 store_raw: bool = False,
+                 parser: str = 'html.parser',
+                 max_body_bytes: int = 10 * 1024 * 1024,
+                 parse_processes: int = 0,
+                 parse_queue_size: int = None,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 track_changes: bool = False,
+                 metrics: ScraperMetrics = None):
+        
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}, expected one of {PARSERS}")
+        if parser.startswith('lxml') and etree is None:
+            raise ValueError(f"Parser {parser!r} requires lxml")
         
         self.timeout = timeout
         self.max_retries = max_retries
         self.delay = delay
+        self.max_workers = max_workers
+        self.max_body_bytes = max_body_bytes
+        self.parser = parser
+        # Backend for code that needs a BeautifulSoup tree
+        self.soup_parser = 'lxml' if parser == 'lxml-native' else parser
+        
+        # Optional process pool for parsing, so extraction scales past the GIL
+        self.parse_pool = ParsePool(parse_processes, parse_queue_size) if parse_processes else None
+        
+        # Politeness is enforced per host, so requests to different hosts never wait on each other
+        self.rate_limiter = HostRateLimiter(delay=delay, max_per_host=max_per_host)
+        
+        # Status-aware retries with jittered backoff, and fail-fast for hosts that are down
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        
+        # Per-host phase timings, bytes, retries and cache counters (shared process-wide by default)
+        self.metrics = metrics or shared_metrics
         
         # Default headers
         self.headers = {
@@ -59,17 +929,25 @@ class WebScraper:
             'Upgrade-Insecure-Requests': '1',
         }
         
-        # Use provided session or create new one
-        self.session = session or requests.Session()
+        # Use provided session or create a pooled one sized for our concurrency
+        self.session = session or make_session(max_workers, max_per_host)
         self.session.headers.update(self.headers)
         
-        # Cache for storing scraped content
-        self.cache = {}
-        self.cache_dir = "scraper_cache"
+        # Cache for storing scraped content: in-process LRU over a SQLite index in cache_dir
+        self.cache_dir = cache_dir
+        self.cache = ScrapeCache(
+            cache_dir,
+            dumps=ScrapedContent.to_bytes,
+            loads=ScrapedContent.from_bytes,  # also reads entries written as JSON
+            ttl=cache_ttl,
+            max_bytes=cache_max_bytes
+        )
+        
+        # Optional content-addressed store of raw bodies, so pages can be re-extracted offline
+        self.raw_store = RawPageStore(os.path.join(cache_dir, "raw")) if store_raw else None
         
-        # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        # Optional per-URL change history, for incremental crawls (created on demand by scrape_website)
+        self.history = CrawlHistory(cache_dir) if track_changes else None
 
     def scrape_page(self, 
                    url: str, 
@@ -79,7 +957,9 @@ class WebScraper:
                    clean_html: bool = True,
                    remove_scripts: bool = True,
                    remove_styles: bool = True,
-                   use_cache: bool = True) -> ScrapedContent:
+                   link_text: bool = False,
+                   use_cache: bool = True,
+                   revalidate: bool = False) -> ScrapedContent:
         """
         Scrape a single webpage
         
@@ -91,63 +971,106 @@ class WebScraper:
             clean_html: Whether to clean HTML
             remove_scripts: Whether to remove script tags
             remove_styles: Whether to remove style tags
+            link_text: Whether to record each link's anchor text in metadata['link_text']
             use_cache: Whether to use cached results
+            revalidate: Whether to revalidate a cached result with a conditional
+                request (If-None-Match / If-Modified-Since) even if it has not expired.
+                Expired entries are always revalidated when they have validators.
             
         Returns:
             ScrapedContent object
         """
         
+        extraction_options = dict(
+            extract_text=extract_text,
+            extract_links=extract_links,
+            extract_images=extract_images,
+            clean_html=clean_html,
+            remove_scripts=remove_scripts,
+            remove_styles=remove_styles,
+            link_text=link_text
+        )
+        
         # Check cache first
-        if use_cache:
-            cached_content = self._get_cached_content(url)
-            if cached_content:
-                logger.info(f"📋 Using cached content for: {url}")
-                return cached_content
+        host = HostRateLimiter.host_of(url)
+        cache_key = self._cache_key(url, extraction_options)
+        cached_entry = self._get_cache_entry(cache_key) if use_cache else None
+        if cached_entry and cached_entry.is_fresh and not revalidate:
+            self.metrics.count(host, 'cache_hits')
+            logger.info(f"📋 Using cached content for: {url}")
+            return cached_entry.value  # a fresh copy; the cache keeps its own encoded form
         
         try:
             logger.info(f"🔍 Scraping: {url}")
             
-            # Make request with retries
-            response = self._make_request(url)
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Clean HTML if requested
-            if clean_html:
-                self._clean_html(soup)
-            
-            if remove_scripts:
-                for script in soup(["script"]):
-                    script.decompose()
-            
-            if remove_styles:
-                for style in soup(["style"]):
-                    style.decompose()
-            
-            # Extract content
-            title = self._extract_title(soup)
-            content = self._extract_text(soup) if extract_text else ""
-            metadata = self._extract_metadata(soup)
-            links = self._extract_links(soup, url) if extract_links else []
-            images = self._extract_images(soup, url) if extract_images else []
-            
-            # Create scraped content object
-            scraped_content = ScrapedContent(
-                url=url,
-                title=title,
-                content=content,
-                metadata=metadata,
-                timestamp=datetime.now().isoformat(),
-                status=response.status_code,
-                word_count=len(content.split()),
-                links=links,
-                images=images
-            )
+            # Make request with retries, conditional on the cached validators if any.
+            # Non-markup responses are aborted after the headers; with lxml-native the
+            # body is parsed while it downloads.
+            validators = cached_entry.validators if cached_entry else None
+            stream = None
+            if self.parser == 'lxml-native' and self.parse_pool is None:
+                stream = StreamingExtractor(url, **extraction_options)
+            response = self._make_request(url, validators=validators, markup_only=True, sink=stream)
+            
+            # Not modified: serve the stored result with a fresh timestamp
+            if response.status_code == 304 and cached_entry:
+                self.metrics.count(host, 'cache_revalidated')
+                cached_content = replace(cached_entry.value, timestamp=datetime.now().isoformat())
+                new_validators = self._response_validators(response) or dict(validators)
+                if 'body_hash' in validators:
+                    new_validators['body_hash'] = validators['body_hash']
+                self._cache_content(cache_key, cached_content, new_validators)
+                if self.history is not None:
+                    previous = self.history.get(url)
+                    if previous is not None:
+                        self.history.record(url, previous.content_hash)
+                logger.info(f"📋 Not modified, using cached content for: {url}")
+                return cached_content
+            
+            # Same body as the cached result was extracted from (servers without validators):
+            # skip extraction. The hash is kept with the cache entry itself, so it always
+            # describes that entry, whatever else fetched the URL since.
+            body_hash = None
+            if self.history is not None:
+                body_hash = hashlib.sha256(response.content).hexdigest()
+                if cached_entry and cached_entry.validators.get('body_hash') == body_hash:
+                    self.history.record(url, body_hash)
+                    self.metrics.count(host, 'cache_unchanged')
+                    cached_content = replace(cached_entry.value, timestamp=datetime.now().isoformat())
+                    self._cache_content(cache_key, cached_content,
+                                        dict(self._response_validators(response), body_hash=body_hash))
+                    logger.info(f"📋 Unchanged, using cached content for: {url}")
+                    return cached_content
+            
+            if use_cache:
+                self.metrics.count(host, 'cache_misses')
+            if self.raw_store is not None:
+                self._store_raw(url, response)
+            
+            extracted = None
+            if stream is not None:
+                # Most of the parse already happened during the download; this finishes it
+                with self.metrics.time(host, 'parse'):
+                    extracted = stream.close()
+            if extracted is not None:
+                scraped_content = self._content_from_extracted(url, extracted, response.status_code)
+            else:
+                scraped_content = self._build_content(
+                    url,
+                    response.content,
+                    response.status_code,
+                    **extraction_options
+                )
             
             # Cache the result
             if use_cache:
-                self._cache_content(url, scraped_content)
+                new_validators = self._response_validators(response)
+                if body_hash is not None:
+                    new_validators['body_hash'] = body_hash
+                self._cache_content(cache_key, scraped_content, new_validators)
+            if body_hash is not None:
+                # Only once extraction succeeded, so a failed page is not taken as seen
+                self.history.record(url, body_hash)
             
             logger.info(f"✅ Successfully scraped: {url} ({scraped_content.word_count} words)")
             return scraped_content
@@ -158,119 +1081,434 @@ class WebScraper:
 
     def scrape_pages(self, 
                     urls: List[str], 
+                    max_workers: int = None,
+                    compact: bool = False,
                     **kwargs) -> List[ScrapedContent]:
         """
-        Scrape multiple pages
+        Scrape multiple pages concurrently
+        
+        Requests to the same host are spaced by ``delay`` and capped at
+        ``max_per_host``; different hosts are fetched in parallel.
         
         Args:
             urls: List of URLs to scrape
+            max_workers: Global concurrency cap (defaults to the scraper's max_workers)
+            compact: Return CompactContent objects, which take far less memory
             **kwargs: Additional arguments for scrape_page
             
         Returns:
-            List of ScrapedContent objects
+            List of ScrapedContent objects, in input order (failed URLs are skipped)
         """
-        results = []
+        results = self.iter_pages(urls, max_workers=max_workers, ordered=True, **kwargs)
+        if compact:
+            return [CompactContent.from_content(content) for content in results]
+        return list(results)
+
+    def iter_pages(self, 
+                   urls: Iterable[str], 
+                   max_workers: int = None,
+                   ordered: bool = False,
+                   **kwargs) -> Iterator[ScrapedContent]:
+        """
+        Scrape pages concurrently, yielding each result as soon as it is ready
+        
+        At most ``max_workers`` pages are in flight and new ones are only
+        started as results are consumed, so a slow consumer throttles fetching
+        and memory stays bounded. ``urls`` may be a lazy iterable.
         
-        for i, url in enumerate(urls):
+        Args:
+            urls: URLs to scrape
+            max_workers: Global concurrency cap (defaults to the scraper's max_workers)
+            ordered: Yield in input order instead of completion order
+            **kwargs: Additional arguments for scrape_page
+            
+        Yields:
+            ScrapedContent objects (failed URLs are skipped)
+        """
+        max_workers = max(1, max_workers or self.max_workers)
+        urls = iter(urls)
+        
+        def scrape_one(url: str) -> Optional[ScrapedContent]:
             try:
-                result = self.scrape_page(url, **kwargs)
-                results.append(result)
-                
-                # Add delay between requests (except for last request)
-                if i < len(urls) - 1 and self.delay > 0:
-                    time.sleep(self.delay)
-                    
+                return self.scrape_page(url, **kwargs)
             except Exception as e:
                 logger.error(f"Failed to scrape {url}: {str(e)}")
                 # Continue with other URLs even if one fails
+                return None
         
-        return results
+        if max_workers == 1:
+            for url in urls:
+                result = scrape_one(url)
+                if result is not None:
+                    yield result
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            in_flight = deque()
+            for url in urls:
+                in_flight.append(executor.submit(scrape_one, url))
+                if len(in_flight) >= max_workers:
+                    break
+            
+            while in_flight:
+                if ordered:
+                    done = [in_flight.popleft()]
+                else:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    done = [future for future in in_flight if future in finished]
+                    for future in done:
+                        in_flight.remove(future)
+                
+                for future in done:
+                    # Refill before yielding so fetching overlaps with the consumer
+                    url = next(urls, None)
+                    if url is not None:
+                        in_flight.append(executor.submit(scrape_one, url))
+                    result = future.result()
+                    if result is not None:
+                        yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def scrape_website(self, 
                       base_url: str,
                       max_pages: int = 10,
-                      follow_internal_links: bool = True,
-                      allowed_domains: List[str] = None,
-                      exclude_patterns: List[str] = None,
+                      compact: bool = False,
                       **kwargs) -> List[ScrapedContent]:
         """
         Scrape a website and follow links to find related content
         
+        Collects iter_website into a list; see iter_website for the arguments.
+        With ``compact``, the list holds CompactContent objects, so large
+        crawls take far less memory.
+        
+        Returns:
+            List of ScrapedContent objects
+        """
+        results = self.iter_website(base_url, max_pages=max_pages, **kwargs)
+        if compact:
+            return [CompactContent.from_content(content) for content in results]
+        return list(results)
+
+    def iter_website(self, 
+                     base_url: str,
+                     max_pages: int = 10,
+                     follow_internal_links: bool = True,
+                     allowed_domains: List[str] = None,
+                     exclude_patterns: List[str] = None,
+                     max_workers: int = None,
+                     canonicalize: bool = True,
+                     dedup_distance: Optional[int] = 3,
+                     incremental: bool = False,
+                     focus: Union[str, Iterable[str], Dict[str, Any], RelevanceScorer] = None,
+                     min_link_score: float = None,
+                     session: Any = None,
+                     visited: Any = None,
+                     **kwargs) -> Iterator[ScrapedContent]:
+        """
+        Crawl a website, yielding each page as soon as it is scraped
+        
+        Pages are fetched breadth-first (best-first with ``focus``) by up to ``max_workers`` concurrent
+        workers; per-host delay and concurrency limits still apply. No new
+        pages are dispatched while the consumer is handling a result, so a
+        slow consumer throttles the crawl instead of results piling up.
+        
+        With ``canonicalize``, URLs that differ only by fragment, tracking
+        parameters, parameter order, host case or trailing slash are fetched
+        once. Pages whose text is a near-duplicate (SimHash within
+        ``dedup_distance`` bits) of a page already returned are dropped and
+        do not count towards ``max_pages``; None disables this check.
+        
+        With ``incremental``, pages crawled before are only re-fetched when
+        their revisit interval (learned from how often each page changed, see
+        CrawlHistory) has passed; the rest are served from the cache. Re-fetches
+        are conditional, and bodies identical to the last crawl are not
+        re-extracted. Links of every page are still followed, so new pages are
+        discovered.
+        
+        With ``focus`` (a skill name, keywords, a RelevanceScorer or its
+        to_dict()), links are scored before they are fetched, from their
+        anchor text, their URL and the relevance of the page they were found
+        on, and the best-scoring links are fetched first. The max_pages
+        budget goes to on-topic pages instead of footers, tag pages and legal
+        links. Each result's metadata['relevance'] holds its page score.
+        
+        A ``session`` (see scraper_crawl.CrawlSession) persists the frontier,
+        visited URLs and results as the crawl goes, and restores them when
+        the same session is crawled again.
+        
+        ``visited`` picks how the keys of queued and visited URLs are held:
+        a set of strings by default, 'fingerprints' for 64-bit hashes (11 to
+        23 bytes per URL, about 17 measured; collisions negligible) or 'bloom'
+        for a Bloom filter (about 2 bytes per URL; one URL in a thousand may
+        be wrongly taken as seen and skipped). A FingerprintSet or
+        BloomFilter instance may be passed to choose the size or error rate.
+        
         Args:
             base_url: Starting URL
             max_pages: Maximum number of pages to scrape
             follow_internal_links: Whether to follow internal links
             allowed_domains: List of allowed domains
             exclude_patterns: Patterns to exclude from scraping
+            max_workers: Concurrent crawl workers (defaults to the scraper's max_workers)
+            canonicalize: Deduplicate URLs on their canonical form
+            dedup_distance: Hamming distance for near-duplicate text, or None to keep all pages
+            incremental: Only re-fetch pages that are due for a revisit
+            focus: Topic to prioritize links by (best-first instead of breadth-first)
+            min_link_score: With focus, never fetch links scoring below this
+            session: Checkpointing crawl session to record progress in and resume from
+            visited: 'fingerprints', 'bloom' or a set-like object for the seen-URL keys
             **kwargs: Additional arguments for scrape_page
             
-        Returns:
-            List of ScrapedContent objects
+        Yields:
+            ScrapedContent objects, in completion order
         """
-        visited = set()
-        to_visit = [base_url]
-        results = []
+        key = canonicalize_url if canonicalize else None
+        if visited == 'fingerprints':
+            visited = FingerprintSet()
+        elif visited == 'bloom':
+            visited = BloomFilter(capacity=max(100_000, 10 * max_pages))
+        elif isinstance(visited, str):
+            raise ValueError(f"Unknown visited {visited!r}, expected 'fingerprints', 'bloom' or a set-like object")
+        scorer = None
+        if focus is not None:
+            scorer = RelevanceScorer.from_focus(focus)
+            frontier = PriorityFrontier(key=key, seen=visited)
+            kwargs.setdefault('link_text', True)
+        else:
+            frontier = CrawlFrontier(key=key, seen=visited)
+        duplicates = NearDuplicateIndex(dedup_distance) if dedup_distance is not None else None
+        
+        def push(url: str, score: float = None):
+            added = frontier.push(url) if score is None else frontier.push(url, score)
+            if added and session is not None:
+                session.discovered(url, score or 0.0)
+        
+        scraped = 0
+        if session is not None:
+            scraped = session.restore(frontier, duplicates)
+        if session is None or not session.resumed:
+            push(base_url, 0.0 if scorer is not None else None)
+        
+        if incremental:
+            if self.history is None:
+                self.history = CrawlHistory(self.cache_dir)
+            kwargs.update(use_cache=True, revalidate=True)
+        
+        def fetch(url: str) -> ScrapedContent:
+            if incremental:
+                history = self.history.get(url)
+                if history is not None and not history.is_due:
+                    entry = self._get_cache_entry(self._cache_key(url, kwargs))
+                    if entry is not None:
+                        logger.info(f"📋 Not due for revisit, using cached content for: {url}")
+                        return entry.value
+            return self.scrape_page(url, **kwargs)
+        
+        def visit(url: str) -> Tuple[ScrapedContent, Optional[int]]:
+            # The SimHash is computed here, in the worker, so the coordinating thread only compares integers
+            content = fetch(url)
+            return content, duplicates.fingerprint(content.content) if duplicates is not None else None
         
         allowed_domains = allowed_domains or [urlparse(base_url).netloc]
         exclude_patterns = exclude_patterns or []
+        max_workers = max(1, max_workers or self.max_workers)
         
-        while to_visit and len(results) < max_pages:
-            url = to_visit.pop(0)
-            
-            if url in visited:
-                continue
-                
-            visited.add(url)
-            
-            try:
-                content = self.scrape_page(url, **kwargs)
-                results.append(content)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        in_flight = {}
+        completed = False
+        
+        def dispatch():
+            # Never dispatch more pages than the remaining budget
+            while (frontier and len(in_flight) < max_workers
+                   and scraped + len(in_flight) < max_pages):
+                url = frontier.pop()
+                in_flight[executor.submit(visit, url)] = url
+        
+        try:
+            while True:
+                dispatch()
+                if not in_flight:
+                    break
                 
-                # Find new links to visit
-                if follow_internal_links and len(results) < max_pages:
-                    new_links = self._find_internal_links(
-                        content.links, 
-                        base_url, 
-                        allowed_domains, 
-                        exclude_patterns
-                    )
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                ready = []
+                for future in done:
+                    url = in_flight.pop(future)
+                    try:
+                        content, fingerprint = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to scrape {url}: {str(e)}")
+                        if session is not None:
+                            session.failed(url)
+                        continue
                     
-                    for link in new_links:
-                        if link not in visited and link not in to_visit:
-                            to_visit.append(link)
-                
-                # Add delay between requests
-                if self.delay > 0:
-                    time.sleep(self.delay)
+                    if duplicates is not None:
+                        original = duplicates.check_fingerprint(fingerprint, url)
+                        if original is not None:
+                            # Its links are near-identical to the original's, which are already queued
+                            logger.info(f"Skipping near-duplicate of {original}: {url}")
+                            if session is not None:
+                                session.duplicate(url)
+                            continue
+                    
+                    scraped += 1
+                    
+                    # Find new links to visit
+                    new_links = []
+                    if follow_internal_links and scraped < max_pages:
+                        new_links = self._find_internal_links(
+                            content.links, 
+                            base_url, 
+                            allowed_domains, 
+                            exclude_patterns
+                        )
+                    
+                    if scorer is None:
+                        for link in new_links:
+                            push(link)
+                    else:
+                        metadata, scored = scorer.score_page(content.title, content.content, content.metadata,
+                                                             new_links, min_link_score)
+                        content = replace(content, metadata=metadata)
+                        for link, score in scored:
+                            push(link, score)
                     
+                    if session is not None:
+                        session.done(url, content, scraped)
+                    ready.append(content)
+                
+                # Keep the workers busy while the consumer handles these pages
+                dispatch()
+                yield from ready
+            completed = True
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if session is not None:
+                session.close(completed)
+
+    async def aiter_pages(self, urls: Iterable[str], **kwargs) -> AsyncIterator[ScrapedContent]:
+        """Async iterator over iter_pages: fetching runs in threads, the event loop is never blocked"""
+        async for content in iterate_in_thread(self.iter_pages(urls, **kwargs)):
+            yield content
+
+    async def aiter_website(self, base_url: str, **kwargs) -> AsyncIterator[ScrapedContent]:
+        """Async iterator over iter_website: fetching runs in threads, the event loop is never blocked"""
+        async for content in iterate_in_thread(self.iter_website(base_url, **kwargs)):
+            yield content
+
+    def reextract(self, 
+                  urls: List[str] = None,
+                  update_cache: bool = True,
+                  **kwargs) -> Iterator[ScrapedContent]:
+        """
+        Re-run extraction over stored raw bodies without touching the network
+        
+        Args:
+            urls: URLs to re-extract (defaults to every stored page)
+            update_cache: Whether to replace cached results with the new extraction
+            **kwargs: Extraction options accepted by scrape_page
+            
+        Yields:
+            ScrapedContent objects built from the stored bodies
+        """
+        raw_store = self.raw_store or RawPageStore(os.path.join(self.cache_dir, "raw"))
+        
+        def finish(url: str, status: int, extract) -> Optional[ScrapedContent]:
+            try:
+                content = self._content_from_extracted(url, extract(), status)
             except Exception as e:
-                logger.error(f"Failed to scrape {url}: {str(e)}")
+                logger.error(f"Failed to re-extract {url}: {str(e)}")
+                return None
+            
+            if update_cache:
+                # Under the key scrape_page uses for these options, so the default entry keeps its own result
+                cache_key = self._cache_key(url, kwargs)
+                entry = self._get_cache_entry(cache_key)
+                self._cache_content(cache_key, content, entry.validators if entry else None)
+            return content
+        
+        # With a parse pool, keep it saturated and yield results in input order
+        pending = deque()
+        for page in raw_store.iter_pages(urls):
+            if self.parse_pool is None:
+                content = finish(page.url, page.status,
+                                 lambda: extract_page(page.body, page.url, self.parser, **kwargs))
+                if content is not None:
+                    yield content
+                continue
+            
+            future = self.parse_pool.submit(page.body, page.url, self.parser, **kwargs)
+            pending.append((page.url, page.status, future))
+            while pending and (len(pending) >= self.parse_pool.max_pending or pending[0][2].done()):
+                url, status, future = pending.popleft()
+                content = finish(url, status, future.result)
+                if content is not None:
+                    yield content
         
-        return results
+        while pending:
+            url, status, future = pending.popleft()
+            content = finish(url, status, future.result)
+            if content is not None:
+                yield content
 
     def extract_data(self, 
                     url: str, 
-                    selectors: Dict[str, str]) -> Dict[str, List[str]]:
+                    selectors: Dict[str, str],
+                    use_cache: bool = True) -> Dict[str, List[str]]:
         """
         Extract specific data from a webpage using CSS selectors
         
+        Selectors run against the page's original DOM, in the same parse
+        that produces (and caches) its ScrapedContent.
+        
         Args:
             url: URL to scrape
             selectors: Dictionary of {key: css_selector}
+            use_cache: Whether to reuse a stored raw body (requires store_raw) within the cache TTL
             
         Returns:
             Dictionary of extracted data
         """
-        content = self.scrape_page(url)
-        soup = BeautifulSoup(content.content, 'html.parser')
+        return self._select_page(url, {'_': selectors}, use_cache)['_']
+
+    def extract_data_batch(self, 
+                           urls: List[str], 
+                           profiles: Dict[str, Dict[str, str]],
+                           max_workers: int = None,
+                           use_cache: bool = True) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        """
+        Extract data from many pages with many selector profiles at once
         
-        extracted = {}
+        Each page is fetched and parsed once and every profile runs on that
+        parse. Pages are processed concurrently under the usual per-host limits.
         
-        for key, selector in selectors.items():
-            elements = soup.select(selector)
-            extracted[key] = [elem.get_text(strip=True) for elem in elements]
+        Args:
+            urls: URLs to scrape
+            profiles: Dictionary of {profile_name: {key: css_selector}}
+            max_workers: Global concurrency cap (defaults to the scraper's max_workers)
+            use_cache: Whether to reuse stored raw bodies (requires store_raw) within the cache TTL
+            
+        Returns:
+            Dictionary of {url: {profile_name: {key: [texts]}}}; failed URLs are omitted
+        """
+        max_workers = max_workers or self.max_workers
         
-        return extracted
+        def select_one(url: str) -> Optional[Dict[str, Dict[str, List[str]]]]:
+            try:
+                return self._select_page(url, profiles, use_cache)
+            except Exception as e:
+                logger.error(f"Failed to extract data from {url}: {str(e)}")
+                return None
+        
+        if max_workers <= 1 or len(urls) <= 1:
+            results = [select_one(url) for url in urls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+                results = list(executor.map(select_one, urls))
+        
+        return {url: result for url, result in zip(urls, results) if result is not None}
 
     def scrape_rss(self, rss_url: str) -> List[Dict[str, str]]:
         """
@@ -286,18 +1524,8 @@ class WebScraper:
             logger.info(f"📡 Scraping RSS: {rss_url}")
             
             response = self._make_request(rss_url)
-            feed = feedparser.parse(response.content)
-            
-            items = []
-            for entry in feed.entries:
-                item = {
-                    'title': entry.get('title', ''),
-                    'description': entry.get('description', ''),
-                    'link': entry.get('link', ''),
-                    'pubDate': entry.get('published', ''),
-                    'author': entry.get('author', ''),
-                }
-                items.append(item)
+            with self.metrics.time(HostRateLimiter.host_of(rss_url), 'parse'):
+                items = feed_items(feedparser.parse(response.content))
             
             logger.info(f"✅ Successfully scraped RSS: {rss_url} ({len(items)} items)")
             return items
@@ -310,7 +1538,8 @@ class WebScraper:
                   url: str, 
                   method: str = 'GET',
                   data: Dict = None,
-                  headers: Dict = None) -> Any:
+                  headers: Dict = None,
+                  params: Dict = None) -> Any:
         """
         Scrape JSON APIs
         
@@ -319,6 +1548,7 @@ class WebScraper:
             method: HTTP method
             data: Request data
             headers: Additional headers
+            params: Query parameters
             
         Returns:
             API response data
@@ -326,23 +1556,12 @@ class WebScraper:
         try:
             logger.info(f"🔌 Scraping API: {url}")
             
-            request_headers = self.headers.copy()
-            if headers:
-                request_headers.update(headers)
+            # Every method goes through the retry policy, which only resends
+            # non-idempotent requests when the server cannot have acted on them
+            response = self._make_request(url, headers=headers, method=method, json_data=data, params=params)
             
-            if method.upper() == 'GET':
-                response = self._make_request(url, headers=request_headers)
-            else:
-                response = self.session.request(
-                    method, 
-                    url, 
-                    json=data, 
-                    headers=request_headers,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-            
-            result = response.json()
+            with self.metrics.time(HostRateLimiter.host_of(url), 'parse'):
+                result = response.json()
             logger.info(f"✅ Successfully scraped API: {url}")
             return result
             
@@ -350,6 +1569,107 @@ class WebScraper:
             logger.error(f"❌ Failed to scrape API {url}: {str(e)}")
             raise
 
+    def iter_api(self, 
+                 url: str,
+                 params: Dict = None,
+                 headers: Dict = None,
+                 pagination: Pagination = None,
+                 items_key: str = None,
+                 max_pages: int = None,
+                 max_workers: int = 1,
+                 stream: bool = False) -> Iterator[Any]:
+        """
+        Iterate over every record of a paginated JSON API collection
+        
+        Records are taken from each page's top-level array, its items_key
+        array, or the first of the usual keys (data, results, items, ...).
+        
+        Args:
+            url: First page URL
+            params: Query parameters of the first page
+            headers: Additional headers
+            pagination: LinkPagination (default: Link header or a next URL in
+                the body), CursorPagination or PagePagination
+            items_key: Dotted path of the records array in each page
+            max_pages: Stop after this many pages
+            max_workers: Pages fetched at once; only PagePagination pages are
+                independent, and at most max_workers pages are held in memory
+            stream: Parse each page incrementally while it downloads, holding one
+                record at a time (sequential fetching only; bodies are not capped
+                by max_body_bytes)
+            
+        Yields:
+            Records, in collection order
+        """
+        pagination = pagination or LinkPagination()
+        params = dict(params or {})
+        if stream and pagination.needs_body:
+            raise ValueError(f"{type(pagination).__name__} reads the page body, so pages cannot be streamed")
+        
+        logger.info(f"🔌 Iterating API: {url}")
+        if pagination.independent and max_workers > 1:
+            yield from self._iter_api_concurrent(url, params, headers, pagination, items_key, max_pages, max_workers)
+            return
+        
+        if isinstance(pagination, PagePagination):
+            params = pagination.params_for(0, params)
+        pages = 0
+        while url and (max_pages is None or pages < max_pages):
+            if stream:
+                response = self._make_request(url, headers=headers, params=params, consume=False)
+                try:
+                    count = 0
+                    for item in iter_json_items(response.iter_content(DOWNLOAD_CHUNK_SIZE), items_key):
+                        count += 1
+                        yield item
+                finally:
+                    response.close()
+                body = None
+            else:
+                response = self._make_request(url, headers=headers, params=params)
+                body = response.json()
+                items = find_items(body, items_key)
+                count = len(items)
+                yield from items
+            
+            pages += 1
+            if isinstance(pagination, PagePagination) and pagination.is_last(count):
+                break
+            next_page = pagination.next_request(url, params, response, body)
+            if next_page is None:
+                break
+            url, params = next_page
+
+    def _iter_api_concurrent(self, 
+                             url: str,
+                             params: Dict,
+                             headers: Optional[Dict],
+                             pagination: PagePagination,
+                             items_key: Optional[str],
+                             max_pages: Optional[int],
+                             max_workers: int) -> Iterator[Any]:
+        """Fetch independent pages max_workers at a time, yielding records in page order"""
+        def fetch(index: int) -> List[Any]:
+            response = self._make_request(url, headers=headers, params=pagination.params_for(index, params))
+            return find_items(response.json(), items_key)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            index = 0
+            while True:
+                # Keep max_workers pages in flight; pages past the end come back empty
+                while len(pending) < max_workers and (max_pages is None or index < max_pages):
+                    pending.append(executor.submit(fetch, index))
+                    index += 1
+                if not pending:
+                    return
+                items = pending.popleft().result()
+                yield from items
+                if pagination.is_last(len(items)):
+                    for future in pending:
+                        future.cancel()
+                    return
+
     def search_and_scrape(self, 
                          search_query: str,
                          search_engine: str = 'google',
@@ -425,140 +1745,243 @@ class WebScraper:
             logger.error(f"Failed to save content: {str(e)}")
             raise
 
+    def fetch(self, 
+              url: str, 
+              headers: Dict[str, str] = None,
+              validators: Dict[str, str] = None) -> requests.Response:
+        """
+        Fetch a URL through the scraper's politeness, retry and circuit-breaker machinery
+        
+        With validators ({'etag': ..., 'last_modified': ...}) the request is
+        conditional and may return a 304 with an empty body.
+        """
+        return self._make_request(url, headers=headers, validators=validators)
+
+    def close(self):
+        """Release the HTTP session and any parsing worker processes"""
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        self.session.close()
+
+    def __enter__(self) -> 'WebScraper':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     # Private helper methods
 
-    def _make_request(self, url: str, headers: Dict[str, str] | None = None) -> requests.Response:
-        """Make HTTP request with retries"""
+    def _make_request(self, 
+                      url: str, 
+                      headers: Dict[str, str] | None = None,
+                      validators: Dict[str, str] | None = None,
+                      markup_only: bool = False,
+                      sink: Any = None,
+                      method: str = 'GET',
+                      params: Dict[str, Any] | None = None,
+                      json_data: Any = None,
+                      consume: bool = True) -> requests.Response:
+        """
+        Make HTTP request with retries, conditional if validators are given
+        
+        The body is streamed and capped at max_body_bytes; with markup_only,
+        non-HTML/XML responses are rejected before their body is read. A sink
+        (anything with reset() and feed(chunk)) receives the body as it arrives.
+        The returned response's content is fully populated, unless consume is
+        False: then the body is left unread and the caller must close the response.
+        
+        Only failures retry_policy deems transient are retried. Requests to a
+        host whose circuit breaker is open fail fast with scraper_retry.HostUnavailable.
+        """
         request_headers = self.headers.copy()
         if headers:
             request_headers.update(headers)
+        if validators:
+            if validators.get('etag'):
+                request_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                request_headers['If-Modified-Since'] = validators['last_modified']
         
+        host = HostRateLimiter.host_of(url)
+        metrics = self.metrics
         for attempt in range(self.max_retries):
+            self.circuit_breaker.before_request(host)
             try:
-                response = self.session.get(
-                    url, 
-                    headers=request_headers,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
+                waiting = time.perf_counter()
+                with self.rate_limiter.acquire(url):
+                    started = time.perf_counter()
+                    metrics.observe(host, 'wait', started - waiting)
+                    metrics.count(host, 'requests')
+                    take_connect_time()
+                    try:
+                        response = self.session.request(
+                            method,
+                            url, 
+                            params=params,
+                            json=json_data,
+                            headers=request_headers,
+                            timeout=self.timeout,
+                            stream=True
+                        )
+                    finally:
+                        # Connect time is only known for new connections; reused ones skip the phase
+                        connect = take_connect_time()
+                        if connect is not None:
+                            metrics.observe(host, 'connect', connect)
+                            metrics.count(host, 'connections')
+                    metrics.observe(host, 'ttfb', time.perf_counter() - started - (connect or 0.0))
+                    metrics.count(host, f'status_{response.status_code}')
+                    try:
+                        response.raise_for_status()
+                        if markup_only and not is_markup_type(response.headers.get('Content-Type', '')):
+                            raise ContentRejected(
+                                f"Not HTML/XML ({response.headers.get('Content-Type')}): {url}"
+                            )
+                        if consume:
+                            with metrics.time(host, 'download'):
+                                self._read_body(response, sink)
+                            metrics.count(host, 'bytes', len(response._content))
+                            metrics.count(host, 'wire_bytes', response.raw.tell())
+                    except BaseException:
+                        response.close()
+                        raise
+                    if consume:
+                        response.close()
+                self.circuit_breaker.record_success(host)
                 return response
                 
             except requests.RequestException as e:
-                if attempt == self.max_retries - 1:
+                self.circuit_breaker.record(host, e)
+                if attempt == self.max_retries - 1 or not self.retry_policy.is_retryable(e, method):
+                    metrics.count(host, 'failures')
                     raise
-                logger.warning(f"Retry {attempt + 1}/{self.max_retries} for {url}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                metrics.count(host, 'retries')
+                retry_after = self.retry_policy.retry_after(e)
+                if retry_after is not None:
+                    # The server asked every client to back off, not just this request
+                    self.rate_limiter.defer(url, retry_after)
+                wait = self.retry_policy.backoff(attempt, e)
+                logger.warning(f"Retry {attempt + 1}/{self.max_retries} for {url} in {wait:.1f}s: {str(e)}")
+                time.sleep(wait)
+            except ContentRejected:
+                self.circuit_breaker.record_success(host)  # the host answered; the content was refused
+                raise
+            except BaseException:
+                # Anything else (a sink's parser error, KeyboardInterrupt) must still release a half-open probe
+                self.circuit_breaker.abandon(host)
+                raise
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extract page title"""
-        title = soup.find('title')
-        if title:
-            return title.get_text(strip=True)
+    def _read_body(self, response: requests.Response, sink: Any = None):
+        """Download the body in chunks, enforcing max_body_bytes, and store it on the response"""
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_body_bytes:
+            raise ContentRejected(f"Body of {declared} bytes exceeds {self.max_body_bytes}: {response.url}")
         
-        h1 = soup.find('h1')
-        if h1:
-            return h1.get_text(strip=True)
+        if sink is not None:
+            sink.reset()
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise ContentRejected(f"Body exceeds {self.max_body_bytes} bytes: {response.url}")
+            chunks.append(chunk)
+            if sink is not None:
+                sink.feed(chunk)
         
-        og_title = soup.find('meta', property='og:title')
-        if og_title:
-            return og_title.get('content', '')
-        
-        return ''
+        # Hand the body to requests so .content, .text and .json() work as usual
+        response._content = b''.join(chunks)
+        response._content_consumed = True
 
-    def _extract_text(self, soup: BeautifulSoup) -> str:
-        """Extract text content"""
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-            element.decompose()
-        
-        # Get text from body or main content area
-        text_elements = soup.find('body') or soup.find('main') or soup.find('article')
-        if text_elements:
-            text = text_elements.get_text()
+    def _build_content(self, 
+                       url: str, 
+                       body: bytes, 
+                       status: int,
+                       soup: BeautifulSoup = None,
+                       **options) -> ScrapedContent:
+        """Parse a raw response body (or reuse an existing soup of it) into a ScrapedContent object"""
+        # Clean and extract in a single traversal
+        host = HostRateLimiter.host_of(url)
+        if soup is not None:
+            with self.metrics.time(host, 'extract'):
+                extracted = PageExtractor(url, **options).feed_soup(soup)
+        elif self.parse_pool is not None:
+            # Parsed and extracted in a worker process; includes time queued for a worker
+            with self.metrics.time(host, 'parse'):
+                extracted = self.parse_pool.extract(body, url, self.parser, **options)
         else:
-            text = soup.get_text()
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+            timings = {}
+            extracted = extract_page(body, url, self.parser, timings=timings, **options)
+            for phase, seconds in timings.items():
+                self.metrics.observe(host, phase, seconds)
+        return self._content_from_extracted(url, extracted, status)
 
-    def _extract_metadata(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract metadata from page"""
-        metadata = {}
-        
-        # Description
-        desc_meta = soup.find('meta', attrs={'name': 'description'})
-        if desc_meta:
-            metadata['description'] = desc_meta.get('content', '')
-        
-        og_desc = soup.find('meta', property='og:description')
-        if og_desc:
-            metadata['description'] = og_desc.get('content', '')
+    def _content_from_extracted(self, url: str, extracted: Dict[str, Any], status: int) -> ScrapedContent:
+        """Wrap extracted fields in a ScrapedContent object"""
+        return ScrapedContent(
+            url=url,
+            title=extracted['title'],
+            content=extracted['content'],
+            metadata=extracted['metadata'],
+            timestamp=datetime.now().isoformat(),
+            status=status,
+            word_count=len(extracted['content'].split()),
+            links=extracted['links'],
+            images=extracted['images']
+        )
+
+    def _select_page(self, 
+                     url: str, 
+                     profiles: Dict[str, Dict[str, str]],
+                     use_cache: bool = True) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Fetch (or load) one page, parse it once and run every selector profile on it
         
-        # Keywords
-        keywords_meta = soup.find('meta', attrs={'name': 'keywords'})
-        if keywords_meta:
-            keywords = keywords_meta.get('content', '')
-            metadata['keywords'] = [k.strip() for k in keywords.split(',')]
+        A stored raw body is used while it is younger than the cache TTL; an
+        older one is revalidated with the cached result's validators first.
+        """
+        page = self.raw_store.get(url) if use_cache and self.raw_store is not None else None
+        validators = None
+        if page is not None and self.cache.ttl is not None and time.time() - page.fetched_at >= self.cache.ttl:
+            entry = self._get_cache_entry(url)
+            validators = entry.validators if entry and entry.validators else None
+            if validators is None:
+                page = None  # nothing to revalidate with: fetch it again
         
-        # Author
-        author_meta = soup.find('meta', attrs={'name': 'author'})
-        if author_meta:
-            metadata['author'] = author_meta.get('content', '')
+        response = None
+        if page is None or validators is not None:
+            logger.info(f"🎯 Extracting data from: {url}")
+            response = self._make_request(url, validators=validators, markup_only=True)
+            if response.status_code == 304:
+                logger.info(f"📋 Not modified, using stored body for: {url}")
+                self.raw_store.touch(url)
+                response = None
         
-        # Date
-        date_meta = soup.find('meta', property='article:published_time')
-        if date_meta:
-            metadata['date'] = date_meta.get('content', '')
-        
-        # Language
-        html_tag = soup.find('html')
-        if html_tag:
-            metadata['language'] = html_tag.get('lang', 'en')
+        if response is None:
+            soup = BeautifulSoup(page.body, self.soup_parser)
+        else:
+            if self.raw_store is not None:
+                self._store_raw(url, response)
+            soup = BeautifulSoup(response.content, self.soup_parser)
+            
+            # The page is parsed anyway, so keep the cache warm for scrape_page
+            if use_cache:
+                content = self._build_content(url, response.content, response.status_code, soup=soup)
+                self._cache_content(url, content, self._response_validators(response))
         
-        return metadata
+        return {name: select_text(soup, selectors) for name, selectors in profiles.items()}
 
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract all links from page"""
-        links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            try:
-                absolute_url = urljoin(base_url, href)
-                links.append(absolute_url)
-            except:
-                continue
-        return list(set(links))  # Remove duplicates
-
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Extract all images from page"""
-        images = []
-        for img in soup.find_all('img', src=True):
-            src = img['src']
-            try:
-                absolute_url = urljoin(base_url, src)
-                images.append(absolute_url)
-            except:
-                continue
-        return list(set(images))  # Remove duplicates
-
-    def _clean_html(self, soup: BeautifulSoup):
-        """Clean HTML by removing unwanted elements"""
-        # Remove common unwanted elements
-        for element in soup(['script', 'style', 'noscript', 'iframe', 'embed', 'object']):
-            element.decompose()
-        
-        # Remove elements with common ad/spam classes
-        for element in soup.find_all(class_=re.compile(r'ad|spam|banner')):
-            element.decompose()
-        
-        for element in soup.find_all(id=re.compile(r'ad|spam')):
-            element.decompose()
-        
-        # Remove empty elements
-        for element in soup.find_all(['p', 'div', 'span']):
-            if not element.get_text(strip=True):
-                element.decompose()
+    def _store_raw(self, url: str, response: requests.Response):
+        """Keep the raw body so the page can be re-extracted later"""
+        try:
+            self.raw_store.put(
+                url, 
+                response.content, 
+                response.status_code, 
+                response.headers.get('Content-Type', '')
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store raw body: {str(e)}")
 
     def _find_internal_links(self, 
                            links: List[str], 
@@ -589,59 +2012,111 @@ class WebScraper:
         
         return internal_links
 
+    def _response_validators(self, response: requests.Response) -> Dict[str, str]:
+        """Extract HTTP cache validators from a response"""
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['last_modified'] = response.headers['Last-Modified']
+        return validators
+
+    @staticmethod
+    def _cache_key(url: str, options: Dict[str, Any]) -> str:
+        """
+        Cache key for url extracted with options (scrape_page keyword
+        arguments): the URL itself for the defaults, else the URL followed by
+        the non-default options, so a result is never served to a caller who
+        asked for a different extraction
+        """
+        changed = [f"{name}={options[name]}" for name in EXTRACTION_DEFAULTS
+                   if name in options and options[name] != EXTRACTION_DEFAULTS[name]]
+        return f"{url} [{','.join(changed)}]" if changed else url
+
+    def _get_cache_entry(self, url: str) -> Optional[CacheEntry]:
+        """Get cached content and its validators for URL (or a _cache_key), fresh or expired"""
+        try:
+            return self.cache.get(url)
+        except Exception as e:
+            logger.warning(f"Failed to read cache: {str(e)}")
+            return None
+
     def _get_cached_content(self, url: str) -> Optional[ScrapedContent]:
-        """Get cached content for URL"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        cache_file = os.path.join(self.cache_dir, f"cache_{url_hash}.json")
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return ScrapedContent(**data)
-            except:
-                pass
-        
-        return None
+        """Get fresh cached content for URL"""
+        entry = self._get_cache_entry(url)
+        return entry.value if entry and entry.is_fresh else None
 
-    def _cache_content(self, url: str, content: ScrapedContent):
-        """Cache content for URL"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        cache_file = os.path.join(self.cache_dir, f"cache_{url_hash}.json")
-        
+    def _cache_content(self, url: str, content: ScrapedContent, validators: Dict[str, str] = None):
+        """Cache content for URL (or a _cache_key) along with its HTTP validators"""
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(content.to_dict(), f, ensure_ascii=False)
+            self.cache.put(url, content, validators)
         except Exception as e:
             logger.warning(f"Failed to cache content: {str(e)}")
 
+class ScraperRegistry:
+    """
+    Process-wide registry of shared WebScraper instances
+    
+    The convenience functions reuse one scraper per configuration, and with
+    it one pooled keep-alive session and one cache handle, instead of paying
+    for a new session, TLS handshakes and cache setup on every call. All
+    shared pieces are safe to use from multiple threads.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scrapers: Dict[tuple, WebScraper] = {}
+    
+    def get(self, **config) -> WebScraper:
+        """Return the shared scraper for this configuration, creating it on first use"""
+        key = tuple(sorted(config.items()))
+        with self._lock:
+            scraper = self._scrapers.get(key)
+            if scraper is None:
+                scraper = self._scrapers[key] = WebScraper(**config)
+            return scraper
+    
+    def close_all(self):
+        with self._lock:
+            scrapers, self._scrapers = list(self._scrapers.values()), {}
+        for scraper in scrapers:
+            scraper.close()
+
+scrapers = ScraperRegistry()
+
 # Convenience functions for easy use
 def scrape_page(url: str, **kwargs) -> ScrapedContent:
     """Scrape a single page"""
-    scraper = WebScraper()
-    return scraper.scrape_page(url, **kwargs)
+    return scrapers.get().scrape_page(url, **kwargs)
 
 def scrape_pages(urls: List[str], **kwargs) -> List[ScrapedContent]:
     """Scrape multiple pages"""
-    scraper = WebScraper()
-    return scraper.scrape_pages(urls, **kwargs)
+    return scrapers.get().scrape_pages(urls, **kwargs)
 
 def scrape_website(base_url: str, **kwargs) -> List[ScrapedContent]:
     """Scrape a website"""
-    scraper = WebScraper()
-    return scraper.scrape_website(base_url, **kwargs)
+    return scrapers.get().scrape_website(base_url, **kwargs)
+
+def iter_pages(urls: Iterable[str], **kwargs) -> Iterator[ScrapedContent]:
+    """Scrape multiple pages, yielding each as it completes"""
+    return scrapers.get().iter_pages(urls, **kwargs)
+
+def iter_website(base_url: str, **kwargs) -> Iterator[ScrapedContent]:
+    """Crawl a website, yielding each page as it completes"""
+    return scrapers.get().iter_website(base_url, **kwargs)
 
 def extract_data(url: str, selectors: Dict[str, str]) -> Dict[str, List[str]]:
     """Extract specific data from a page"""
-    scraper = WebScraper()
-    return scraper.extract_data(url, selectors)
+    return scrapers.get().extract_data(url, selectors)
+
+def extract_data_batch(urls: List[str], profiles: Dict[str, Dict[str, str]], **kwargs) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    """Extract data from many pages with many selector profiles"""
+    return scrapers.get().extract_data_batch(urls, profiles, **kwargs)
 
 def scrape_rss(rss_url: str) -> List[Dict[str, str]]:
     """Scrape RSS feed"""
-    scraper = WebScraper()
-    return scraper.scrape_rss(rss_url)
+    return scrapers.get().scrape_rss(rss_url)
 
 def scrape_api(url: str, **kwargs) -> Any:
     """Scrape API endpoint"""
-    scraper = WebScraper()
-    return scraper.scrape_api(url, **kwargs) 
\ No newline at end of file
+    return scrapers.get().scrape_api(url, **kwargs)